@@ -87,6 +87,8 @@ class Spot(SQLModel, table=True):
     map_url: str = Field(max_length=2083)
     latitude: float = Field(sa_column=Column(Double, nullable=False))
     longitude: float = Field(sa_column=Column(Double, nullable=False))
+    # 주변 장소 검색용 geohash (저장 시 위도/경도로 채움, 접두사 인덱스 검색)
+    geohash: Optional[str] = Field(default=None, max_length=12, index=True)
     spot_category: int
     phone_number: Optional[str] = Field(default=None, max_length=300)
     business_status: Optional[bool] = None
@@ -32,6 +32,18 @@ class spots_pydantic(BaseModel):
     spots: list[spot_pydantic]
 
 
+# 플래너 LLM 응답용 (장소 전체 정보 대신 짧은 id만 사용)
+class planned_spot_pydantic(BaseModel):
+    id: str = Field(max_length=20)
+    day_x: int
+    order: int
+    spot_time: Optional[str] = None
+
+
+class planned_spots_pydantic(BaseModel):
+    spots: list[planned_spot_pydantic]
+
+
 def calculate_trip_days(start_date_str: str, end_date_str: str) -> int:
     fmt = "%Y-%m-%d"
     start_dt = datetime.strptime(start_date_str, fmt)
@@ -32,11 +32,25 @@ async def lifespan(app: FastAPI):
     
     # 데이터베이스 연결 초기화
     app.state.engine = engine
+    # 기존 테이블에 없는 컬럼 추가 (create_all은 이미 있는 테이블을 바꾸지 않음)
+    from app.repository.spots.spot_repository import migrate_spot_geohash
+    async with engine.begin() as conn:
+        await conn.run_sync(migrate_spot_geohash)
+    # 외부 API용 HTTP 연결 풀 (제공자별 keep-alive 클라이언트)
+    from app.utils.http_clients import HTTPClientRegistry
+    app.state.http_clients = HTTPClientRegistry()
 
     try:
         yield
     finally:
         print("Shutting down application...")
+        # 일정 생성 작업 워커 종료
+        from app.services.agents.plan_job_service import PlanJobService
+        await PlanJobService().shutdown()
+        await app.state.http_clients.aclose()
+        # 동기 도구용 백그라운드 이벤트 루프 종료
+        from app.utils.async_bridge import AsyncBridge
+        AsyncBridge().shutdown()
         await engine.dispose()
         print("Database connection closed.")
 
@@ -90,7 +104,8 @@ async def init_table_by_SQLModel():
         # CSV 데이터 삽입
         try:
             import pandas as pd
-            data = pd.read_csv('administrative_division.csv')
+            # 중심 좌표/경계 범위 열은 Gazetteer가 CSV에서 직접 읽으므로 테이블에는 이름만 저장
+            data = pd.read_csv('administrative_division.csv', usecols=['city_province', 'city_county'])
             await conn.run_sync(
                 lambda sync_conn: data.to_sql(
                     'administrative_division',
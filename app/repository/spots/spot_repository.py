@@ -1,9 +1,30 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import Connection, func, inspect, or_, text
+from sqlalchemy.exc import OperationalError
 from sqlmodel import select
 from app.data_models.data_model import Spot
+from app.utils import geohash
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+# 저장하는 geohash 자리수 (9자리 ≈ 5m)
+SPOT_GEOHASH_PRECISION = geohash.DEFAULT_PRECISION
+# 같은 카테고리/이름이면 같은 장소로 보는 geohash 접두사 자리수 (8자리 ≈ 38m x 19m)
+DUPLICATE_SPOT_GEOHASH_PRECISION = 8
+# 주변 검색에서 거리 계산 전에 가져오는 최대 후보 수
+NEARBY_CANDIDATE_LIMIT = 500
+# geohash 채우기를 한 번에 처리하는 행 수
+GEOHASH_BACKFILL_BATCH = 1000
+# 여러 워커가 동시에 시작할 때 geohash 마이그레이션을 한 번에 하나씩 실행하기 위한 MySQL 잠금
+GEOHASH_MIGRATION_LOCK = "spot_geohash_migration"
+GEOHASH_MIGRATION_LOCK_TIMEOUT = 300
+# MySQL 오류 코드: 이미 있는 컬럼 / 이미 있는 인덱스
+MYSQL_DUPLICATE_COLUMN = 1060
+MYSQL_DUPLICATE_KEY_NAME = 1061
+
 async def save_spot(spot: Spot, session: AsyncSession):
     try:
+        if spot.latitude is not None and spot.longitude is not None:
+            spot.geohash = geohash.encode(spot.latitude, spot.longitude, SPOT_GEOHASH_PRECISION)
         session.add(spot)
         await session.flush()
         return spot.id
@@ -32,6 +53,114 @@ async def delete_spot(spot_id: int, session: AsyncSession):
         print("[ spotRepository ] delete_spot() 에러 : ", e)
         raise e
 
+async def find_spots_nearby(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    session: AsyncSession,
+    spot_category: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[Spot, float]]:
+    """
+    (latitude, longitude)에서 radius_km 이내의 장소를 가까운 순으로 (장소, 거리 km) 목록으로 반환
+    - geohash 접두사(인덱스)로 후보를 좁힌 뒤 실제 거리로 걸러냄
+    - 일정마다 따로 저장된 같은 장소(카테고리/이름/geohash 접두사가 같은 행)는 SQL에서 하나로 합침
+    - 후보는 대략적인 거리순으로 NEARBY_CANDIDATE_LIMIT개까지만 가져옴
+    """
+    try:
+        cells = geohash.covering_cells(latitude, longitude, radius_km, SPOT_GEOHASH_PRECISION)
+        in_cells = or_(*[Spot.geohash.startswith(cell) for cell in cells])
+        duplicates = (
+            select(func.min(Spot.id))
+            .where(in_cells)
+            .group_by(
+                Spot.spot_category,
+                func.lower(func.replace(Spot.kor_name, " ", "")),
+                func.substr(Spot.geohash, 1, DUPLICATE_SPOT_GEOHASH_PRECISION),
+            )
+        )
+        if spot_category is not None:
+            duplicates = duplicates.where(Spot.spot_category == spot_category)
+        query = (
+            select(Spot)
+            .where(Spot.id.in_(duplicates))
+            .order_by(func.abs(Spot.latitude - latitude) + func.abs(Spot.longitude - longitude))
+            .limit(NEARBY_CANDIDATE_LIMIT)
+        )
+        result = await session.exec(query)
+
+        nearby = []
+        for spot in result.all():
+            distance = geohash.haversine_km(latitude, longitude, spot.latitude, spot.longitude)
+            if distance <= radius_km:
+                nearby.append((spot, distance))
+        nearby.sort(key=lambda item: item[1])
+        return nearby[:limit] if limit else nearby
+    except Exception as e:
+        print("[ spotRepository ] find_spots_nearby() 에러 : ", e)
+        raise e
+
+def migrate_spot_geohash(connection: Connection):
+    """
+    기존 spot 테이블에 geohash 컬럼/인덱스를 추가하고 비어 있는 geohash를 위도/경도로 채움
+    (create_all은 이미 있는 테이블을 바꾸지 않으므로 시작 시 conn.run_sync로 실행)
+    여러 워커 프로세스가 동시에 시작해도 GET_LOCK으로 한 번에 하나씩만 실행되고,
+    앞선 워커가 이미 추가한 컬럼/채운 행은 건너뜀
+    """
+    acquired = connection.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"),
+        {"name": GEOHASH_MIGRATION_LOCK, "timeout": GEOHASH_MIGRATION_LOCK_TIMEOUT},
+    ).scalar()
+    if acquired != 1:
+        raise RuntimeError(f"[ spotRepository ] {GEOHASH_MIGRATION_LOCK} 잠금을 얻지 못했습니다.")
+    try:
+        _add_geohash_column(connection)
+        _backfill_geohash(connection)
+    finally:
+        connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": GEOHASH_MIGRATION_LOCK})
+
+def _add_geohash_column(connection: Connection):
+    inspector = inspect(connection)
+    if not inspector.has_table(Spot.__tablename__):
+        return
+    if "geohash" in {column["name"] for column in inspector.get_columns(Spot.__tablename__)}:
+        return
+    try:
+        connection.execute(text(
+            "ALTER TABLE spot ADD COLUMN geohash VARCHAR(12) NULL, ADD INDEX IX_spot_geohash (geohash)"
+        ))
+        print("[ spotRepository ] spot.geohash 컬럼을 추가했습니다.")
+    except OperationalError as e:
+        # 잠금 없이 실행된 다른 프로세스가 먼저 추가한 경우
+        if e.orig.args[0] not in (MYSQL_DUPLICATE_COLUMN, MYSQL_DUPLICATE_KEY_NAME):
+            raise
+        print("[ spotRepository ] spot.geohash 컬럼이 이미 추가되어 있습니다.")
+
+def _backfill_geohash(connection: Connection):
+    if not inspect(connection).has_table(Spot.__tablename__):
+        return
+    filled = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, latitude, longitude FROM spot "
+                "WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL LIMIT :batch"
+            ),
+            {"batch": GEOHASH_BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            text("UPDATE spot SET geohash = :geohash WHERE id = :id"),
+            [
+                {"id": spot_id, "geohash": geohash.encode(lat, lng, SPOT_GEOHASH_PRECISION)}
+                for spot_id, lat, lng in rows
+            ],
+        )
+        filled += len(rows)
+    if filled:
+        print(f"[ spotRepository ] spot.geohash {filled}건을 채웠습니다.")
+
 # 샘플 Spot 데이터
 # {
 #   "kor_name": "Test Spot",
@@ -1,7 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException
-import asyncio
 from app.services.agents.accommodation_agent_4 import run
 import json
 
@@ -24,8 +23,7 @@ async def get_accommodations(user_input: UserInputData):
     숙소 추천 API
     """
     try:
-        crew_output = await asyncio.to_thread(
-            run,
+        crew_output = await run(
             location=user_input.location,
             check_in_date=user_input.check_in_date,
             check_out_date=user_input.check_out_date,
@@ -1,19 +1,24 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
-import asyncio
+import json
+import time
 
 # 서비스 클래스 임포트
 from app.services.agents.travel_all_schedule_agent_service import TravelScheduleAgentService
-from app.services.agents.site_agent_service import TravelPlanAgentService
-from app.services.agents.accommodation_agent_4 import run
-from app.services.agents.cafe_agent_service import CafeAgentService
-from app.services.agents.restaurant_agent_service import RestaurantAgentService
-from app.services.agents.accommodation_agent_service2 import AccommodationAgentService
+from app.services.agents.plan_job_service import PlanJobService, SUCCEEDED, FAILED
+from app.services.agents.llm_gateway import LLMGateway
+from app.utils.result_cache import DEFAULT_TTLS, cache_stats, invalidate_cache
+from app.utils.resilience import breaker_stats
+from app.utils.rate_limiter import RateLimiter
+from app.utils.upstream_replay import FixtureStore
+from app.utils.http_clients import HTTPClientRegistry
 
 router = APIRouter()
 
 travel_schedule_agent_service = TravelScheduleAgentService()
+plan_job_service = PlanJobService()
 
 class Companion(BaseModel):
     label: str
@@ -31,7 +36,8 @@ class TravelPlanRequest(BaseModel):
 @router.post("/plan")
 async def generate_plan(
     user_input: TravelPlanRequest,
-    agent_type: List[str] = Query(..., alias="agent_type[]")
+    agent_type: List[str] = Query(..., alias="agent_type[]"),
+    planner: str = Query("llm", pattern="^(llm|rule)$"),
 ):
     try:
         print("프론트에서 받은 데이터:", user_input)
@@ -39,38 +45,202 @@ async def generate_plan(
         # Pydantic 모델을 Python dict로 변환 후, 에이전트 타입 추가
         input_dict = user_input.model_dump()
         input_dict["agent_type"] = agent_type
+        input_dict["planner"] = planner
 
-        # 비동기 작업 딕셔너리 생성
-        tasks = {}
-
-        # 각 외부 에이전트 호출 및 결과 집계
-        if "restaurant" in agent_type:
-            restaurant_service = RestaurantAgentService()
-            tasks["restaurant"] = restaurant_service.create_recommendation(input_dict)
-        if "site" in agent_type:
-            site_agent_service = TravelPlanAgentService()
-            tasks["site"] = site_agent_service.create_tourist_plan(input_dict)
-        if "cafe" in agent_type:
-            cafe_agent_service = CafeAgentService()
-            tasks["cafe"] = cafe_agent_service.create_recommendation(input_dict)
-        if "accommodation" in agent_type:
-            accommocation_agent_service = AccommodationAgentService()
-            tasks["accommodation"] = accommocation_agent_service.create_recommendation(input_dict)
-
-        # 비동기 작업 병렬 실행 및 결과 매핑
-        results = await asyncio.gather(*tasks.values())
-        external_data = dict(zip(tasks.keys(), results))
-
-        # 집계한 external_data를 입력 데이터에 추가합니다.
-        input_dict["external_data"] = external_data
-
-        # 최종 여행 일정 생성 함수 호출 (외부 데이터가 포함된 상태)
-        result = await travel_schedule_agent_service.create_plan(input_dict)
+        # 카테고리 에이전트 병렬 실행 후 최종 여행 일정 생성
+        result = await travel_schedule_agent_service.generate_plan(input_dict, agent_type)
 
         return {
             "status": "success",
             "message": "일정과 장소 리스트가 생성되었습니다.",
             "data": result,
         }
+    except HTTPException:
+        # 모든 카테고리 실패(503) 등 서비스에서 정한 상태 코드는 그대로 전달
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def format_sse(event: str, data) -> str:
+    """Server-Sent Events 형식의 메시지 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@router.post("/plan/stream")
+async def generate_plan_stream(
+    user_input: TravelPlanRequest,
+    agent_type: List[str] = Query(..., alias="agent_type[]"),
+    planner: str = Query("llm", pattern="^(llm|rule)$"),
+):
+    """
+    여행 일정 생성 스트리밍 엔드포인트 (text/event-stream)
+    - start: 실행할 카테고리 목록
+    - category: 카테고리 에이전트가 끝나는 순서대로 결과 전송 (degraded: 저하 사유)
+    - degraded: 시간 초과/실패로 제외된 카테고리
+    - plan: 최종 여행 일정
+    - error: 처리 중 오류 발생
+    """
+    print("프론트에서 받은 데이터:", user_input)
+
+    input_dict = user_input.model_dump()
+    input_dict["agent_type"] = agent_type
+    input_dict["planner"] = planner
+
+    async def event_stream():
+        try:
+            started = time.monotonic()
+            categories = travel_schedule_agent_service.resolve_categories(agent_type)
+            yield format_sse("start", {"categories": categories})
+
+            external_data, degraded = {}, {}
+            async for category, result, reason in travel_schedule_agent_service.iter_external_data(
+                input_dict, agent_type
+            ):
+                if reason:
+                    degraded[category] = reason
+                if result is None:
+                    yield format_sse("degraded", {"category": category, "reason": reason})
+                    continue
+                external_data[category] = result
+                yield format_sse("category", {"category": category, "data": result, "degraded": reason})
+
+            if not external_data and degraded:
+                raise HTTPException(status_code=503, detail=f"모든 카테고리 에이전트가 실패했습니다: {degraded}")
+
+            input_dict["external_data"] = external_data
+            result = await travel_schedule_agent_service.create_plan_within_budget(input_dict, started, degraded)
+            result["degraded"] = degraded
+            yield format_sse("plan", {
+                "status": "success",
+                "message": "일정과 장소 리스트가 생성되었습니다.",
+                "data": result,
+            })
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield format_sse("error", {"status": "error", "message": detail})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/plan/jobs", status_code=202)
+async def submit_plan_job(
+    user_input: TravelPlanRequest,
+    agent_type: List[str] = Query(..., alias="agent_type[]"),
+    planner: str = Query("llm", pattern="^(llm|rule)$"),
+):
+    """여행 일정 생성 작업 등록 (job_id 즉시 반환)"""
+    input_dict = user_input.model_dump()
+    input_dict["agent_type"] = agent_type
+    input_dict["planner"] = planner
+    job_id = await plan_job_service.submit(input_dict, agent_type)
+    return {
+        "status": "success",
+        "message": "일정 생성 작업이 등록되었습니다.",
+        "data": {"job_id": job_id},
+    }
+
+
+@router.get("/plan/jobs/stats")
+async def get_plan_job_stats():
+    """작업 큐 상태 조회 (대기 작업 수, 실행 중 작업 수, 상태별 작업 수)"""
+    return {
+        "status": "success",
+        "message": "작업 큐 상태가 조회되었습니다.",
+        "data": plan_job_service.stats(),
+    }
+
+
+@router.get("/plan/jobs/{job_id}")
+async def get_plan_job_status(job_id: str):
+    """작업 상태 및 단계별 소요 시간 조회"""
+    job = plan_job_service.get_job(job_id)
+    return {
+        "status": "success",
+        "message": "작업 상태가 조회되었습니다.",
+        "data": {
+            "job_id": job["id"],
+            "job_status": job["status"],
+            "error": job["error"],
+            "stage_timings": job["stage_timings"],
+            "created_at": job["created_at"],
+            "started_at": job["started_at"],
+            "finished_at": job["finished_at"],
+        },
+    }
+
+
+@router.get("/plan/jobs/{job_id}/result")
+async def get_plan_job_result(job_id: str):
+    """완료된 작업의 여행 일정 조회 (미완료 시 202, 실패 시 500)"""
+    job = plan_job_service.get_job(job_id)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != SUCCEEDED:
+        return JSONResponse(
+            status_code=202,
+            content={
+                "status": "pending",
+                "message": "일정 생성 작업이 아직 완료되지 않았습니다.",
+                "data": {"job_id": job["id"], "job_status": job["status"]},
+            },
+        )
+    return {
+        "status": "success",
+        "message": "일정과 장소 리스트가 생성되었습니다.",
+        "data": job["result"],
+    }
+
+
+@router.get("/llm/metrics")
+async def get_llm_metrics():
+    """LLM 호출 대기열 길이, 대기 시간과 실제 LLM 호출 시간 통계 조회"""
+    return {
+        "status": "success",
+        "message": "LLM 호출 통계가 조회되었습니다.",
+        "data": LLMGateway().stats(),
+    }
+
+
+@router.get("/upstream/metrics")
+async def get_upstream_metrics():
+    """외부 API 호스트별 서킷 브레이커 상태(closed/open/half_open), 실패/차단/재시도 횟수, 요청 한도 사용량, 녹화/재생 현황과 연결 풀 통계 조회"""
+    return {
+        "status": "success",
+        "message": "외부 API 통계가 조회되었습니다.",
+        "data": {
+            "breakers": breaker_stats(),
+            "rate_limits": RateLimiter().stats(),
+            "replay": FixtureStore().stats(),
+            "http_clients": HTTPClientRegistry().stats(),
+        },
+    }
+
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """카테고리별 결과 캐시 적중/미스 통계 조회"""
+    return {
+        "status": "success",
+        "message": "캐시 통계가 조회되었습니다.",
+        "data": cache_stats(),
+    }
+
+
+@router.delete("/cache")
+async def delete_cache(category: Optional[str] = Query(None)):
+    """결과 캐시 삭제 (category가 없으면 전체 삭제)"""
+    if category is not None and category not in DEFAULT_TTLS:
+        raise HTTPException(
+            status_code=400, detail=f"알 수 없는 캐시 카테고리입니다: {category} (가능한 값: {', '.join(DEFAULT_TTLS)})"
+        )
+    invalidate_cache(category)
+    return {
+        "status": "success",
+        "message": f"{category or '전체'} 캐시가 삭제되었습니다.",
+    }
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 
 from app.data_models.data_model import Spot
 from app.dtos.common.response import ErrorResponse, SuccessResponse
-from app.services.spots.spot_service import reg_spot, find_spot
+from app.services.spots.spot_service import reg_spot, find_spot, find_nearby_spots
 from app.repository.db import get_async_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -17,6 +18,22 @@ async def create_spot(spot: Spot, session: AsyncSession = Depends(get_async_sess
     except Exception as e:
         return ErrorResponse(message="일정 등록에 실패했습니다.", error_detail=e)
 
+# 주변 장소 조회 (저장된 장소만 사용, /{spot_id}보다 먼저 등록해야 함)
+@router.get("/nearby")
+async def read_nearby_spots(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(1.0, gt=0, le=50),
+    category: Optional[int] = Query(None, description="0: 숙소, 1: 관광지, 2: 식당, 3: 카페"),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        spots = await find_nearby_spots(latitude, longitude, radius_km, session, category, limit)
+        return SuccessResponse(data={"spots": spots}, message="주변 장소가 성공적으로 조회되었습니다.")
+    except Exception as e:
+        return ErrorResponse(message="주변 장소 조회에 실패했습니다.", error_detail=str(e))
+
 # 일정 조회    
 @router.get("/{spot_id}")
 async def read_spot(spot_id: int, session: AsyncSession = Depends(get_async_session)):
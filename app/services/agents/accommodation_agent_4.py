@@ -4,14 +4,15 @@ from crewai.project import agent, task, CrewBase, crew
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
-from langchain_openai import ChatOpenAI 
+from app.services.agents.llm_gateway import get_llm
 from crewai.tools import BaseTool 
 from urllib.parse import quote
-from serpapi import GoogleSearch
 from geopy.geocoders import Nominatim
+from app.services.regions.gazetteer import Gazetteer
+from app.services.regions.geocoding_service import GeocodingService
+from app.services.agents.tools.accommodation_tool import serper_post, serpapi_search
+from app.utils.async_bridge import run_sync
 from typing import List, Optional
-import json
-import http.client
 
 
 load_dotenv()
@@ -20,7 +21,7 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 SERP_API_KEY = os.getenv("SERP_API_KEY")
 
 
-llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7, openai_api_key=OPENAI_API_KEY)
+llm = get_llm(model="gpt-3.5-turbo", temperature=0.7, api_key=OPENAI_API_KEY)
 
 # AccommodationResponse 모델 정의
 class AccommodationResponse(BaseModel):
@@ -49,11 +50,17 @@ class GeoCoordinateTool(BaseTool):
     description: str = "지역의 위도 경도를 계산"
     
     def _run(self, location: str) -> str:
+        # 지역 이름과 정확히 일치하면 내장 행정구역 데이터로 바로 변환 (네트워크 호출 없음)
+        coordinates = Gazetteer().coordinates(location, exact=True)
+        if coordinates:
+            return list(coordinates)
         try:
-            geo_local = Nominatim(user_agent='South Korea')
-            geo = geo_local.geocode(location)
+            # 주소 캐시와 Nominatim 호출 간격 제한은 GeocodingService가 담당
+            geo = GeocodingService().geocode_sync(location, "nominatim")
+            # 지오코딩에 실패했을 때만 비슷한 지역 이름으로 대체
+            geo = geo or Gazetteer().coordinates(location)
             if geo:
-                location_coordinates = [geo.latitude, geo.longitude]
+                location_coordinates = list(geo)
                 return location_coordinates
         except Exception as e:
             return f"[GeoCoordinateTool] 에러: {str(e)}"      
@@ -62,68 +69,54 @@ class GeoCoordinateTool(BaseTool):
 class GoogleMapTool(BaseTool):
     name: str = "GoogleMapTool"
     description: str = "구글 맵 api를 사용하여 숙소 리스트 검색 툴"
-    
-    def _run(self, location: str, location_coordinates:str) -> str:
-        try:
-            conn = http.client.HTTPSConnection("google.serper.dev")
 
-            payload = json.dumps({
-            "q": f"{location}숙소",
-            'll': f"@{location_coordinates},15.1z", 
-            "gl": "kr",
-            "hl": "ko"
+    async def _arun(self, location: str, location_coordinates: str) -> dict:
+        try:
+            data = await serper_post("/maps", {
+                "q": f"{location}숙소",
+                "ll": f"@{location_coordinates},15.1z",
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/maps", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleMapTool] 에러: {str(e)}"
 
+    def _run(self, location: str, location_coordinates: str) -> dict:
+        return run_sync(self._arun(location, location_coordinates))
+
 # 구글 리뷰 툴 
 class GoogleReviewTool(BaseTool):
     name: str = "GoogleReviewTool"
     description: str = "구글 리뷰 API를 이용, 리뷰 검색 툴 "
-    
-    def _run(self, cid: str, fid: str) -> str:
-        try:            
-            conn = http.client.HTTPSConnection("google.serper.dev")
-
-            payload = json.dumps({
-            "cid": cid,
-            "fid": fid,
-            "gl": "kr",
-            "hl": "ko"
+
+    async def _arun(self, cid: str, fid: str) -> dict:
+        try:
+            data = await serper_post("/reviews", {
+                "cid": cid,
+                "fid": fid,
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/reviews", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
-            
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleReviewTool] 에러: {str(e)}"
+
+    def _run(self, cid: str, fid: str) -> dict:
+        return run_sync(self._arun(cid, fid))
         
 # 구글 호텔 툴
 class GoogleHotelSearchTool(BaseTool):
     name: str = "Google Hotel Search"
     description: str = "구글 호텔 검색 API를 사용하여 텍스트 정보를 검색"
-    
-    def _run(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> str:
-        try:            
-            
+
+    async def _arun(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> dict:
+        try:
             params = {
                 "engine": "google_hotels",
-                'q': f"{location} 숙소", 
+                "q": f"{location} 숙소",
                 "check_in_date": check_in_date,
                 "check_out_date": check_out_date,
                 "adults": adults,
@@ -131,16 +124,15 @@ class GoogleHotelSearchTool(BaseTool):
                 "currency": "KRW",
                 "gl": "kr",
                 "hl": "ko",
-                "api_key": GOOGLE_API_KEY
             }
-            
-            search = GoogleSearch(params)
-            hotel_results = search.get_dict()
+            hotel_results = await serpapi_search(params)
             print(f"전체 HOTEL API 응답: {hotel_results}")
             return hotel_results
-        
         except Exception as e:
-            return f"[GoogleHotelSearchTool] 에러: {str(e)}"        
+            return f"[GoogleHotelSearchTool] 에러: {str(e)}"
+
+    def _run(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> dict:
+        return run_sync(self._arun(location, check_in_date, check_out_date, adults, children))
 
 @CrewBase
 class AiLatestDevelopment():
@@ -175,7 +167,7 @@ class AiLatestDevelopment():
         
 
 # 에이전트 실행 함수 
-def run(location: str, check_in_date: str, check_out_date: str, 
+async def run(location: str, check_in_date: str, check_out_date: str, 
         age_group: int, adults: int, children: int, keyword: list, prompt:str) -> list:
 
     ai_dev = AiLatestDevelopment()
@@ -192,7 +184,8 @@ def run(location: str, check_in_date: str, check_out_date: str,
         "prompt" : prompt
     }
     
-    crew_output = crew_instance.kickoff(inputs=inputs)
+    # LLMGateway 입장 대기(threading.Condition)가 이벤트 루프를 막지 않도록 비동기 실행
+    crew_output = await crew_instance.kickoff_async(inputs=inputs)
     print(type(crew_output))
 
     if 'raw' in crew_output.__dict__:
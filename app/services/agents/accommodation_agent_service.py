@@ -3,7 +3,7 @@ from crewai.project import agent, task, CrewBase, crew
 from pydantic import BaseModel
 from dotenv import load_dotenv
 import os
-from langchain_openai import ChatOpenAI
+from app.services.agents.llm_gateway import get_llm
 from crewai.tools import BaseTool
 from urllib.parse import quote
 from serpapi import GoogleSearch
@@ -33,7 +33,7 @@ class AccommodationAgentService:
         """CrewAI 관련 객체들을 한 번만 생성"""
         print("CrewAISingleton 초기화 중...")
 
-        self.llm = ChatOpenAI(
+        self.llm = get_llm(
             model="gpt-4o-mini",
             api_key=OPENAI_API_KEY,
             temperature=0,
@@ -1,8 +1,10 @@
 import traceback
 from fastapi import HTTPException
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
+from app.services.agents.llm_gateway import get_llm
 from crewai.project import agent, task, CrewBase, crew
 from app.dtos.spot_models import spots_pydantic
+from app.utils.result_cache import cached_result
 from dotenv import load_dotenv
 import os
 from typing import List, Optional, Dict
@@ -34,7 +36,7 @@ class AccommodationAgentService:
 
     def initialize(self):
         """서비스 초기화"""
-        self.llm = LLM(model="gpt-4o", temperature=0, api_key=OPENAI_API_KEY)
+        self.llm = get_llm(model="gpt-4o", temperature=0, api_key=OPENAI_API_KEY)
         # Tools 초기화
         self.geocoordinate_tool = GeoCoordinateTool()
         self.google_map_tool = GoogleMapTool()
@@ -100,6 +102,7 @@ class AccommodationAgentService:
             print(result.__dict__['raw'])
             return result.__dict__['raw']
     
+    @cached_result("accommodation")
     async def create_recommendation(
         self, input_data: dict,
     ) -> dict:
@@ -1,8 +1,9 @@
 from crewai.tools import BaseTool 
-from serpapi import GoogleSearch
 from geopy.geocoders import Nominatim
-import json
-import http.client
+from app.services.regions.gazetteer import Gazetteer
+from app.services.regions.geocoding_service import GeocodingService
+from app.services.agents.tools.accommodation_tool import serper_post, serpapi_search
+from app.utils.async_bridge import run_sync
 from dotenv import load_dotenv
 import os
 
@@ -17,11 +18,17 @@ class GeoCoordinateTool(BaseTool):
     description: str = "지역의 위도 경도를 계산"
     
     def _run(self, location: str) -> str:
+        # 지역 이름과 정확히 일치하면 내장 행정구역 데이터로 바로 변환 (네트워크 호출 없음)
+        coordinates = Gazetteer().coordinates(location, exact=True)
+        if coordinates:
+            return list(coordinates)
         try:
-            geo_local = Nominatim(user_agent='South Korea')
-            geo = geo_local.geocode(location)
+            # 주소 캐시와 Nominatim 호출 간격 제한은 GeocodingService가 담당
+            geo = GeocodingService().geocode_sync(location, "nominatim")
+            # 지오코딩에 실패했을 때만 비슷한 지역 이름으로 대체
+            geo = geo or Gazetteer().coordinates(location)
             if geo:
-                location_coordinates = [geo.latitude, geo.longitude]
+                location_coordinates = list(geo)
                 return location_coordinates
         except Exception as e:
             return f"[GeoCoordinateTool] 에러: {str(e)}"      
@@ -30,68 +37,54 @@ class GeoCoordinateTool(BaseTool):
 class GoogleMapTool(BaseTool):
     name: str = "GoogleMapTool"
     description: str = "구글 맵 api를 사용하여 숙소 리스트 검색 툴"
-    
-    def _run(self, location: str, location_coordinates:str) -> str:
-        try:
-            conn = http.client.HTTPSConnection("google.serper.dev")
 
-            payload = json.dumps({
-            "q": f"{location}숙소",
-            'll': f"@{location_coordinates},15.1z", 
-            "gl": "kr",
-            "hl": "ko"
+    async def _arun(self, location: str, location_coordinates: str) -> dict:
+        try:
+            data = await serper_post("/maps", {
+                "q": f"{location}숙소",
+                "ll": f"@{location_coordinates},15.1z",
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/maps", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleMapTool] 에러: {str(e)}"
 
+    def _run(self, location: str, location_coordinates: str) -> dict:
+        return run_sync(self._arun(location, location_coordinates))
+
 # 구글 리뷰 툴 
 class GoogleReviewTool(BaseTool):
     name: str = "GoogleReviewTool"
     description: str = "구글 리뷰 API를 이용, 리뷰 검색 툴 "
-    
-    def _run(self, cid: str, fid: str) -> str:
-        try:            
-            conn = http.client.HTTPSConnection("google.serper.dev")
 
-            payload = json.dumps({
-            "cid": cid,
-            "fid": fid,
-            "gl": "kr",
-            "hl": "ko"
+    async def _arun(self, cid: str, fid: str) -> dict:
+        try:
+            data = await serper_post("/reviews", {
+                "cid": cid,
+                "fid": fid,
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/reviews", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
-            
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleReviewTool] 에러: {str(e)}"
+
+    def _run(self, cid: str, fid: str) -> dict:
+        return run_sync(self._arun(cid, fid))
         
 # 구글 호텔 툴
 class GoogleHotelSearchTool(BaseTool):
     name: str = "Google Hotel Search"
     description: str = "구글 호텔 검색 API를 사용하여 텍스트 정보를 검색"
-    
-    def _run(self, location: str, start_date: str, end_date:str,adults: int, children: int) -> str:
-        try:            
-            
+
+    async def _arun(self, location: str, start_date: str, end_date: str, adults: int, children: int) -> dict:
+        try:
             params = {
                 "engine": "google_hotels",
-                'q': f"{location} 숙소", 
+                "q": f"{location} 숙소",
                 "check_in_date": start_date,
                 "check_out_date": end_date,
                 "adults": adults,
@@ -99,13 +92,12 @@ class GoogleHotelSearchTool(BaseTool):
                 "currency": "KRW",
                 "gl": "kr",
                 "hl": "ko",
-                "api_key": GOOGLE_API_KEY
             }
-            
-            search = GoogleSearch(params)
-            hotel_results = search.get_dict()
+            hotel_results = await serpapi_search(params)
             print(f"전체 HOTEL API 응답: {hotel_results}")
             return hotel_results
-        
         except Exception as e:
-            return f"[GoogleHotelSearchTool] 에러: {str(e)}"      
\ No newline at end of file
+            return f"[GoogleHotelSearchTool] 에러: {str(e)}"
+
+    def _run(self, location: str, start_date: str, end_date: str, adults: int, children: int) -> dict:
+        return run_sync(self._arun(location, start_date, end_date, adults, children))
\ No newline at end of file
@@ -1,8 +1,11 @@
 from typing import List
-from crewai import Agent, Task, Crew, LLM, Process
+from crewai import Agent, Task, Crew, Process
+from app.services.agents.llm_gateway import get_llm
 from app.dtos.spot_models import spots_pydantic,calculate_trip_days
 from app.services.agents.tools.cafe_tool import NaverWebSearchTool,NaverBlogCralwerTool,NaverReviewCralwerTool
 from app.services.agents.tools.restaurant_tool import NaverImageSearchTool
+from app.utils.single_flight import single_flight
+from app.utils.result_cache import cached_result
 from typing import List, Dict, Optional
 import os
 from dotenv import load_dotenv
@@ -25,7 +28,7 @@ class CafeAgentService:
         """CrewAI 관련 객체들을 한 번만 생성"""
         #print("cafe agent를 초기화합니다")
                 
-        self.llm = LLM(model="gpt-4o-mini",api_key=OPENAI_API_KEY,temperature=0,max_tokens=4000)
+        self.llm = get_llm(model="gpt-4o-mini",api_key=OPENAI_API_KEY,temperature=0,max_tokens=4000)
         self.get_cafe_list_tool = NaverWebSearchTool()
         self.get_cafe_info_tool = NaverBlogCralwerTool()
         self.get_cafe_review_tool = NaverReviewCralwerTool()
@@ -159,6 +162,8 @@ class CafeAgentService:
             )
         }     
         
+    @cached_result("cafe")
+    @single_flight("cafe")
     async def create_recommendation(self, input_data: dict, prompt_text: Optional[str] = None) -> dict:
         """
         사용자 맞춤 카페를 추천하는 에이전트
@@ -0,0 +1,196 @@
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Tuple, Union
+from crewai import LLM
+from dotenv import load_dotenv
+from app.utils.upstream_replay import is_recording, is_replaying, llm_fixture_key, record_llm, replay_llm
+
+load_dotenv()
+# 전체 동시 LLM 호출 수
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# 제공자별 동시 호출 수 - LLM_CONCURRENCY_<제공자> 환경 변수로 변경 가능
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "openai": 6,
+}
+# 모델별 분당 토큰 예산 - LLM_TPM_<모델명> 환경 변수로 변경 가능 (예: LLM_TPM_GPT_4O_MINI)
+DEFAULT_MODEL_TPM = {
+    "gpt-4o": 30000,
+    "gpt-4o-mini": 200000,
+    "gpt-3.5-turbo": 200000,
+}
+# 응답 토큰 추정치 (요청 시점에는 알 수 없으므로 고정값으로 예약)
+COMPLETION_TOKEN_ALLOWANCE = int(os.getenv("LLM_COMPLETION_TOKEN_ALLOWANCE", "800"))
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+except Exception:
+    def count_tokens(text: str) -> int:
+        return (len(text) + 1) // 2
+
+
+def _env_key(name: str) -> str:
+    return name.upper().replace("-", "_").replace(".", "_").replace("/", "_")
+
+
+def provider_of(model: str) -> str:
+    """모델 이름에서 제공자 추출 (예: 'anthropic/claude-3' -> 'anthropic', 'gpt-4o' -> 'openai')"""
+    if "/" in model:
+        return model.split("/", 1)[0]
+    return "openai"
+
+
+def estimate_tokens(messages: Union[str, List[Dict[str, str]]]) -> int:
+    if isinstance(messages, str):
+        return count_tokens(messages)
+    return sum(count_tokens(str(message.get("content", ""))) for message in messages)
+
+
+class LLMGateway:
+    """
+    모든 에이전트 서비스가 공유하는 LLM 호출 입장 제어
+    - 전체 동시 호출 수 / 제공자별 동시 호출 수 제한
+    - 모델별 분당 토큰(TPM) 예산
+    - 모델별로 먼저 들어온 요청부터 처리하는 공정 대기열 (FIFO)
+      (한 모델이 TPM 예산을 기다리는 동안 다른 모델 요청까지 막히지 않도록 모델마다 따로 둠)
+    crewAI는 LLM.call을 작업 스레드에서 호출하므로 threading 기반으로 동작합니다.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(LLMGateway, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self._condition = threading.Condition()
+        self._queues: Dict[str, Deque[int]] = {}
+        self._next_ticket = 0
+        self._running = 0
+        self._running_by_provider: Dict[str, int] = {}
+        self._token_window: Dict[str, Deque[Tuple[float, int]]] = {}
+        self.metrics = {
+            "calls": 0,
+            "errors": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "llm_time_total": 0.0,
+            "llm_time_max": 0.0,
+        }
+
+    def provider_limit(self, provider: str) -> int:
+        default = DEFAULT_PROVIDER_CONCURRENCY.get(provider, LLM_MAX_CONCURRENCY)
+        return int(os.getenv(f"LLM_CONCURRENCY_{_env_key(provider)}", default))
+
+    def model_tpm(self, model: str) -> int:
+        default = DEFAULT_MODEL_TPM.get(model.split("/")[-1], 100000)
+        return int(os.getenv(f"LLM_TPM_{_env_key(model.split('/')[-1])}", default))
+
+    def _tokens_in_window(self, model: str, now: float) -> int:
+        window = self._token_window.setdefault(model, deque())
+        while window and window[0][0] <= now - 60:
+            window.popleft()
+        return sum(tokens for _, tokens in window)
+
+    def _can_start(self, model: str, provider: str, tokens: int, now: float) -> bool:
+        if self._running >= LLM_MAX_CONCURRENCY:
+            return False
+        if self._running_by_provider.get(provider, 0) >= self.provider_limit(provider):
+            return False
+        used = self._tokens_in_window(model, now)
+        # 예산보다 큰 단일 요청은 창이 비었을 때만 허용
+        return used == 0 or used + tokens <= self.model_tpm(model)
+
+    @contextmanager
+    def admit(self, model: str, messages: Union[str, List[Dict[str, str]]]):
+        provider = provider_of(model)
+        tokens = estimate_tokens(messages) + COMPLETION_TOKEN_ALLOWANCE
+        queued_at = time.monotonic()
+
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            queue = self._queues.setdefault(model, deque())
+            queue.append(ticket)
+            # 같은 모델 대기열의 맨 앞 요청만 시작할 수 있음 (공정성)
+            while not (queue[0] == ticket and self._can_start(model, provider, tokens, time.monotonic())):
+                self._condition.wait(timeout=1.0)
+            queue.popleft()
+            self._running += 1
+            self._running_by_provider[provider] = self._running_by_provider.get(provider, 0) + 1
+            self._token_window.setdefault(model, deque()).append((time.monotonic(), tokens))
+            self._condition.notify_all()
+
+        started = time.monotonic()
+        queue_wait = started - queued_at
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            llm_time = time.monotonic() - started
+            with self._condition:
+                self._running -= 1
+                self._running_by_provider[provider] -= 1
+                self.metrics["calls"] += 1
+                self.metrics["errors"] += int(failed)
+                self.metrics["queue_wait_total"] += queue_wait
+                self.metrics["queue_wait_max"] = max(self.metrics["queue_wait_max"], queue_wait)
+                self.metrics["llm_time_total"] += llm_time
+                self.metrics["llm_time_max"] = max(self.metrics["llm_time_max"], llm_time)
+                self._condition.notify_all()
+
+    def stats(self) -> dict:
+        with self._condition:
+            calls = self.metrics["calls"]
+            now = time.monotonic()
+            return {
+                "waiting": sum(len(queue) for queue in self._queues.values()),
+                "waiting_by_model": {model: len(queue) for model, queue in self._queues.items() if queue},
+                "running": self._running,
+                "running_by_provider": dict(self._running_by_provider),
+                "max_concurrency": LLM_MAX_CONCURRENCY,
+                "tokens_last_minute": {
+                    model: self._tokens_in_window(model, now) for model in self._token_window
+                },
+                **{key: round(value, 3) for key, value in self.metrics.items()},
+                "queue_wait_avg": round(self.metrics["queue_wait_total"] / calls, 3) if calls else 0.0,
+                "llm_time_avg": round(self.metrics["llm_time_total"] / calls, 3) if calls else 0.0,
+            }
+
+
+class GatedLLM(LLM):
+    """
+    LLMGateway의 입장 허가를 받은 뒤 호출하는 crewAI LLM
+    UPSTREAM_MODE=record 이면 응답을 fixture로 저장하고, replay 이면 저장된 응답을 반환 (API 호출 없음)
+    """
+
+    def call(self, messages, *args, **kwargs):
+        key = None
+        if is_recording() or is_replaying():
+            key = llm_fixture_key(self.model, messages, tools=kwargs.get("tools"))
+        with LLMGateway().admit(self.model, messages):
+            if is_replaying():
+                return replay_llm(key, self.model)
+            started = time.monotonic()
+            result = super().call(messages, *args, **kwargs)
+            if key is not None:
+                record_llm(key, self.model, messages, result, time.monotonic() - started)
+            return result
+
+
+def get_llm(model: str, **kwargs) -> LLM:
+    """에이전트 서비스에서 사용할 LLM 생성 (LLM(...) 대신 사용)"""
+    return GatedLLM(model=model, **kwargs)
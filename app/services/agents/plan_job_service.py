@@ -0,0 +1,288 @@
+import os
+import json
+import uuid
+import time
+import asyncio
+import sqlite3
+import threading
+import traceback
+from datetime import datetime
+from typing import List, Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from app.services.agents.travel_all_schedule_agent_service import TravelScheduleAgentService
+
+load_dotenv()
+PLAN_JOB_DB_PATH = os.getenv("PLAN_JOB_DB_PATH", "plan_jobs.sqlite3")
+PLAN_JOB_WORKERS = int(os.getenv("PLAN_JOB_WORKERS", "2"))
+PLAN_JOB_QUEUE_SIZE = int(os.getenv("PLAN_JOB_QUEUE_SIZE", "50"))
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _read_proc(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _process_start(pid: int) -> Optional[str]:
+    """/proc/<pid>/stat의 프로세스 시작 시각 (같은 pid가 재사용되어도 구분됨, Linux 외에는 None)"""
+    stat = _read_proc(f"/proc/{pid}/stat")
+    if stat is None:
+        return None
+    # 프로세스 이름에 공백/괄호가 있을 수 있으므로 마지막 ")" 뒤부터 필드를 셈 (starttime = 22번째 필드)
+    return stat.rsplit(")", 1)[-1].split()[19]
+
+
+# 작업을 등록한 프로세스 식별자 "<부팅 ID>:<pid>:<시작 시각>"
+# 여러 워커 프로세스가 같은 plan_jobs.sqlite3를 쓰므로, 재시작 시 주인이 살아 있는 작업은 건드리지 않기 위해 사용
+BOOT_ID = _read_proc("/proc/sys/kernel/random/boot_id") or ""
+PROCESS_OWNER = f"{BOOT_ID}:{os.getpid()}:{_process_start(os.getpid()) or uuid.uuid4().hex}"
+
+
+def is_owner_alive(owner: Optional[str]) -> bool:
+    """작업을 등록한 프로세스가 아직 실행 중인지 확인 (owner가 없는 이전 형식의 작업은 종료된 것으로 봄)"""
+    if not owner:
+        return False
+    boot_id, pid, started = owner.split(":", 2)
+    pid = int(pid)
+    if boot_id != BOOT_ID:
+        return False  # 재부팅 이전 프로세스
+    if pid == os.getpid():
+        return owner == PROCESS_OWNER  # 같은 pid를 받은 이전 프로세스(컨테이너 재시작 등)와 구분
+    current = _process_start(pid)
+    if current is not None or os.path.isdir("/proc"):
+        return current == started
+    if os.name == "nt":
+        return True  # 확인할 방법이 없으면 실행 중으로 간주
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class PlanJobStore:
+    """여행 일정 생성 작업을 로컬 SQLite 파일에 저장하는 저장소"""
+
+    def __init__(self, db_path: str = PLAN_JOB_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS plan_job (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    stage_timings TEXT NOT NULL DEFAULT '{}',
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    owner TEXT
+                )
+                """
+            )
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(plan_job)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE plan_job ADD COLUMN owner TEXT")
+
+    def insert(self, job_id: str, request: dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO plan_job (id, status, request, created_at, owner) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(request, ensure_ascii=False), datetime.now().isoformat(), PROCESS_OWNER),
+            )
+
+    def update(self, job_id: str, **fields):
+        for key in ("result", "stage_timings"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key], ensure_ascii=False, default=str)
+        columns = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE plan_job SET {columns} WHERE id = ?", (*fields.values(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM plan_job WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["request"] = json.loads(job["request"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["stage_timings"] = json.loads(job["stage_timings"])
+        return job
+
+    def count_by_status(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) AS count FROM plan_job GROUP BY status"
+            ).fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+    def fail_orphaned(self, reason: str) -> int:
+        """등록한 프로세스가 이미 종료되어 끝날 수 없는 작업만 실패 처리 (다른 워커 프로세스의 작업은 유지)"""
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, owner FROM plan_job WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            orphaned = [row["id"] for row in rows if not is_owner_alive(row["owner"])]
+            self._conn.executemany(
+                "UPDATE plan_job SET status = ?, error = ?, finished_at = ? WHERE id = ? AND status IN (?, ?)",
+                [(FAILED, reason, datetime.now().isoformat(), job_id, QUEUED, RUNNING) for job_id in orphaned],
+            )
+        return len(orphaned)
+
+
+class PlanJobService:
+    """
+    여행 일정 생성 작업 큐를 싱글톤 패턴으로 관리하는 서비스 클래스
+    - submit: 작업 등록 후 job_id 즉시 반환
+    - 제한된 개수의 워커가 큐에서 작업을 꺼내 카테고리 에이전트와 일정 생성을 실행
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PlanJobService, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self.store = PlanJobStore()
+        interrupted = self.store.fail_orphaned("서버 재시작으로 작업이 중단되었습니다.")
+        if interrupted:
+            print(f"[PlanJobService] 중단된 작업 {interrupted}건을 실패 처리했습니다.")
+        self.travel_schedule_agent_service = TravelScheduleAgentService()
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.running_jobs: set = set()
+
+    def _ensure_workers(self):
+        """실행 중인 이벤트 루프에서 큐와 워커를 최초 1회 생성"""
+        if self.queue is None:
+            self.queue = asyncio.Queue(maxsize=PLAN_JOB_QUEUE_SIZE)
+            self.workers = [
+                asyncio.create_task(self._worker(index)) for index in range(PLAN_JOB_WORKERS)
+            ]
+
+    async def submit(self, input_dict: dict, agent_type: List[str]) -> str:
+        """작업 등록 후 job_id 반환 (큐가 가득 차면 429)"""
+        self._ensure_workers()
+        if self.queue.full():
+            raise HTTPException(status_code=429, detail="대기 중인 일정 생성 작업이 너무 많습니다.")
+
+        job_id = uuid.uuid4().hex
+        self.store.insert(job_id, {"input": input_dict, "agent_type": agent_type})
+        self.queue.put_nowait(job_id)
+        return job_id
+
+    def get_job(self, job_id: str) -> dict:
+        job = self.store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="존재하지 않는 작업입니다.")
+        return job
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_size": PLAN_JOB_QUEUE_SIZE,
+            "running": len(self.running_jobs),
+            "workers": PLAN_JOB_WORKERS,
+            "jobs": self.store.count_by_status(),
+        }
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self.queue.get()
+            self.running_jobs.add(job_id)
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                traceback.print_exc()
+                print(f"[PlanJobService] worker-{index} 작업 {job_id} 처리 실패: {e}")
+            finally:
+                self.running_jobs.discard(job_id)
+                self.queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        job = self.store.get(job_id)
+        input_dict = job["request"]["input"]
+        agent_type = job["request"]["agent_type"]
+        stage_timings = {}
+        self.store.update(job_id, status=RUNNING, started_at=datetime.now().isoformat())
+
+        try:
+            # 카테고리별 소요 시간 기록
+            started = time.monotonic()
+            external_data, degraded = {}, {}
+            async for category, result, reason in self.travel_schedule_agent_service.iter_external_data(
+                input_dict, agent_type
+            ):
+                if result is not None:
+                    external_data[category] = result
+                if reason:
+                    degraded[category] = reason
+                stage_timings[category] = round(time.monotonic() - started, 3)
+                self.store.update(job_id, stage_timings=stage_timings)
+
+            if not external_data and degraded:
+                raise HTTPException(status_code=503, detail=f"모든 카테고리 에이전트가 실패했습니다: {degraded}")
+
+            # 최종 일정 생성 소요 시간 기록
+            plan_started = time.monotonic()
+            input_dict["external_data"] = external_data
+            result = await self.travel_schedule_agent_service.create_plan_within_budget(input_dict, started, degraded)
+            result["degraded"] = degraded
+            stage_timings["plan"] = round(time.monotonic() - plan_started, 3)
+            stage_timings["total"] = round(time.monotonic() - started, 3)
+
+            self.store.update(
+                job_id,
+                status=SUCCEEDED,
+                result=result,
+                stage_timings=stage_timings,
+                finished_at=datetime.now().isoformat(),
+            )
+        except asyncio.CancelledError:
+            self.store.update(
+                job_id,
+                status=FAILED,
+                error="서버 종료로 작업이 중단되었습니다.",
+                stage_timings=stage_timings,
+                finished_at=datetime.now().isoformat(),
+            )
+            raise
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            self.store.update(
+                job_id,
+                status=FAILED,
+                error=detail,
+                stage_timings=stage_timings,
+                finished_at=datetime.now().isoformat(),
+            )
+
+    async def shutdown(self):
+        """워커 종료 (애플리케이션 종료 시 호출)"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        self.queue = None
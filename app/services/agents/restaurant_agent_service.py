@@ -1,10 +1,13 @@
 import traceback
 import json
 from datetime import datetime
-from crewai import Agent, Task, Crew, LLM
+from crewai import Agent, Task, Crew
+from app.services.agents.llm_gateway import get_llm
 from typing import List, Dict, Optional
 from fastapi import HTTPException
 from app.dtos.spot_models import spots_pydantic
+from app.utils.single_flight import single_flight
+from app.utils.result_cache import cached_result
 from dotenv import load_dotenv
 import os
 from app.services.agents.tools.restaurant_tool import (
@@ -34,7 +37,7 @@ class RestaurantAgentService:
     def initialize(self):
         """서비스 초기화"""
         # print("RestaurantAgentService 초기화 중...")
-        self.llm = LLM(model="gpt-4o", temperature=0, api_key=OPENAI_API_KEY)
+        self.llm = get_llm(model="gpt-4o", temperature=0, api_key=OPENAI_API_KEY)
         # Tools 초기화
         self.geocoding_tool = GeocodingTool()
         self.restaurant_search_tool = RestaurantBasicSearchTool()
@@ -294,6 +297,8 @@ class RestaurantAgentService:
             "spots": spots_data.get("spots", []),
         }
 
+    @cached_result("restaurant")
+    @single_flight("restaurant")
     async def create_recommendation(
         self, input_data: dict, prompt: Optional[str] = None
     ) -> dict:
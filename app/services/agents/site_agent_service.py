@@ -3,11 +3,14 @@ import os
 from dotenv import load_dotenv
 import asyncio
 
-from crewai import Agent, Task, Crew, LLM
+from crewai import Agent, Task, Crew
+from app.services.agents.llm_gateway import get_llm
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.dtos.spot_models import spot_pydantic, spots_pydantic
+from app.utils.single_flight import single_flight
+from app.utils.result_cache import cached_result
 from app.services.agents.site_tool import (
     NaverWebSearchTool,
     extract_recommendations_from_output,
@@ -19,7 +22,7 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # LLM 초기화
-llm = LLM(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
+llm = get_llm(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
 
 
 class TravelPlanRequest(BaseModel):
@@ -85,6 +88,8 @@ class TravelPlanAgentService:
             verbose=True,
         )
 
+    @cached_result("site")
+    @single_flight("site")
     async def create_tourist_plan(self, user_input: dict):
         """
         여행 추천 계획을 생성하는 비동기 메서드.
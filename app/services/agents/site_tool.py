@@ -1,11 +1,14 @@
 import json
 import re
-import httpx
 import asyncio
 from dotenv import load_dotenv
 from crewai.tools import BaseTool
 from typing import List
 import os
+from app.services.regions.gazetteer import Gazetteer
+from app.services.regions.geocoding_service import GeocodingService
+from app.utils.async_bridge import run_sync
+from app.utils.http_clients import get_http_client
 
 load_dotenv()
 
@@ -19,9 +22,9 @@ KAKAO_API_KEY = os.getenv("KAKAO_API_KEY")
 
 async def check_url_openable_async(url: str) -> bool:
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.head(url, follow_redirects=True)
-            return 200 <= response.status_code < 400
+        client = get_http_client("probe")
+        response = await client.head(url, follow_redirects=True)
+        return 200 <= response.status_code < 400
     except Exception:
         return False
 
@@ -49,10 +52,10 @@ class NaverWebSearchTool(BaseTool):
         }
         params = {"query": query, "display": 3, "start": 1, "sort": "sim"}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, headers=headers, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_http_client("naver")
+            resp = await client.get(url, headers=headers, params=params)
+            resp.raise_for_status()
+            data = resp.json()
             items = data.get("items", [])
             if not items:
                 return f"[NaverWebSearchTool] '{query}' 검색 결과 없음."
@@ -67,7 +70,7 @@ class NaverWebSearchTool(BaseTool):
             return f"[NaverWebSearchTool] 에러: {str(e)}"
 
     def _run(self, query: str) -> str:
-        return asyncio.run(self._arun(query))
+        return run_sync(self._arun(query))
 
 
 class NaverImageSearchTool(BaseTool):
@@ -92,10 +95,10 @@ class NaverImageSearchTool(BaseTool):
             "filter": "all",
         }
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                resp = await client.get(url, headers=headers, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_http_client("naver")
+            resp = await client.get(url, headers=headers, params=params)
+            resp.raise_for_status()
+            data = resp.json()
             items = data.get("items", [])
             if not items:
                 return ""
@@ -119,7 +122,7 @@ class NaverImageSearchTool(BaseTool):
             return f"[NaverImageSearchTool] 에러: {str(e)}"
 
     def _run(self, query: str) -> str:
-        return asyncio.run(self._arun(query))
+        return run_sync(self._arun(query))
 
 
 def extract_json_from_text(text: str) -> str:
@@ -171,21 +174,13 @@ async def get_lat_lon_for_place_kakao(address: str) -> (float, float):
     """
     카카오 주소-좌표 변환 API를 호출하여 주어진 주소의 위도와 경도를 반환합니다.
     API 문서: https://apis.map.kakao.com/web/guide/#addressCoord
+    주소가 지역 이름 자체('부산', '강릉시')이면 내장 행정구역 데이터로 바로 반환합니다.
     """
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
-    params = {"query": address}
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-        documents = data.get("documents", [])
-        if documents:
-            # 첫 번째 결과의 좌표 정보를 사용 (경도: x, 위도: y)
-            x = float(documents[0]["address"].get("x", 0.0))
-            y = float(documents[0]["address"].get("y", 0.0))
-            return y, x  # (위도, 경도)
-    except Exception as e:
-        print(f"카카오 API 위도/경도 조회 에러: {e}")
+    region_coordinates = Gazetteer().coordinates(address, exact=True)
+    if region_coordinates:
+        return region_coordinates
+    # 주소 캐시(결과 없음 포함)와 동시 요청 합치기는 GeocodingService가 담당
+    coordinates = await GeocodingService().geocode(address, "kakao")
+    if coordinates:
+        return coordinates
     return 0.0, 0.0
@@ -1,12 +1,13 @@
 from crewai.tools import BaseTool
-from serpapi import GoogleSearch
 from geopy.geocoders import Nominatim
+from app.services.regions.gazetteer import Gazetteer
+from app.services.regions.geocoding_service import GeocodingService
+from app.utils.async_bridge import run_sync
+from app.utils.http_clients import get_http_client
 from dotenv import load_dotenv
 import os
 import re
-import httpx
-import json
-import http.client
+import orjson
 
 
 load_dotenv()
@@ -14,6 +15,37 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 SERP_API_KEY = os.getenv("SERP_API_KEY")
 
+SERPER_BASE_URL = "https://google.serper.dev"
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+# Serper/SerpAPI 응답 대기 최대 시간 (초)
+ACCOMMODATION_API_TIMEOUT = float(os.getenv("ACCOMMODATION_API_TIMEOUT", "20"))
+
+
+async def fetch_json(provider: str, method: str, url: str, **kwargs) -> dict:
+    """
+    제공자별 연결 풀 클라이언트로 요청하고 JSON 응답을 반환
+    본문은 스트리밍으로 받는 대로 모아 문자열 변환 없이 orjson으로 바로 디코딩
+    """
+    client = get_http_client(provider)
+    async with client.stream(method, url, timeout=ACCOMMODATION_API_TIMEOUT, **kwargs) as response:
+        response.raise_for_status()
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+    return orjson.loads(body)
+
+
+async def serper_post(path: str, payload: dict) -> dict:
+    """serper.dev 검색 (path: "/maps", "/reviews" 등)"""
+    headers = {"X-API-KEY": SERP_API_KEY, "Content-Type": "application/json"}
+    return await fetch_json("serper", "POST", f"{SERPER_BASE_URL}{path}", headers=headers, json=payload)
+
+
+async def serpapi_search(params: dict) -> dict:
+    """SerpAPI 검색 (serpapi.GoogleSearch(params).get_dict()의 비동기 버전)"""
+    return await fetch_json("serpapi", "GET", SERPAPI_SEARCH_URL, params={**params, "api_key": GOOGLE_API_KEY})
+
+
 async def check_url_openable_async(url: str) -> bool:
     """
     주어진 URL에 대해 HEAD 요청을 보내어 접근 가능한지 확인합니다.
@@ -26,12 +58,12 @@ async def check_url_openable_async(url: str) -> bool:
         return False
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.head(url, follow_redirects=True)
-            if 200 <= response.status_code < 400:
-                return True
-            else:
-                return False
+        client = get_http_client("probe")
+        response = await client.head(url, follow_redirects=True)
+        if 200 <= response.status_code < 400:
+            return True
+        else:
+            return False
     except Exception as e:
         print(f"Error checking URL '{url}': {e}")
         return False
@@ -43,11 +75,17 @@ class GeoCoordinateTool(BaseTool):
     description: str = "지역의 위도 경도를 계산"
     
     def _run(self, location: str) -> str:
+        # 지역 이름과 정확히 일치하면 내장 행정구역 데이터로 바로 변환 (네트워크 호출 없음)
+        coordinates = Gazetteer().coordinates(location, exact=True)
+        if coordinates:
+            return list(coordinates)
         try:
-            geo_local = Nominatim(user_agent='South Korea')
-            geo = geo_local.geocode(location)
+            # 주소 캐시와 Nominatim 호출 간격 제한은 GeocodingService가 담당
+            geo = GeocodingService().geocode_sync(location, "nominatim")
+            # 지오코딩에 실패했을 때만 비슷한 지역 이름으로 대체
+            geo = geo or Gazetteer().coordinates(location)
             if geo:
-                location_coordinates = [geo.latitude, geo.longitude]
+                location_coordinates = list(geo)
                 return location_coordinates
         except Exception as e:
             return f"[GeoCoordinateTool] 에러: {str(e)}"      
@@ -56,68 +94,54 @@ class GeoCoordinateTool(BaseTool):
 class GoogleMapTool(BaseTool):
     name: str = "GoogleMapTool"
     description: str = "구글 맵 api를 사용하여 숙소 리스트 검색 툴"
-    
-    def _run(self, location: str, location_coordinates:str) -> str:
-        try:
-            conn = http.client.HTTPSConnection("google.serper.dev")
 
-            payload = json.dumps({
-            "q": f"{location}숙소",
-            'll': f"@{location_coordinates},15.1z", 
-            "gl": "kr",
-            "hl": "ko"
+    async def _arun(self, location: str, location_coordinates: str) -> dict:
+        try:
+            data = await serper_post("/maps", {
+                "q": f"{location}숙소",
+                "ll": f"@{location_coordinates},15.1z",
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/maps", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleMapTool] 에러: {str(e)}"
 
+    def _run(self, location: str, location_coordinates: str) -> dict:
+        return run_sync(self._arun(location, location_coordinates))
+
 # 구글 리뷰 툴 
 class GoogleReviewTool(BaseTool):
     name: str = "GoogleReviewTool"
     description: str = "구글 리뷰 API를 이용, 리뷰 검색 툴 "
-    
-    def _run(self, cid: str, fid: str) -> str:
-        try:            
-            conn = http.client.HTTPSConnection("google.serper.dev")
-
-            payload = json.dumps({
-            "cid": cid,
-            "fid": fid,
-            "gl": "kr",
-            "hl": "ko"
+
+    async def _arun(self, cid: str, fid: str) -> dict:
+        try:
+            data = await serper_post("/reviews", {
+                "cid": cid,
+                "fid": fid,
+                "gl": "kr",
+                "hl": "ko",
             })
-            headers = {
-            'X-API-KEY': SERP_API_KEY,
-            'Content-Type': 'application/json'
-            }
-            conn.request("POST", "/reviews", payload, headers)
-            res = conn.getresponse()
-            data = res.read()
-            print(data.decode("utf-8"))
-            return json.loads(data.decode("utf-8"))
-            
+            print(data)
+            return data
         except Exception as e:
             return f"[GoogleReviewTool] 에러: {str(e)}"
+
+    def _run(self, cid: str, fid: str) -> dict:
+        return run_sync(self._arun(cid, fid))
         
 # 구글 호텔 툴
 class GoogleHotelSearchTool(BaseTool):
     name: str = "Google Hotel Search"
     description: str = "구글 호텔 검색 API를 사용하여 텍스트 정보를 검색"
-    
-    def _run(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> str:
-        try:            
-            
+
+    async def _arun(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> dict:
+        try:
             params = {
                 "engine": "google_hotels",
-                'q': f"{location} 숙소", 
+                "q": f"{location} 숙소",
                 "check_in_date": check_in_date,
                 "check_out_date": check_out_date,
                 "adults": adults,
@@ -125,13 +149,12 @@ class GoogleHotelSearchTool(BaseTool):
                 "currency": "KRW",
                 "gl": "kr",
                 "hl": "ko",
-                "api_key": GOOGLE_API_KEY
             }
-            
-            search = GoogleSearch(params)
-            hotel_results = search.get_dict()
+            hotel_results = await serpapi_search(params)
             print(f"전체 HOTEL API 응답: {hotel_results}")
             return hotel_results
-        
         except Exception as e:
-            return f"[GoogleHotelSearchTool] 에러: {str(e)}"        
+            return f"[GoogleHotelSearchTool] 에러: {str(e)}"
+
+    def _run(self, location: str, check_in_date: str, check_out_date: str, adults: int, children: int) -> dict:
+        return run_sync(self._arun(location, check_in_date, check_out_date, adults, children))
@@ -1,13 +1,33 @@
 import numpy as np
-from typing import List, Dict
-from geopy.distance import geodesic
+from typing import List, Dict, Optional, Tuple
 from crewai.tools import BaseTool
+from app.services.agents.tools.distance_matrix import distance_matrix as build_distance_matrix
+from app.services.agents.tools.distance_cache import DISTANCE_CACHE_ENABLED, cached_distance_matrix
+from app.services.agents.tools.route_engine import solve_route
+from app.services.agents.tools.opening_hours import spot_hours
+from app.services.agents.tools.time_window_router import (
+    DWELL_MINUTES,
+    ROUTE_SPEED_MODE,
+    SLOT_WINDOWS,
+    Stop,
+    format_minutes,
+    solve_time_windows,
+)
 
 class HaversineRouteOptimizer(BaseTool):
     """하버사인 공식을 활용하여 최적 방문 경로를 계산하는 도구"""
 
     name: str = "HaversineRouteOptimizer"
     description: str = "여행 일정에서 주어진 장소들의 최적 방문 순서를 거리 기반으로 제공합니다."
+    # 거리 계산 방식 ("haversine" 또는 타원체 기준으로 더 정확한 "vincenty")
+    distance_method: str = "haversine"
+    # 장소 쌍 거리 캐시(geohash 쌍 기준, 메모리 LRU + SQLite) 사용 여부 (기본값은 DISTANCE_CACHE_ENABLED 환경 변수)
+    use_distance_cache: bool = DISTANCE_CACHE_ENABLED
+    # 경로 개선(2-opt / Or-opt)에 쓸 최대 시간(초)
+    route_time_budget: float = 0.05
+    # 영업시간/시간대 창을 지키는 경로 계산 여부와 이동 수단 속도 모델 ("walking", "transit", "driving")
+    time_window_mode: bool = False
+    speed_mode: str = ROUTE_SPEED_MODE
 
     def _run(self, spots: List[Dict]) -> List[Dict]:
         """주어진 장소들의 최적 방문 순서를 거리 기반으로 정렬"""
@@ -20,8 +40,12 @@ class HaversineRouteOptimizer(BaseTool):
         # 거리 행렬 계산
         distance_matrix = self._compute_distance_matrix(locations)
 
-        # 최적 방문 순서 결정 (탐욕적 알고리즘)
-        optimal_order = self._compute_optimal_route(distance_matrix)
+        if self.time_window_mode:
+            return self._compute_time_window_route(spots, distance_matrix)
+
+        # 최적 방문 순서 결정 (숙소가 있으면 숙소에서 출발)
+        start = next((i for i, spot in enumerate(spots) if spot.get("spot_category") == 0), None)
+        optimal_order = self._compute_optimal_route(distance_matrix, start=start)
 
         # 최적 순서대로 spots 정렬
         optimized_spots = [spots[i] for i in optimal_order]
@@ -29,38 +53,35 @@ class HaversineRouteOptimizer(BaseTool):
         return optimized_spots
 
     def _compute_distance_matrix(self, locations: List[tuple]) -> np.ndarray:
-        """위도, 경도 정보를 이용하여 거리 행렬 생성"""
-        num_locations = len(locations)
-        distance_matrix = np.zeros((num_locations, num_locations))
-
-        for i in range(num_locations):
-            for j in range(i + 1, num_locations):
-                distance = geodesic(locations[i], locations[j]).kilometers  # 하버사인 거리(km)
-                distance_matrix[i][j] = distance
-                distance_matrix[j][i] = distance  # 대칭 행렬
-
-        return distance_matrix
-
-    def _compute_optimal_route(self, distance_matrix: np.ndarray) -> List[int]:
-        """탐욕적(Greedy) 방법으로 최적 방문 순서를 계산"""
-        num_locations = len(distance_matrix)
-        visited = [False] * num_locations
-        route = [0]  # 첫 번째 장소부터 시작
-        visited[0] = True
-
-        for _ in range(num_locations - 1):
-            last_visited = route[-1]
-            nearest = None
-            nearest_distance = float("inf")
-
-            # 가장 가까운 미방문 장소 찾기
-            for i in range(num_locations):
-                if not visited[i] and distance_matrix[last_visited][i] < nearest_distance:
-                    nearest = i
-                    nearest_distance = distance_matrix[last_visited][i]
-
-            if nearest is not None:
-                route.append(nearest)
-                visited[nearest] = True
-
-        return route
+        """위도, 경도 정보를 이용하여 거리 행렬(km) 생성 (NumPy 벡터 연산, use_distance_cache이면 이전에 계산한 쌍은 캐시에서 조회)"""
+        if self.use_distance_cache:
+            return cached_distance_matrix(locations, mode=self.distance_method)
+        return build_distance_matrix(locations, method=self.distance_method)
+
+    def _compute_optimal_route(self, distance_matrix: np.ndarray, start: Optional[int] = None, end: Optional[int] = None) -> List[int]:
+        """다중 출발 최근접 이웃 + 2-opt / Or-opt로 최적 방문 순서를 계산"""
+        order, _ = self._compute_route(distance_matrix, start=start, end=end)
+        return order
+
+    def _compute_route(self, distance_matrix: np.ndarray, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[List[int], float]:
+        """방문 순서와 총 이동 거리(km) 반환 (start, end로 출발지/도착지 고정)"""
+        return solve_route(distance_matrix, start=start, end=end, time_budget=self.route_time_budget)
+
+    def _compute_time_window_route(self, spots: List[Dict], distance_matrix: np.ndarray, weekday: Optional[int] = None) -> List[Dict]:
+        """
+        spot_time(08:00 / 12:00 / 18:00 시간대)과 영업시간을 지키는 방문 순서로 정렬하고
+        spot_time을 계산된 방문 시각으로 바꿔 반환
+        """
+        stops = [
+            Stop(
+                window=SLOT_WINDOWS.get(spot.get("spot_time"), (8 * 60, 23 * 60)),
+                dwell=DWELL_MINUTES.get(int(spot.get("spot_category", 1)), 60),
+                hours=spot_hours(spot, weekday),
+            )
+            for spot in spots
+        ]
+        route = solve_time_windows(stops, distance_matrix, mode=self.speed_mode, time_budget=self.route_time_budget)
+        return [
+            {**spots[position], "spot_time": format_minutes(arrival)}
+            for position, arrival in zip(route.order, route.arrivals)
+        ]
@@ -4,7 +4,6 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import asyncio
-import aiohttp       
 import emoji
 from crewai.tools import BaseTool
 import json
@@ -14,6 +13,9 @@ from pydantic import BaseModel, Field
 
 from dotenv import load_dotenv
 import os
+from app.utils.async_bridge import run_sync
+from app.utils.http_clients import get_http_client, get_sync_http_client
+from app.utils.upstream_replay import replayable
 
 load_dotenv()
 
@@ -51,6 +53,8 @@ class WebDriver:
             WebDriver._driver.quit()
             WebDriver._driver = None
          
+# replay 모드에서는 브라우저를 띄우지 않고 녹화된 크롤링 결과를 반환
+@replayable("crawler")
 def cafe_list_crawler(query):
     """
     네이버 지도에서 카페 정보를 크롤링하는 함수
@@ -114,7 +118,7 @@ def cafe_list_crawler(query):
     finally:
         WebDriver().quit_driver()    
         
-async def fetch_review(session, place_id):
+async def fetch_review(client, place_id):
     """
     비동기 리뷰 스크래퍼. 네이버 지도에서 카페를 정적 크롤링을 통해 검색하고 리뷰를 가져오는 도구.
     """
@@ -124,22 +128,22 @@ async def fetch_review(session, place_id):
         "Referer": "https://m.place.naver.com/"
     }
     
-    async with session.get(url, headers=headers) as response:
-        if response.status != 200:
-            print(f"{place_id} 요청 실패: {response.status}")
-            return {"place_id": place_id, "reviews": []}
-
-        html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
-        reviews = soup.find_all("div", class_="pui__vn15t2")
-        reviews_list = [emoji.replace_emoji(review.text, replace='') for review in reviews]
-        # print(len(reviews_list)) #10개 리뷰
-        return {
-            "place_id": place_id,
-            "reviews": reviews_list
-        }
+    response = await client.get(url, headers=headers)
+    if response.status_code != 200:
+        print(f"{place_id} 요청 실패: {response.status_code}")
+        return {"place_id": place_id, "reviews": []}
+
+    html = response.text
+    soup = BeautifulSoup(html, "html.parser")
+    reviews = soup.find_all("div", class_="pui__vn15t2")
+    reviews_list = [emoji.replace_emoji(review.text, replace='') for review in reviews]
+    # print(len(reviews_list)) #10개 리뷰
+    return {
+        "place_id": place_id,
+        "reviews": reviews_list
+    }
 
-async def fetch_business(session, place_id):
+async def fetch_business(client, place_id):
     """
     비동기 정보 스크래퍼. 네이버 지도에서 카페를 정적 크롤링을 통해 검색하고 정보를 가져오는 도구.
     """
@@ -150,32 +154,32 @@ async def fetch_business(session, place_id):
         "Referer": "https://m.place.naver.com/"
     }
     
-    async with session.get(url, headers=headers) as response:
-        if response.status != 200:
-            print(f"{place_id} 요청 실패: {response.status}")
-            return {"place_id": place_id, "reviews": []}
+    response = await client.get(url, headers=headers)
+    if response.status_code != 200:
+        print(f"{place_id} 요청 실패: {response.status_code}")
+        return {"place_id": place_id, "reviews": []}
 
-        html = await response.text()
-        soup = BeautifulSoup(html, "html.parser")
+    html = response.text
+    soup = BeautifulSoup(html, "html.parser")
         
-        try:
-            div_tag = soup.find("div", class_="jO09N")
-            a_tag = div_tag.find("a") if div_tag else None
-            url = a_tag["href"] if a_tag else "정보 없음"
+    try:
+        div_tag = soup.find("div", class_="jO09N")
+        a_tag = div_tag.find("a") if div_tag else None
+        url = a_tag["href"] if a_tag else "정보 없음"
 
-            business_span = soup.find("span", class_="U7pYf")
-            business_hour = business_span.find("span").text if business_span and business_span.find("span") else "정보 없음"
+        business_span = soup.find("span", class_="U7pYf")
+        business_hour = business_span.find("span").text if business_span and business_span.find("span") else "정보 없음"
 
-        except Exception as e:
-            print(f"Parsing error: {e}")
-            url = "정보 없음"
-            business_hour = "정보 없음"
+    except Exception as e:
+        print(f"Parsing error: {e}")
+        url = "정보 없음"
+        business_hour = "정보 없음"
         
-        return {
-            "place_id": place_id,
-            "url": url,
-            "business_hour": business_hour
-        }
+    return {
+        "place_id": place_id,
+        "url": url,
+        "business_hour": business_hour
+    }
                          
 class QuerySchema(BaseModel):
     query: str = Field(
@@ -191,39 +195,27 @@ class GetCafeListTool(BaseTool):
     한 번의 검색으로 충분한 정보를 제공합니다.
     """
     args_schema: Type[BaseModel] = QuerySchema
-    _loop = None
-    
-    def __init__(self):
-        super().__init__()
-        if self._loop is None:
-            self._loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._loop)
-    
-    # 리소스 정리        
-    def __del__(self):            
-        if self._loop and not self._loop.is_closed():
-            self._loop.close()
 
     async def _collect_reviews(self, cafe_list):
-        async with aiohttp.ClientSession() as session:
-            tasks = [fetch_review(session, cafe["place_id"]) for cafe in cafe_list]
-            return await asyncio.gather(*tasks)
+        client = get_http_client("naver")
+        tasks = [fetch_review(client, cafe["place_id"]) for cafe in cafe_list]
+        return await asyncio.gather(*tasks)
      
     async def _collect_business_info(self, cafe_list):
-        async with aiohttp.ClientSession() as session:
-            tasks = [fetch_business(session, cafe["place_id"]) for cafe in cafe_list]
-            return await asyncio.gather(*tasks)
+        client = get_http_client("naver")
+        tasks = [fetch_business(client, cafe["place_id"]) for cafe in cafe_list]
+        return await asyncio.gather(*tasks)
             
     def _run(self, query: str) -> str:
         try:
             cafe_list = cafe_list_crawler(query)
 
-            reviews = self._loop.run_until_complete(self._collect_reviews(cafe_list))
+            reviews = run_sync(self._collect_reviews(cafe_list))
             
             for cafe, review in zip(cafe_list, reviews):
                 cafe['reviews'] = review.get('reviews', [])
 
-            business_info = self._loop.run_until_complete(self._collect_business_info(cafe_list))
+            business_info = run_sync(self._collect_business_info(cafe_list))
             
             for cafe, info in zip(cafe_list, business_info):
                 cafe['url'] = info.get('url', '')
@@ -244,13 +236,11 @@ class GetCafeListTool(BaseTool):
 
 import json
 import re
-import httpx
 import asyncio
 from dotenv import load_dotenv
 from crewai.tools import BaseTool
 from typing import List
 import os
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
@@ -280,10 +270,10 @@ class NaverWebSearchTool(BaseTool):
         }
         params = {"query": query, "display": 30, "start": 1, "sort": "sim"}
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, headers=headers, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_http_client("naver")
+            resp = await client.get(url, headers=headers, params=params)
+            resp.raise_for_status()
+            data = resp.json()
             items = data.get("items", [])
             if not items:
                 return f"[NaverWebSearchTool] '{query}' 검색 결과 없음."
@@ -300,7 +290,7 @@ class NaverWebSearchTool(BaseTool):
             return f"[NaverWebSearchTool] 에러: {str(e)}"
 
     def _run(self, query: str) -> str:
-        return asyncio.run(self._arun(query))
+        return run_sync(self._arun(query))
 
 class NaverBlogCralwerTool(BaseTool):
     name: str = "NaverBlogCralwer"
@@ -313,9 +303,9 @@ class NaverBlogCralwerTool(BaseTool):
             "Referer": "https://m.blog.naver.com/"
         }
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
+            client = get_http_client("naver")
+            resp = await client.get(url, headers=headers)
+            resp.raise_for_status()
 
             soup = BeautifulSoup(resp.text, "html.parser")
             a_tag = soup.find("a", class_="se-map-info __se_link")
@@ -351,7 +341,7 @@ class NaverBlogCralwerTool(BaseTool):
 
     def _run(self, urls: List[str]) -> str:
         """동기 함수에서 실행 (urls는 블로그 URL 리스트)"""
-        return asyncio.run(self._arun(urls))
+        return run_sync(self._arun(urls))
     
 class NaverReviewCralwerTool(BaseTool):
     name: str = "NaverReviewCralwer"
@@ -364,9 +354,9 @@ class NaverReviewCralwerTool(BaseTool):
             "Referer": "https://m.place.naver.com/"
         }
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
+            client = get_http_client("naver")
+            resp = await client.get(url, headers=headers)
+            resp.raise_for_status()
 
             soup = BeautifulSoup(resp.text, "html.parser")
             reviews = soup.find_all("div", class_="pui__vn15t2")
@@ -393,7 +383,7 @@ class NaverReviewCralwerTool(BaseTool):
 
     def _run(self, placeIds: List[str]) -> str:
         """동기 함수에서 실행 (queryplaceIds는 장소 placeId 리스트)"""
-        return asyncio.run(self._arun(placeIds))
+        return run_sync(self._arun(placeIds))
         
 
 # naver_tool = NaverWebSearchTool()
@@ -416,7 +406,6 @@ from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Any, Type
 import json
-import requests
 import os
 from dotenv import load_dotenv
 
@@ -451,8 +440,7 @@ class GoogleMapSearchTool(BaseTool):
         }
 
         try:
-            with requests.Session() as session:
-                resp = session.post(url, headers=headers, data=payload)
+            resp = get_sync_http_client("serper").post(url, headers=headers, content=payload)
 
             resp.raise_for_status()
             data = resp.json()
@@ -504,8 +492,7 @@ class NaverLocalSearchTool(BaseTool):
             "sort": sort,
         }
 
-        with requests.Session() as session:
-            response = session.get(search_url, headers=headers, params=params)
+        response = get_sync_http_client("naver").get(search_url, headers=headers, params=params)
 
         results = []
         if response.status_code == 200:
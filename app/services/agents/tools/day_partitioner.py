@@ -0,0 +1,122 @@
+import math
+import numpy as np
+from typing import Dict, List, Optional
+from app.services.agents.tools.distance_matrix import haversine_matrix
+
+
+def _coordinates(spot: dict) -> Optional[tuple]:
+    try:
+        latitude, longitude = float(spot.get("latitude")), float(spot.get("longitude"))
+    except (TypeError, ValueError):
+        return None
+    if not latitude or not longitude:
+        return None
+    return latitude, longitude
+
+
+def _initial_centroids(points: np.ndarray, count: int) -> np.ndarray:
+    """가장 먼 점을 차례로 고르는 방식(farthest-first)으로 초기 중심 선택 (결과가 항상 같도록 무작위 없음)"""
+    matrix = haversine_matrix(points)
+    first = int(np.argmin(matrix.sum(axis=1)))
+    chosen = [first]
+    nearest = matrix[first]
+    while len(chosen) < count:
+        picked = int(np.argmax(nearest))
+        chosen.append(picked)
+        nearest = np.minimum(nearest, matrix[picked])
+    return points[chosen]
+
+
+def _balanced_assign(points: np.ndarray, categories: List[int], centroids: np.ndarray, capacities: List[Dict[int, int]]) -> List[Optional[int]]:
+    """
+    중심까지 가까운 (장소, 날짜) 쌍부터 배정하되 날짜별 카테고리 정원을 넘지 않도록 배정
+    정원이 모두 찬 장소는 None
+    """
+    distances = haversine_matrix(np.vstack([points, centroids]))[: len(points), len(points):]
+    remaining = [dict(capacity) for capacity in capacities]
+    assignment: List[Optional[int]] = [None] * len(points)
+    for flat_index in np.argsort(distances, axis=None, kind="stable"):
+        spot_index, day_index = divmod(int(flat_index), len(centroids))
+        if assignment[spot_index] is not None:
+            continue
+        category = categories[spot_index]
+        if remaining[day_index].get(category, 0) > 0:
+            remaining[day_index][category] -= 1
+            assignment[spot_index] = day_index
+    return assignment
+
+
+def category_quotas(categories: List[int], trip_days: int) -> Dict[int, int]:
+    """카테고리별 하루 정원 = ceil(장소 수 / 일수) (모든 장소가 배정되면서 날짜별로 고르게 나뉨)"""
+    counts: Dict[int, int] = {}
+    for category in categories:
+        counts[category] = counts.get(category, 0) + 1
+    return {category: math.ceil(count / trip_days) for category, count in counts.items()}
+
+
+def partition_days(
+    spots: List[dict],
+    trip_days: int,
+    quotas: Optional[Dict[int, int]] = None,
+    iterations: int = 10,
+) -> List[List[int]]:
+    """
+    장소들을 여행 일수만큼의 지리적으로 가까운 묶음으로 나눔
+    - 날짜별 카테고리 정원(spot_category -> 하루 최대 장소 수)을 지켜 특정 날짜에 맛집, 카페, 관광지가 몰리지 않도록 함
+      (quotas를 생략하면 category_quotas로 균등 분배)
+    - 좌표가 없는 장소는 남은 정원이 있는 날짜에 순서대로 배정
+    - 정원이 모자라 어느 날짜에도 배정되지 않은 장소는 제외
+    반환: 날짜별 장소 인덱스 리스트 (각 리스트는 원래 순서(추천 순위) 유지)
+    """
+    trip_days = max(1, trip_days)
+    categories = [int(spot.get("spot_category", 1)) for spot in spots]
+    quotas = quotas or category_quotas(categories, trip_days)
+    capacities = [dict(quotas) for _ in range(trip_days)]
+
+    located = [index for index, spot in enumerate(spots) if _coordinates(spot) is not None]
+    days: List[List[int]] = [[] for _ in range(trip_days)]
+    if located:
+        points = np.array([_coordinates(spots[index]) for index in located])
+        located_categories = [categories[index] for index in located]
+        centroids = _initial_centroids(points, min(trip_days, len(located)))
+        if len(centroids) < trip_days:
+            centroids = np.vstack([centroids, np.repeat(centroids[-1:], trip_days - len(centroids), axis=0)])
+
+        assignment: List[Optional[int]] = []
+        for _ in range(iterations):
+            assignment = _balanced_assign(points, located_categories, centroids, capacities)
+            updated = centroids.copy()
+            for day_index in range(trip_days):
+                members = [i for i, assigned in enumerate(assignment) if assigned == day_index]
+                if members:
+                    updated[day_index] = points[members].mean(axis=0)
+            if np.allclose(updated, centroids):
+                break
+            centroids = updated
+
+        for position, day_index in enumerate(assignment):
+            if day_index is not None:
+                days[day_index].append(located[position])
+                capacities[day_index][located_categories[position]] -= 1
+
+    # 좌표가 없는 장소는 정원이 남은 날짜에 순서대로 배정
+    located_set = set(located)
+    for index in range(len(spots)):
+        if index in located_set:
+            continue
+        for day_index in sorted(range(trip_days), key=lambda day: len(days[day])):
+            if capacities[day_index].get(categories[index], 0) > 0:
+                capacities[day_index][categories[index]] -= 1
+                days[day_index].append(index)
+                break
+
+    return [sorted(day) for day in days]
+
+
+def day_hints(spots: List[dict], trip_days: int, quotas: Optional[Dict[int, int]] = None) -> Dict[int, int]:
+    """장소 인덱스 -> 추천 날짜(1부터 시작) (배정되지 않은 장소는 제외)"""
+    return {
+        index: day_index + 1
+        for day_index, day in enumerate(partition_days(spots, trip_days, quotas))
+        for index in day
+    }
@@ -0,0 +1,60 @@
+import os
+import numpy as np
+from typing import List, Tuple
+from dotenv import load_dotenv
+from app.utils import geohash
+from app.utils.result_cache import get_cache
+from app.services.agents.tools.distance_matrix import Locations, distance_matrix
+
+load_dotenv()
+# 경로 계산 도구가 거리 행렬을 이 캐시에서 조회할지 여부 (기본 false)
+# 지금의 로컬 계산 방식(haversine/vincenty/road 추정)은 120곳 기준 vincenty도 행렬 계산(약 6ms)이
+# 캐시 적중 조회(약 30ms)보다 빠르므로 꺼 둠 - 외부 거리/이동 시간 API처럼 계산이 비싼 방식을 쓸 때 켬
+DISTANCE_CACHE_ENABLED = os.getenv("DISTANCE_CACHE_ENABLED", "false").lower() == "true"
+# 장소 식별용 geohash 자리수 (9자리 ≈ 5m, 같은 장소는 같은 셀에 들어감)
+DISTANCE_GEOHASH_PRECISION = 9
+
+
+def pair_key(mode: str, first: str, second: str) -> str:
+    """대칭 거리이므로 geohash 쌍을 정렬해 하나의 키로 저장"""
+    low, high = sorted((first, second))
+    return f"{mode}:{low}:{high}"
+
+
+def cached_distance_matrix(locations: Locations, mode: str = "haversine") -> np.ndarray:
+    """
+    장소 쌍별 거리(km)를 geohash 쌍 + 계산 방식(mode) 키로 캐시하며 거리 행렬 생성
+    - 캐시(메모리 LRU -> SQLite)에서 한 번에 조회하고, 없는 쌍에 포함된 장소만 모아 다시 계산
+    - 자주 등장하는 인기 장소끼리의 거리는 계획마다 다시 계산하지 않음
+    """
+    coordinates = np.asarray(locations, dtype=np.float64).reshape(-1, 2)
+    size = len(coordinates)
+    matrix = np.zeros((size, size))
+    if size < 2:
+        return matrix
+
+    hashes = [
+        geohash.encode(latitude, longitude, DISTANCE_GEOHASH_PRECISION) for latitude, longitude in coordinates
+    ]
+    pairs: List[Tuple[int, int, str]] = [
+        (i, j, pair_key(mode, hashes[i], hashes[j])) for i in range(size) for j in range(i + 1, size)
+    ]
+    cache = get_cache("distance")
+    found = cache.get_many(key for _, _, key in pairs)
+
+    missing = [(i, j, key) for i, j, key in pairs if key not in found]
+    if missing:
+        # 빠진 쌍에 등장하는 장소들만 골라 부분 행렬 계산
+        involved = sorted({index for i, j, _ in missing for index in (i, j)})
+        position = {index: offset for offset, index in enumerate(involved)}
+        computed = distance_matrix(coordinates[involved], method=mode)
+        new_values = {}
+        for i, j, key in missing:
+            value = float(computed[position[i], position[j]])
+            found[key] = value
+            new_values[key] = value
+        cache.set_many(new_values)
+
+    for i, j, key in pairs:
+        matrix[i, j] = matrix[j, i] = found[key]
+    return matrix
@@ -0,0 +1,141 @@
+import numpy as np
+from typing import Sequence, Tuple, Union
+
+# 지구 평균 반지름(km)
+EARTH_RADIUS_KM = 6371.0088
+# WGS-84 타원체 (Vincenty 공식용)
+WGS84_A = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+# 직선 거리 대비 도로 이동 거리 추정 계수
+ROAD_DETOUR_FACTOR = 1.3
+
+Locations = Union[Sequence[Tuple[float, float]], np.ndarray]
+
+
+def _split_coordinates(locations: Locations, dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """(위도, 경도) 리스트 또는 (n, 2) 배열을 라디안 단위 위도/경도 배열로 분리"""
+    coordinates = np.asarray(locations, dtype=dtype).reshape(-1, 2)
+    radians = np.radians(coordinates)
+    return radians[:, 0], radians[:, 1]
+
+
+def haversine_matrix(locations: Locations, dtype=np.float64) -> np.ndarray:
+    """
+    하버사인 공식으로 모든 장소 쌍의 거리(km)를 한 번의 브로드캐스트로 계산
+    dtype은 np.float32 또는 np.float64 (float32는 장소 수가 많을 때 메모리를 절반으로 줄임)
+    """
+    lat, lng = _split_coordinates(locations, dtype)
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    matrix = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    return matrix.astype(dtype, copy=False)
+
+
+def vincenty_matrix(locations: Locations, dtype=np.float64, max_iterations: int = 100, tolerance: float = 1e-12) -> np.ndarray:
+    """
+    Vincenty 공식(WGS-84 타원체)으로 모든 장소 쌍의 거리(km)를 계산
+    geodesic과 거의 같은 값을 내며, 수렴하지 않는 쌍(대척점 근처)은 하버사인 거리로 대체
+    내부 반복 계산은 정밀도를 위해 float64로 수행하고 결과만 dtype으로 변환
+    """
+    lat, lng = _split_coordinates(locations, np.float64)
+    u = np.arctan((1 - WGS84_F) * np.tan(lat))
+    sin_u, cos_u = np.sin(u), np.cos(u)
+    sin_u1, sin_u2 = sin_u[:, None], sin_u[None, :]
+    cos_u1, cos_u2 = cos_u[:, None], cos_u[None, :]
+    big_l = lng[None, :] - lng[:, None]
+
+    lam = big_l.copy()
+    converged = np.zeros(big_l.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt((cos_u2 * sin_lam) ** 2 + (cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam) ** 2)
+            cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma > 0, cos_u1 * cos_u2 * sin_lam / sin_sigma, 0.0)
+            cos2_alpha = 1 - sin_alpha ** 2
+            cos_2sigma_m = np.where(cos2_alpha > 0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha, 0.0)
+            c = WGS84_F / 16 * cos2_alpha * (4 + WGS84_F * (4 - 3 * cos2_alpha))
+            next_lam = big_l + (1 - c) * WGS84_F * sin_alpha * (
+                sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+            )
+            converged = np.abs(next_lam - lam) < tolerance
+            lam = next_lam
+            if converged.all():
+                break
+
+        u_sq = cos2_alpha * (WGS84_A ** 2 - WGS84_B ** 2) / WGS84_B ** 2
+        big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = big_b * sin_sigma * (
+            cos_2sigma_m + big_b / 4 * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                - big_b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+            )
+        )
+        matrix = WGS84_B * big_a * (sigma - delta_sigma)
+
+    invalid = ~converged | ~np.isfinite(matrix)
+    if invalid.any():
+        matrix[invalid] = haversine_matrix(locations, np.float64)[invalid]
+    np.fill_diagonal(matrix, 0.0)
+    return matrix.astype(dtype, copy=False)
+
+
+def road_estimate_matrix(locations: Locations, dtype=np.float64) -> np.ndarray:
+    """하버사인 거리에 우회 계수를 곱한 도로 이동 거리 추정(km)"""
+    return (haversine_matrix(locations, dtype) * ROAD_DETOUR_FACTOR).astype(dtype, copy=False)
+
+
+DISTANCE_METHODS = {
+    "haversine": haversine_matrix,
+    "vincenty": vincenty_matrix,
+    "road": road_estimate_matrix,
+}
+
+
+def distance_matrix(locations: Locations, method: str = "haversine", dtype=np.float64) -> np.ndarray:
+    """method("haversine", "vincenty", "road")에 맞는 거리 행렬(km) 계산"""
+    if method not in DISTANCE_METHODS:
+        raise ValueError(f"지원하지 않는 거리 계산 방식입니다: {method}")
+    return DISTANCE_METHODS[method](locations, dtype=dtype)
+
+
+if __name__ == "__main__":
+    # 기존 geodesic 이중 반복문과의 속도 비교: python -m app.services.agents.tools.distance_matrix
+    import time
+    from geopy.distance import geodesic
+
+    def geodesic_matrix(locations) -> np.ndarray:
+        size = len(locations)
+        matrix = np.zeros((size, size))
+        for i in range(size):
+            for j in range(i + 1, size):
+                matrix[i][j] = matrix[j][i] = geodesic(locations[i], locations[j]).kilometers
+        return matrix
+
+    def measure(func, *args, repeat: int = 1) -> Tuple[float, np.ndarray]:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = func(*args)
+        return (time.perf_counter() - started) / repeat, result
+
+    rng = np.random.default_rng(0)
+    for size in (10, 100, 1000):
+        # 대한민국 범위의 임의 좌표
+        points = np.column_stack([rng.uniform(33.0, 38.6, size), rng.uniform(124.6, 131.9, size)])
+        locations = [tuple(point) for point in points]
+
+        geodesic_time, reference = measure(geodesic_matrix, locations)
+        print(f"n={size}")
+        print(f"  geodesic (기존)       {geodesic_time * 1000:10.2f} ms")
+        for name, func, dtype in (
+            ("haversine float64", haversine_matrix, np.float64),
+            ("haversine float32", haversine_matrix, np.float32),
+            ("vincenty  float64", vincenty_matrix, np.float64),
+        ):
+            elapsed, result = measure(func, points, dtype, repeat=5)
+            error = float(np.max(np.abs(result.astype(np.float64) - reference)))
+            print(f"  {name}    {elapsed * 1000:10.2f} ms  x{geodesic_time / elapsed:8.1f}  최대 오차 {error:.4f} km")
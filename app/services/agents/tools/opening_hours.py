@@ -0,0 +1,160 @@
+import re
+from typing import List, Optional, Tuple
+
+# 분 단위 영업 구간 (예: (540, 1080) = 09:00~18:00, 자정을 넘기면 1440 이상)
+Interval = Tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+
+# 요일 표기 (월요일 = 0, datetime.weekday()와 동일)
+WEEKDAY_NAMES = [
+    ("월", "mon"),
+    ("화", "tue"),
+    ("수", "wed"),
+    ("목", "thu"),
+    ("금", "fri"),
+    ("토", "sat"),
+    ("일", "sun"),
+]
+
+_TIME = r"(오전|오후|AM|PM|am|pm)?\s*(\d{1,2})(?:\s*[:시]\s*(\d{2})?\s*분?)?\s*(AM|PM|am|pm)?"
+_RANGE_PATTERN = re.compile(_TIME + r"\s*[-~–—]\s*" + _TIME)
+_ALWAYS_OPEN_PATTERN = re.compile(r"24\s*시간|24\s*hours|open\s*24", re.IGNORECASE)
+_CLOSED_PATTERN = re.compile(r"휴무|휴업|정기\s*휴일|closed", re.IGNORECASE)
+# 이 표기가 붙은 시간 범위는 영업 구간이 아니라 영업 구간에서 빼야 할 쉬는 시간
+# ("브레이크타임 15:00~17:00", "15:00 - 17:00 브레이크타임" 모두 가능)
+_BREAK_PATTERN = re.compile(r"브레이크(?:\s*타임)?|휴게\s*시간|쉬는\s*시간|break\s*time|break", re.IGNORECASE)
+_WEEKDAY_PATTERN = re.compile(
+    r"(월|화|수|목|금|토|일)요일|\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\b|(?<![가-힣\d])(월|화|수|목|금|토|일)(?![가-힣])",
+    re.IGNORECASE,
+)
+_SEGMENT_SPLIT = re.compile(r"[;\n/]|,\s*(?=\D)")
+# 두 시간 범위 사이의 글자를 앞 범위 뒤에 붙은 표기와 뒤 범위 앞에 붙은 표기로 나누는 구분자
+_GAP_SPLIT = re.compile(r"[;\n/,|]")
+
+
+def _to_minutes(prefix: Optional[str], hour: str, minute: Optional[str], suffix: Optional[str]) -> Optional[int]:
+    hour, minute = int(hour), int(minute or 0)
+    meridiem = (prefix or suffix or "").lower()
+    if meridiem in ("오후", "pm") and hour < 12:
+        hour += 12
+    elif meridiem in ("오전", "am") and hour == 12:
+        hour = 0
+    if hour > 24 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def _scan_ranges(text: str) -> Tuple[List[Interval], List[Interval]]:
+    """문자열의 시간 범위를 (영업 구간, 쉬는 시간 구간)으로 나눔"""
+    intervals, breaks = [], []
+    matches = list(_RANGE_PATTERN.finditer(text))
+    for index, match in enumerate(matches):
+        # 범위 앞뒤 표기 중 이 범위에 속한 부분에 "브레이크타임" 같은 표기가 있으면 쉬는 시간
+        # 두 범위 사이는 첫 구분자까지가 앞 범위, 그 뒤가 다음 범위의 표기 (구분자가 없으면 다음 범위 표기)
+        previous_end = matches[index - 1].end() if index else 0
+        before = _GAP_SPLIT.split(text[previous_end:match.start()], maxsplit=1)[-1] if index else text[:match.start()]
+        after_gap = text[match.end():matches[index + 1].start()] if index + 1 < len(matches) else text[match.end():]
+        after_parts = _GAP_SPLIT.split(after_gap, maxsplit=1)
+        after = after_parts[0] if len(after_parts) > 1 or index + 1 == len(matches) else ""
+        is_break = bool(_BREAK_PATTERN.search(before) or _BREAK_PATTERN.search(after))
+        groups = match.groups()
+        # "오후 1시~6시"처럼 뒤쪽 시간에 오전/오후가 없으면 앞쪽 표기를 따름
+        end_prefix = groups[4] or (groups[0] if not groups[7] else None)
+        start = _to_minutes(groups[0], groups[1], groups[2], groups[3])
+        end = _to_minutes(end_prefix, groups[5], groups[6], groups[7])
+        if start is None or end is None or start == end:
+            continue
+        if end < start:
+            end += MINUTES_PER_DAY  # 자정 이후 영업
+        (breaks if is_break else intervals).append((start, end))
+    return sorted(intervals), sorted(breaks)
+
+
+def _subtract(intervals: List[Interval], breaks: List[Interval]) -> List[Interval]:
+    """영업 구간에서 쉬는 시간을 뺀 구간"""
+    for break_start, break_end in breaks:
+        remaining = []
+        for start, end in intervals:
+            if break_end <= start or end <= break_start:
+                remaining.append((start, end))
+                continue
+            if start < break_start:
+                remaining.append((start, break_start))
+            if break_end < end:
+                remaining.append((break_end, end))
+        intervals = remaining
+    return sorted(intervals)
+
+
+def _parse_ranges(text: str) -> List[Interval]:
+    """문자열의 영업 구간 (같은 문자열의 쉬는 시간은 뺌)"""
+    intervals, breaks = _scan_ranges(text)
+    return _subtract(intervals, breaks)
+
+
+def _weekdays_in(segment: str) -> List[int]:
+    """구간에 등장한 요일 (월-금 / 월~금 같은 범위 표기 포함)"""
+    found = []
+    for match in _WEEKDAY_PATTERN.finditer(segment):
+        token = next(group for group in match.groups() if group).lower()
+        for index, names in enumerate(WEEKDAY_NAMES):
+            if token in names:
+                found.append((match.start(), match.end(), index))
+    days = []
+    for position, (start, end, index) in enumerate(found):
+        days.append(index)
+        if position + 1 < len(found) and re.fullmatch(r"\s*[-~–]\s*", segment[end:found[position + 1][0]]):
+            next_index = found[position + 1][2]
+            days.extend(range(index + 1, next_index if next_index > index else 7))
+    return days
+
+
+def parse_opening_hours(text: Optional[str], weekday: Optional[int] = None) -> Optional[List[Interval]]:
+    """
+    영업시간 문자열을 분 단위 구간 리스트로 변환
+    - "09:00-18:00", "매일 10:00 ~ 22:00", "오전 11시~오후 9시", "Monday: 9:00 AM – 6:00 PM; ..." 등을 처리
+    - weekday(월=0)를 주면 요일별 표기 중 해당 요일 구간을 사용
+    - "브레이크타임 15:00~17:00" 같은 쉬는 시간은 영업 구간에서 뺌 (요일 표기가 없으면 모든 요일에 적용)
+    반환: 구간 리스트, 해당 요일 휴무면 [], 해석할 수 없으면 None (영업시간 모름)
+    """
+    if not text or not isinstance(text, str):
+        return None
+    if _ALWAYS_OPEN_PATTERN.search(text):
+        return [(0, MINUTES_PER_DAY)]
+
+    if weekday is not None:
+        segments = [segment for segment in _SEGMENT_SPLIT.split(text) if segment.strip()]
+        day_segments = [segment for segment in segments if weekday in _weekdays_in(segment)]
+        common_segments = [segment for segment in segments if not _weekdays_in(segment)]
+        common_breaks = [interval for segment in common_segments for interval in _scan_ranges(segment)[1]]
+        if day_segments:
+            if any(_CLOSED_PATTERN.search(segment) and not _scan_ranges(segment)[0] for segment in day_segments):
+                return []
+            scanned = [_scan_ranges(segment) for segment in day_segments]
+            intervals = [interval for opens, _ in scanned for interval in opens]
+            if intervals:
+                breaks = [interval for _, day_breaks in scanned for interval in day_breaks]
+                return _subtract(intervals, breaks + common_breaks)
+        # 요일 표기 없이 시간만 있는 구간을 모든 요일 공통으로 사용
+        common = [interval for segment in common_segments for interval in _scan_ranges(segment)[0]]
+        if common:
+            return _subtract(common, common_breaks)
+        if any(_weekdays_in(segment) for segment in segments):
+            return None  # 다른 요일 정보만 있음
+
+    intervals = _parse_ranges(text)
+    return intervals or None
+
+
+def is_open(intervals: Optional[List[Interval]], start: int, end: Optional[int] = None) -> bool:
+    """start~end(분) 동안 영업 중인지 확인 (영업시간을 모르면 영업 중으로 간주)"""
+    if intervals is None:
+        return True
+    end = start if end is None else end
+    return any(open_at <= start and end <= close_at for open_at, close_at in intervals)
+
+
+def spot_hours(spot: dict, weekday: Optional[int] = None) -> Optional[List[Interval]]:
+    """장소 dict의 business_hours(또는 크롤링 결과의 business_hour)를 구간으로 변환"""
+    return parse_opening_hours(spot.get("business_hours") or spot.get("business_hour"), weekday)
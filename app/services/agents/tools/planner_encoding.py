@@ -0,0 +1,116 @@
+import os
+from typing import Any, Dict, List, Tuple
+from dotenv import load_dotenv
+from app.dtos.spot_models import planned_spots_pydantic, spots_pydantic
+from app.services.agents.tools.rule_based_scheduler import extract_category_spots, to_spot_pydantic
+from app.services.agents.tools.day_partitioner import day_hints
+
+load_dotenv()
+# 플래너 프롬프트에 넣을 장소 목록의 최대 토큰 수
+PLANNER_TOKEN_BUDGET = int(os.getenv("PLANNER_TOKEN_BUDGET", "3000"))
+
+# 카테고리별 id 접두어 (r1, c2, s3, a1 ...)
+CATEGORY_PREFIXES = {
+    "restaurant": "r",
+    "cafe": "c",
+    "site": "s",
+    "accommodation": "a",
+}
+
+try:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+except Exception:
+    # tiktoken이 없으면 한글 기준 대략 2글자당 1토큰으로 추정
+    def count_tokens(text: str) -> int:
+        return (len(text) + 1) // 2
+
+
+def _clean(value: Any, max_length: int) -> str:
+    """구분자(|)와 줄바꿈을 제거하고 길이 제한"""
+    text = str(value or "").replace("|", "/").replace("\n", " ").strip()
+    return text[:max_length]
+
+
+def _format_line(spot_id: str, spot: dict, day: str = "-") -> str:
+    """id|이름|위도,경도|영업시간|추천일 형식의 한 줄"""
+    try:
+        coordinates = f"{float(spot.get('latitude')):.4f},{float(spot.get('longitude')):.4f}"
+    except (TypeError, ValueError):
+        coordinates = "-"
+    hours = _clean(spot.get("business_hours") or spot.get("business_hour"), 40) or "-"
+    return f"{spot_id}|{_clean(spot.get('kor_name'), 40)}|{coordinates}|{hours}|{day}"
+
+
+class PlannerEncoder:
+    """
+    플래너 LLM에 보낼 external_data를 짧은 id 기반 텍스트로 변환하고,
+    LLM 응답(id, day_x, order, spot_time)을 원래 장소 정보로 복원하는 클래스
+    """
+
+    def __init__(self, token_budget: int = PLANNER_TOKEN_BUDGET):
+        self.token_budget = token_budget
+
+    def encode(self, external_data: Dict[str, Any], trip_days: int = 1) -> Tuple[str, Dict[str, dict]]:
+        """
+        카테고리별 추천 순위를 유지하며 번갈아 추가하다가 토큰 예산을 넘으면 중단
+        trip_days가 2 이상이면 선택된 장소를 지리적으로 묶어 추천일(d1, d2 ...)을 함께 표시
+        반환: (프롬프트용 텍스트, id -> 원본 장소)
+        """
+        queues: Dict[str, List[Tuple[str, dict]]] = {}
+        for category, result in external_data.items():
+            prefix = CATEGORY_PREFIXES.get(category, category[:1])
+            spots = extract_category_spots(category, result)
+            queues[category] = [(f"{prefix}{index}", spot) for index, spot in enumerate(spots, start=1)]
+
+        selected: List[Tuple[str, str, dict]] = []
+        used_tokens = sum(count_tokens(f"[{category}]\n") for category in queues)
+        exhausted = False
+        while not exhausted and any(queues.values()):
+            for category, queue in queues.items():
+                if not queue:
+                    continue
+                spot_id, spot = queue.pop(0)
+                # 추천일 자리(|d9)까지 포함해 토큰 계산
+                line_tokens = count_tokens(_format_line(spot_id, spot, "d9") + "\n")
+                if used_tokens + line_tokens > self.token_budget:
+                    exhausted = True
+                    break
+                used_tokens += line_tokens
+                selected.append((category, spot_id, spot))
+
+        dropped = sum(len(queue) for queue in queues.values())
+        if dropped:
+            print(f"[PlannerEncoder] 토큰 예산({self.token_budget}) 초과로 후보 {dropped}곳 제외")
+
+        hints = day_hints([spot for _, _, spot in selected], trip_days) if trip_days > 1 else {}
+        lines: Dict[str, List[str]] = {category: [] for category in queues}
+        id_map: Dict[str, dict] = {}
+        for index, (category, spot_id, spot) in enumerate(selected):
+            day = f"d{hints[index]}" if index in hints else ("d1" if trip_days <= 1 else "-")
+            lines[category].append(_format_line(spot_id, spot, day))
+            id_map[spot_id] = spot
+
+        sections = [
+            f"[{category}]\n" + "\n".join(category_lines)
+            for category, category_lines in lines.items()
+            if category_lines
+        ]
+        return "\n".join(sections), id_map
+
+    def decode(self, planned: planned_spots_pydantic, id_map: Dict[str, dict]) -> spots_pydantic:
+        """LLM이 선택한 id를 원본 장소 정보로 복원 (없는 id, 중복 id는 제외)"""
+        spots, seen = [], set()
+        for item in planned.spots:
+            spot_id = item.id.strip()
+            if spot_id not in id_map or spot_id in seen:
+                print(f"[PlannerEncoder] 알 수 없거나 중복된 id 제외: {spot_id}")
+                continue
+            seen.add(spot_id)
+            spots.append(to_spot_pydantic(id_map[spot_id], item.day_x, item.order, item.spot_time))
+        return spots_pydantic(spots=spots)
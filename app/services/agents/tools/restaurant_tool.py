@@ -1,13 +1,17 @@
 import asyncio
-import aiohttp
 import httpx
 import datetime
 import os
 import re
 from crewai.tools import BaseTool
-from typing import List, Dict, Type
+from typing import List, Dict, Optional, Type
 from pydantic import BaseModel, create_model
 from dotenv import load_dotenv
+from app.services.regions.gazetteer import Gazetteer
+from app.services.regions.geocoding_service import GeocodingService
+from app.utils.async_bridge import run_sync
+from app.utils.http_clients import get_http_client
+from app.utils.result_cache import get_cache
 
 
 # 환경 변수 로드
@@ -16,6 +20,10 @@ GOOGLE_MAP_API_KEY = os.getenv("GOOGLE_MAP_API_KEY")
 AGENT_NAVER_CLIENT_ID = os.getenv("AGENT_NAVER_CLIENT_ID")
 AGENT_NAVER_CLIENT_SECRET = os.getenv("AGENT_NAVER_CLIENT_SECRET")
 KAKAO_MAP_API_KEY = os.getenv("KAKAO_MAP_API_KEY")
+# 한 페이지의 장소 상세 정보(Place Details)를 동시에 요청하는 최대 수
+PLACE_DETAILS_CONCURRENCY = int(os.getenv("PLACE_DETAILS_CONCURRENCY", "10"))
+# 식당 후보 필터링 기준 (평점, 리뷰 수) - 엄격한 기준으로 2개 미만이면 완화한 기준 사용
+RESTAURANT_FILTER_TIERS = [(4.0, 500), (3.5, 100)]
 
 
 def clean_query(query: str) -> str:
@@ -53,17 +61,35 @@ async def check_url_openable_async(url: str) -> bool:
         return False
 
     try:
-        async with httpx.AsyncClient(timeout=5) as client:
-            response = await client.head(url, follow_redirects=True)
-            if 200 <= response.status_code < 400:
-                return True
-            else:
-                return False
+        client = get_http_client("probe")
+        response = await client.head(url, follow_redirects=True)
+        if 200 <= response.status_code < 400:
+            return True
+        else:
+            return False
     except Exception as e:
         print(f"Error checking URL '{url}': {e}")
         return False
 
 
+# 맛집 후보 필터링 (RestaurantBasicSearchTool에서 사용)
+def filter_candidates(pages: List[List[Dict]], filter_rating: float, filter_reviews: int) -> List[Dict]:
+    """
+    페이지별 상세 정보에서 기준(평점, 리뷰 수)을 넘는 식당 선택
+    첫 페이지는 모두, 이후 페이지는 후보가 40개가 될 때까지 추가하고 후보가 15개 이상이 되면 중단
+    """
+    candidates = []
+    for index, page in enumerate(pages):
+        for details in page:
+            if index > 0 and len(candidates) >= 40:
+                break
+            if details["rating"] >= filter_rating and details["reviews"] >= filter_reviews:
+                candidates.append(details)
+        if len(candidates) >= 15:
+            break
+    return candidates
+
+
 # 1. Google Geocoding API를 사용하여 좌표를 조회하는 Tool
 class GeocodingTool(BaseTool):
     name: str = "GeocodingTool"
@@ -73,23 +99,20 @@ class GeocodingTool(BaseTool):
     )
 
     async def _arun(self, location: str) -> Dict:
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {"address": location, "key": GOOGLE_MAP_API_KEY}
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    data = await response.json()
-                    if data.get("results"):
-                        loc = data["results"][0]["geometry"]["location"]
-                        coordinates = f"{loc['lat']},{loc['lng']}"
-                    else:
-                        coordinates = ""
-        except Exception as e:
-            coordinates = f"[GeocodingTool] Error: {str(e)}"
+        # 지역 이름과 정확히 일치하면 내장 행정구역 데이터로 바로 변환 (네트워크 호출 없음)
+        region_coordinates = Gazetteer().coordinates(location, exact=True)
+        if region_coordinates:
+            return {"location": location, "coordinates": f"{region_coordinates[0]},{region_coordinates[1]}"}
+
+        # Google Geocoding 결과는 GeocodingService 캐시를 거쳐 조회
+        geo = await GeocodingService().geocode(location, "google")
+        # 지오코딩에 실패했을 때만 비슷한 지역 이름으로 대체
+        geo = geo or Gazetteer().coordinates(location)
+        coordinates = f"{geo[0]},{geo[1]}" if geo else ""
         return {"location": location, "coordinates": coordinates}
 
     def _run(self, location: str) -> Dict:
-        return asyncio.run(self._arun(location))
+        return run_sync(self._arun(location))
 
 
 # 2. Google Places API를 사용해 맛집 기본 정보를 조회하는 Tool
@@ -100,7 +123,7 @@ class RestaurantBasicSearchTool(BaseTool):
     )
 
     async def get_place_details(
-        self, session: aiohttp.ClientSession, place_id: str
+        self, client: httpx.AsyncClient, place_id: str
     ) -> Dict:
         url = "https://maps.googleapis.com/maps/api/place/details/json"
         params = {
@@ -110,18 +133,46 @@ class RestaurantBasicSearchTool(BaseTool):
             "key": GOOGLE_MAP_API_KEY,
         }
         try:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
-                result = data.get("result", {})
-                return {
-                    "title": result.get("name"),
-                    "rating": result.get("rating", 0),
-                    "reviews": result.get("user_ratings_total", 0),
-                }
+            response = await client.get(url, params=params)
+            data = response.json()
+            result = data.get("result", {})
+            return {
+                "title": result.get("name"),
+                "rating": result.get("rating", 0),
+                "reviews": result.get("user_ratings_total", 0),
+            }
         except Exception as e:
             print(f"[RestaurantBasicSearchTool] Details Error: {e}")
             return None
 
+    async def get_places_details(
+        self, client: httpx.AsyncClient, place_ids: List[str], semaphore: asyncio.Semaphore
+    ) -> List[Optional[Dict]]:
+        """
+        여러 장소의 상세 정보를 place_id 캐시(메모리 LRU -> SQLite)에서 한 번에 조회하고, 없는 장소만 동시에 요청
+        요청이 실패한 장소는 만료된 캐시 값이라도 사용
+        """
+        cache = get_cache("place_details")
+        found = cache.get_many(place_ids)
+        missing = [place_id for place_id in dict.fromkeys(place_ids) if place_id not in found]
+
+        async def fetch(place_id: str):
+            async with semaphore:
+                return await self.get_place_details(client, place_id)
+
+        new_values = {}
+        for place_id, details in zip(missing, await asyncio.gather(*(fetch(place_id) for place_id in missing))):
+            if details and details.get("title"):
+                new_values[place_id] = details
+                continue
+            stale = cache.get(place_id, allow_stale=True)
+            if stale is not None:
+                found[place_id] = stale
+        if new_values:
+            cache.set_many(new_values)
+            found.update(new_values)
+        return [found.get(place_id) for place_id in place_ids]
+
     async def _arun(self, location: str, coordinates: str) -> List[Dict]:
         url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
         all_candidates = []
@@ -135,71 +186,62 @@ class RestaurantBasicSearchTool(BaseTool):
             "key": GOOGLE_MAP_API_KEY,
         }
 
-        async def fetch_places(filter_rating: float, filter_reviews: int):
-            """특정 필터링 기준으로 Google Places API에서 식당 정보를 가져오는 함수"""
-            candidates = []
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    data = await response.json()
-                    results = data.get("results", [])
-                    print(
-                        f"첫 요청 결과 수: {len(results)} (필터 기준: 평점 {filter_rating} 이상, 리뷰 {filter_reviews}개 이상)"
+        async def fetch_page(page_token: str = None) -> Dict:
+            request_params = dict(params)
+            if page_token:
+                await asyncio.sleep(3)  # next_page_token 유효 대기
+                request_params["pagetoken"] = page_token
+            response = await get_http_client("google").get(url, params=request_params)
+            return response.json()
+
+        async def fetch_pages() -> List[List[Dict]]:
+            """Google Places API에서 페이지별 식당 상세 정보를 한 번에 수집 (필터링 전)"""
+            pages = []
+            client = get_http_client("google")
+            semaphore = asyncio.Semaphore(PLACE_DETAILS_CONCURRENCY)
+
+            data = await fetch_page()
+            print(f"첫 요청 결과 수: {len(data.get('results', []))}")
+            while True:
+                next_page_token = data.get("next_page_token")
+                # 현재 페이지 상세 정보를 가져오는 동안 다음 페이지를 미리 요청
+                next_page = asyncio.create_task(fetch_page(next_page_token)) if next_page_token else None
+                try:
+                    place_ids = [place.get("place_id") for place in data.get("results", []) if place.get("place_id")]
+                    pages.append(
+                        [details for details in await self.get_places_details(client, place_ids, semaphore) if details]
                     )
 
-                    for place in results:
-                        place_id = place.get("place_id")
-                        if place_id:
-                            details = await self.get_place_details(session, place_id)
-                            if (
-                                details
-                                and details["rating"] >= filter_rating
-                                and details["reviews"] >= filter_reviews
-                            ):
-                                candidates.append(details)
-
-                    next_page_token = data.get("next_page_token")
-
-                    # 추가 요청: 후보 수가 15개 미만이면 추가로 요청
-                    while next_page_token and len(candidates) < 15:
-                        try:
-                            await asyncio.sleep(3)  # next_page_token 유효 대기
-                            params["pagetoken"] = next_page_token
-                            async with session.get(url, params=params) as response:
-                                data = await response.json()
-                                new_results = data.get("results", [])
-                                print(f"추가 요청 결과 수: {len(new_results)}")
-
-                                for place in new_results:
-                                    if len(candidates) >= 40:
-                                        break
-                                    place_id = place.get("place_id")
-                                    if place_id:
-                                        details = await self.get_place_details(
-                                            session, place_id
-                                        )
-                                        if (
-                                            details
-                                            and details["rating"] >= filter_rating
-                                            and details["reviews"] >= filter_reviews
-                                        ):
-                                            candidates.append(details)
-
-                                next_page_token = data.get("next_page_token")
-                        except Exception as e:
-                            print(f"추가 페이지 요청 오류: {e}")
-                            break
-            return candidates
+                    # 추가 요청: 엄격한 기준의 후보 수가 15개 미만이면 다음 페이지 사용
+                    if next_page is None:
+                        break
+                    if len(filter_candidates(pages, *RESTAURANT_FILTER_TIERS[0])) >= 15:
+                        break
+                    try:
+                        data = await next_page
+                        print(f"추가 요청 결과 수: {len(data.get('results', []))}")
+                    except Exception as e:
+                        print(f"추가 페이지 요청 오류: {e}")
+                        break
+                finally:
+                    # 쓰지 않게 된(또는 현재 페이지 처리 중 오류가 난) 미리 요청은 취소하고 결과도 버림
+                    if next_page is not None:
+                        next_page.cancel()
+                        if next_page.done() and not next_page.cancelled():
+                            next_page.exception()
+            return pages
 
         try:
+            pages = await fetch_pages()
             # 1차 필터링: 평점 4.0 이상 & 리뷰 500개 이상
-            all_candidates = await fetch_places(4.0, 500)
+            all_candidates = filter_candidates(pages, *RESTAURANT_FILTER_TIERS[0])
 
-            # 첫 번째 결과가 2개 미만이면 기준 완화 (외곽 지역 판단)
+            # 첫 번째 결과가 2개 미만이면 기준 완화 (외곽 지역 판단) - 이미 수집한 결과를 다시 필터링
             if len(all_candidates) < 2:
                 print(
-                    "첫 페이지 결과가 2개 미만 → 필터링 조건 완화 (평점 3.5 이상, 리뷰 100개 이상) 후 재요청"
+                    "첫 페이지 결과가 2개 미만 → 필터링 조건 완화 (평점 3.5 이상, 리뷰 100개 이상)"
                 )
-                all_candidates = await fetch_places(3.5, 100)
+                all_candidates = filter_candidates(pages, *RESTAURANT_FILTER_TIERS[1])
 
             print(f"최종 수집된 맛집 수: {len(all_candidates)}")
         except Exception as e:
@@ -207,7 +249,7 @@ class RestaurantBasicSearchTool(BaseTool):
         return all_candidates
 
     def _run(self, location: str, coordinates: str) -> List[Dict]:
-        return asyncio.run(self._arun(location, coordinates))
+        return run_sync(self._arun(location, coordinates))
 
 
 # 3. 네이버 웹 검색 API를 사용해 식당의 세부 정보를 조회하는 Tool
@@ -215,7 +257,7 @@ class NaverWebSearchTool(BaseTool):
     name: str = "NaverWebSearch"
     description: str = "네이버 웹 검색 API를 사용해 식당의 상세 정보를 검색합니다."
 
-    async def fetch(self, session: aiohttp.ClientSession, query: str):
+    async def fetch(self, client: httpx.AsyncClient, query: str):
         url = "https://openapi.naver.com/v1/search/webkr.json"
         headers = {
             "X-Naver-Client-Id": AGENT_NAVER_CLIENT_ID,
@@ -235,38 +277,38 @@ class NaverWebSearchTool(BaseTool):
             "sort": "sim",
         }
         try:
-            async with session.get(url, headers=headers, params=params) as response:
-                data = await response.json()
-                items = data.get("items", [])
-                if not items:
-                    return {"description": "정보를 찾을 수 없습니다.", "url": ""}
-                descriptions = []
-                for item in items:
-                    desc = item.get("description", "").strip()
-                    if desc and len(desc) > 30:
-                        descriptions.append(desc)
-                combined_description = " ".join(descriptions)
-                return {
-                    "description": (
-                        combined_description[:200]
-                        if len(combined_description) > 200
-                        else combined_description
-                    ),
-                    "url": items[0].get("link", "") if items else "",
-                }
+            response = await client.get(url, headers=headers, params=params)
+            data = response.json()
+            items = data.get("items", [])
+            if not items:
+                return {"description": "정보를 찾을 수 없습니다.", "url": ""}
+            descriptions = []
+            for item in items:
+                desc = item.get("description", "").strip()
+                if desc and len(desc) > 30:
+                    descriptions.append(desc)
+            combined_description = " ".join(descriptions)
+            return {
+                "description": (
+                    combined_description[:200]
+                    if len(combined_description) > 200
+                    else combined_description
+                ),
+                "url": items[0].get("link", "") if items else "",
+            }
         except Exception as e:
             print(f"네이버 웹 검색 오류: {str(e)}")
             return {"description": "정보 없음", "url": ""}
 
     async def _arun(self, restaurant_list: List[str]) -> Dict[str, Dict[str, str]]:
         results = {}
-        async with aiohttp.ClientSession() as session:
-            for restaurant in restaurant_list:
-                results[restaurant] = await self.fetch(session, restaurant)
+        client = get_http_client("naver")
+        for restaurant in restaurant_list:
+            results[restaurant] = await self.fetch(client, restaurant)
         return results
 
     def _run(self, restaurant_list: List[str]) -> Dict[str, Dict[str, str]]:
-        return asyncio.run(self._arun(restaurant_list))
+        return run_sync(self._arun(restaurant_list))
 
 
 # 4. 네이버 이미지 검색 API를 사용해 식당의 대표 이미지를 조회하는 Tool
@@ -276,7 +318,7 @@ class NaverImageSearchTool(BaseTool):
         "네이버 이미지 검색 API를 사용해 식당의 대표 이미지를 검색합니다."
     )
 
-    async def fetch(self, session: aiohttp.ClientSession, query: str):
+    async def fetch(self, client: httpx.AsyncClient, query: str):
         url = "https://openapi.naver.com/v1/search/image"
         headers = {
             "X-Naver-Client-Id": AGENT_NAVER_CLIENT_ID,
@@ -295,33 +337,33 @@ class NaverImageSearchTool(BaseTool):
             "filter": "all",
         }
         try:
-            async with session.get(url, headers=headers, params=params) as response:
-                data = await response.json()
-                items = data.get("items", [])
-                if not items:
-                    return "https://via.placeholder.com/300x200?text=No+Image"
-
-                # 받아온 여러 이미지 URL 중 실제 접근 가능한 URL을 선택 (check_url_openable_async 사용)
-                for item in items:
-                    img_url = item.get("link", "")
-                    if await check_url_openable_async(img_url):
-                        return img_url
-
-                # 만약 모두 접근 불가능하다면, 기본 이미지 URL 반환
+            response = await client.get(url, headers=headers, params=params)
+            data = response.json()
+            items = data.get("items", [])
+            if not items:
                 return "https://via.placeholder.com/300x200?text=No+Image"
+
+            # 받아온 여러 이미지 URL 중 실제 접근 가능한 URL을 선택 (check_url_openable_async 사용)
+            for item in items:
+                img_url = item.get("link", "")
+                if await check_url_openable_async(img_url):
+                    return img_url
+
+            # 만약 모두 접근 불가능하다면, 기본 이미지 URL 반환
+            return "https://via.placeholder.com/300x200?text=No+Image"
         except Exception as e:
             print(f"네이버 이미지 검색 오류: {str(e)}")
             return "https://via.placeholder.com/300x200?text=Error"
 
     async def _arun(self, restaurant_list: List[str]) -> Dict[str, str]:
         results = {}
-        async with aiohttp.ClientSession() as session:
-            for restaurant in restaurant_list:
-                results[restaurant] = await self.fetch(session, restaurant)
+        client = get_http_client("naver")
+        for restaurant in restaurant_list:
+            results[restaurant] = await self.fetch(client, restaurant)
         return results
 
     def _run(self, restaurant_list: List[str]) -> Dict[str, str]:
-        return asyncio.run(self._arun(restaurant_list))
+        return run_sync(self._arun(restaurant_list))
 
 
 # 5. 카카오 로컬 API를 사용해 식당의 상세 정보를 조회하는 Tool
@@ -329,7 +371,14 @@ class KakaoLocalSearchTool(BaseTool):
     name: str = "KakaoLocalSearch"
     description: str = "카카오 로컬 API를 사용해 식당의 위치 정보를 검색합니다."
 
-    async def fetch(self, session: aiohttp.ClientSession, name: str, location: str):
+    async def fetch(self, client: httpx.AsyncClient, name: str, location: str):
+        """같은 지역/식당 이름의 검색 결과는 GeocodingService 캐시를 거쳐 재사용 (결과 없음도 캐시)"""
+        result = await GeocodingService().resolve(
+            "kakao_keyword", f"{location} {name}", lambda: self._search(client, name, location)
+        )
+        return result or self._get_empty_result(name)
+
+    async def _search(self, client: httpx.AsyncClient, name: str, location: str):
         url = "https://dapi.kakao.com/v2/local/search/keyword.json"
         headers = {"Authorization": f"KakaoAK {KAKAO_MAP_API_KEY}"}
 
@@ -349,6 +398,7 @@ class KakaoLocalSearchTool(BaseTool):
             f"{location} {name.split()[0]}",  # "해운대 할매집"
         ]
 
+        last_error = None
         for query in search_queries:
             print(f"[카카오 로컬 검색어 시도]: {query}")
             params = {
@@ -358,39 +408,44 @@ class KakaoLocalSearchTool(BaseTool):
             }
 
             try:
-                async with session.get(url, headers=headers, params=params) as response:
-                    data = await response.json()
-                    documents = data.get("documents", [])
-
-                    if documents:
-                        place = documents[0]
-                        place_id = place.get("id")
-
-                        result = {
-                            "kor_name": name,
-                            "address": place.get("road_address_name")
-                            or place.get("address_name", ""),
-                            "latitude": float(place.get("y", 0)) or None,
-                            "longitude": float(place.get("x", 0)) or None,
-                            "map_url": (
-                                f"https://map.kakao.com/link/map/{place_id}"
-                                if place_id
-                                else ""
-                            ),
-                            "phone_number": place.get("phone", ""),
-                            # "category_name": place.get("category_name", ""),
-                        }
-                        print(
-                            f"[카카오 로컬 검색 성공] 검색어: {query}, 결과: {result}"
-                        )
-                        return result
+                response = await client.get(url, headers=headers, params=params)
+                response.raise_for_status()
+                data = response.json()
+                documents = data.get("documents", [])
+
+                if documents:
+                    place = documents[0]
+                    place_id = place.get("id")
+
+                    result = {
+                        "kor_name": name,
+                        "address": place.get("road_address_name")
+                        or place.get("address_name", ""),
+                        "latitude": float(place.get("y", 0)) or None,
+                        "longitude": float(place.get("x", 0)) or None,
+                        "map_url": (
+                            f"https://map.kakao.com/link/map/{place_id}"
+                            if place_id
+                            else ""
+                        ),
+                        "phone_number": place.get("phone", ""),
+                        # "category_name": place.get("category_name", ""),
+                    }
+                    print(
+                        f"[카카오 로컬 검색 성공] 검색어: {query}, 결과: {result}"
+                    )
+                    return result
 
             except Exception as e:
                 print(f"카카오 로컬 검색 오류: {str(e)}")
+                last_error = e
                 continue
 
         print(f"[카카오 로컬 검색 실패] 모든 검색어 시도 실패: {search_queries}")
-        return self._get_empty_result(name)
+        if last_error is not None:
+            # 네트워크 오류로 실패한 경우는 결과 없음으로 캐시하지 않도록 예외 전달
+            raise last_error
+        return None
 
     def _get_empty_result(self, name: str) -> dict:
         """검색 실패 시 기본값 반환"""
@@ -406,11 +461,9 @@ class KakaoLocalSearchTool(BaseTool):
 
     async def _arun(self, restaurant_names: List[str], location: str) -> List[Dict]:
         """모든 식당 정보를 병렬로 처리"""
-        results = []
-        async with aiohttp.ClientSession() as session:
-            tasks = [self.fetch(session, name, location) for name in restaurant_names]
-            results = await asyncio.gather(*tasks)
-        return results
+        client = get_http_client("kakao")
+        tasks = [self.fetch(client, name, location) for name in restaurant_names]
+        return await asyncio.gather(*tasks)
 
     def _run(self, restaurant_names: List[str], location: str) -> List[Dict]:
-        return asyncio.run(self._arun(restaurant_names, location))
+        return run_sync(self._arun(restaurant_names, location))
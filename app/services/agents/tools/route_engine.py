@@ -0,0 +1,138 @@
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+
+# 좌표가 없어 거리가 무한대인 구간을 대신할 큰 값(km)
+UNREACHABLE_DISTANCE = 1e6
+
+
+def route_length(matrix: np.ndarray, order: List[int]) -> float:
+    """방문 순서대로 이동한 총 거리 (출발지로 돌아오지 않는 경로)"""
+    return float(sum(matrix[a, b] for a, b in zip(order, order[1:])))
+
+
+def _nearest_neighbor(matrix: np.ndarray, first: int, end: Optional[int], rng: Optional[np.random.Generator] = None) -> List[int]:
+    """first에서 출발하는 최근접 이웃 경로 (rng가 있으면 가까운 3곳 중 무작위 선택)"""
+    size = len(matrix)
+    unvisited = set(range(size)) - {first}
+    if end is not None and end != first:
+        unvisited.discard(end)
+    route = [first]
+    while unvisited:
+        candidates = sorted(unvisited, key=lambda index: matrix[route[-1], index])
+        if rng is not None:
+            picked = candidates[int(rng.integers(min(3, len(candidates))))]
+        else:
+            picked = candidates[0]
+        route.append(picked)
+        unvisited.remove(picked)
+    if end is not None and end != first:
+        route.append(end)
+    return route
+
+
+def _two_opt(matrix: np.ndarray, route: List[int], lower: int, upper: int, deadline: float) -> bool:
+    """
+    구간 뒤집기(2-opt)로 경로 개선, 개선이 있었으면 True
+    lower..upper 위치만 이동 가능 (고정 출발지/도착지 보호)
+    """
+    improved = False
+    last = len(route) - 1
+    for i in range(lower, upper):
+        for j in range(i + 1, upper + 1):
+            before = matrix[route[i - 1], route[i]] if i > 0 else 0.0
+            after = matrix[route[j], route[j + 1]] if j < last else 0.0
+            new_before = matrix[route[i - 1], route[j]] if i > 0 else 0.0
+            new_after = matrix[route[i], route[j + 1]] if j < last else 0.0
+            if new_before + new_after < before + after - 1e-9:
+                route[i:j + 1] = reversed(route[i:j + 1])
+                improved = True
+        if time.monotonic() > deadline:
+            break
+    return improved
+
+
+def _or_opt(matrix: np.ndarray, route: List[int], lower: int, upper: int, deadline: float) -> bool:
+    """
+    1~3개 연속 장소를 다른 위치로 옮기는(필요하면 뒤집어서) Or-opt로 경로 개선, 개선이 있었으면 True
+    """
+    improved = False
+    for length in (1, 2, 3):
+        i = lower
+        while i + length - 1 <= upper:
+            segment = route[i:i + length]
+            rest = route[:i] + route[i + length:]
+            current = route_length(matrix, route)
+            best_gain, best_route = 1e-9, None
+            # rest에서 segment를 넣을 수 있는 위치 (고정 출발지 뒤, 고정 도착지 앞)
+            for position in range(lower, upper - length + 2):
+                if position == i:
+                    continue
+                for candidate in (segment, segment[::-1]):
+                    trial = rest[:position] + candidate + rest[position:]
+                    gain = current - route_length(matrix, trial)
+                    if gain > best_gain:
+                        best_gain, best_route = gain, trial
+            if best_route is not None:
+                route[:] = best_route
+                improved = True
+            i += 1
+            if time.monotonic() > deadline:
+                return improved
+    return improved
+
+
+def solve_route(
+    matrix: np.ndarray,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    time_budget: float = 0.05,
+    num_starts: int = 8,
+    seed: int = 0,
+) -> Tuple[List[int], float]:
+    """
+    거리 행렬로 방문 순서를 계산 (출발지로 돌아오지 않는 경로)
+    - 여러 출발점(또는 고정 출발지에서 무작위화한) 최근접 이웃 경로로 시작
+    - 2-opt, Or-opt 지역 탐색을 더 이상 개선이 없거나 time_budget(초)을 넘을 때까지 반복
+    - start, end를 지정하면 해당 장소(예: 숙소)를 처음/마지막에 고정
+    반환: (방문 순서, 총 이동 거리 km)
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    matrix = np.where(np.isfinite(matrix), matrix, UNREACHABLE_DISTANCE)
+    size = len(matrix)
+    if size == 0:
+        return [], 0.0
+    if size <= 2:
+        order = list(range(size))
+        if start is not None and order[0] != start:
+            order.reverse()
+        elif end is not None and order[-1] != end:
+            order.reverse()
+        return order, route_length(matrix, order)
+
+    deadline = time.monotonic() + time_budget
+    rng = np.random.default_rng(seed)
+    if start is not None:
+        seeds = [(start, None)] + [(start, rng) for _ in range(num_starts - 1)]
+    else:
+        firsts = [index for index in range(size) if index != end]
+        seeds = [(first, None) for first in firsts[:num_starts]]
+
+    lower = 1 if start is not None else 0
+    upper = size - 2 if end is not None else size - 1
+
+    best_order, best_length = None, float("inf")
+    for first, seed_rng in seeds:
+        route = _nearest_neighbor(matrix, first, end, seed_rng)
+        while time.monotonic() <= deadline:
+            changed = _two_opt(matrix, route, lower, upper, deadline)
+            changed = _or_opt(matrix, route, lower, upper, deadline) or changed
+            if not changed:
+                break
+        length = route_length(matrix, route)
+        if length < best_length:
+            best_order, best_length = route, length
+        if time.monotonic() > deadline:
+            break
+
+    return best_order, best_length
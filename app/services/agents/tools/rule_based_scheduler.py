@@ -0,0 +1,239 @@
+import re
+import json
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from app.dtos.spot_models import spot_pydantic, spots_pydantic, calculate_trip_days
+from app.services.agents.tools.all_schedule_agent_tool import HaversineRouteOptimizer
+from app.services.agents.tools.day_partitioner import partition_days
+from app.services.agents.tools.opening_hours import spot_hours
+from app.services.agents.tools.time_window_router import (
+    DWELL_MINUTES,
+    ROUTE_SPEED_MODE,
+    SLOT_WINDOWS,
+    Stop,
+    format_minutes,
+    solve_time_windows,
+)
+
+# 카테고리 이름 -> spot_category 값 (숙소 0, 관광지 1, 맛집 2, 카페 3)
+SPOT_CATEGORIES = {
+    "accommodation": 0,
+    "site": 1,
+    "restaurant": 2,
+    "cafe": 3,
+}
+
+# 시간대별 일정 규칙 (LLM 플래너 프롬프트의 규칙과 동일)
+DAY_SLOTS: List[Tuple[str, List[str]]] = [
+    ("08:00:00", ["site", "cafe"]),
+    ("12:00:00", ["restaurant", "site", "site"]),
+    ("18:00:00", ["restaurant", "accommodation"]),
+]
+
+
+def extract_category_spots(category: str, result: Any) -> List[dict]:
+    """
+    카테고리 에이전트 결과에서 장소 리스트를 추출
+    - restaurant/site: {"spots": [...]} 형태의 dict
+    - cafe: 장소 리스트
+    - accommodation: spots_pydantic 형식의 JSON 문자열
+    """
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            match = re.search(r"\{.*\}|\[.*\]", result, re.DOTALL)
+            if not match:
+                return []
+            try:
+                result = json.loads(match.group(0))
+            except json.JSONDecodeError:
+                return []
+
+    if isinstance(result, dict):
+        result = result.get("spots", [])
+    if not isinstance(result, list):
+        return []
+
+    spots = []
+    for spot in result:
+        if isinstance(spot, dict) and spot.get("kor_name"):
+            spot = dict(spot)
+            spot.setdefault("spot_category", SPOT_CATEGORIES.get(category, 1))
+            spots.append(spot)
+    return spots
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value else None
+
+
+def has_coordinates(spot: dict) -> bool:
+    return _to_float(spot.get("latitude")) is not None and _to_float(spot.get("longitude")) is not None
+
+
+def _to_str(value: Any, max_length: int, default: Optional[str] = "") -> Optional[str]:
+    if value is None or value == "":
+        return default
+    return str(value)[:max_length]
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, str) and value.lower() in {"true", "false"}:
+        return value.lower() == "true"
+    return None
+
+
+def to_spot_pydantic(spot: dict, day_x: int, order: int, spot_time: Optional[str]) -> spot_pydantic:
+    """에이전트 결과 장소(dict)를 spot_pydantic 필드 제약에 맞게 변환"""
+    fields = {
+        "kor_name": _to_str(spot.get("kor_name"), 255),
+        "description": _to_str(spot.get("description"), 255),
+        "address": _to_str(spot.get("address"), 255),
+        "image_url": _to_str(spot.get("image_url"), 2083),
+        "map_url": _to_str(spot.get("map_url"), 2083),
+        "latitude": _to_float(spot.get("latitude")),
+        "longitude": _to_float(spot.get("longitude")),
+        "spot_category": int(spot.get("spot_category", 1)),
+        "phone_number": _to_str(spot.get("phone_number"), 300, None),
+        "business_status": _to_bool(spot.get("business_status")),
+        "business_hours": _to_str(spot.get("business_hours"), 255, None),
+        "order": order,
+        "day_x": day_x,
+        "spot_time": spot_time,
+    }
+    # eng_name, url은 기본값이 None인 str 필드라 값이 있을 때만 전달
+    if spot.get("eng_name"):
+        fields["eng_name"] = _to_str(spot["eng_name"], 255)
+    if spot.get("url"):
+        fields["url"] = _to_str(spot["url"], 2083)
+    return spot_pydantic(**fields)
+
+
+class RuleBasedScheduler:
+    """
+    LLM 없이 시간대 규칙과 거리 기반으로 일정을 구성하는 스케줄러
+    - 장소를 여행 일수만큼의 지리적 묶음으로 먼저 나누고, 각 날짜는 자기 묶음 안에서 장소를 고름
+      (묶음에 해당 카테고리가 없으면 어느 날짜에도 배정되지 않은 장소, 그마저 없으면 남은 장소에서 고름)
+    - 각 날짜의 첫 장소는 추천 순위가 가장 높은 곳
+    - 이후 장소는 직전 장소에서 가장 가까운 해당 카테고리 장소
+    - 장소는 중복 사용하지 않으며, 부족한 카테고리는 비워둠
+    - time_windows가 켜져 있으면 해당 시간대에 영업하는 장소를 우선 고르고,
+      하루 방문 순서와 방문 시각을 영업시간/시간대 창에 맞게 다시 계산
+    """
+
+    def __init__(
+        self,
+        route_tool: Optional[HaversineRouteOptimizer] = None,
+        time_windows: bool = True,
+        speed_mode: str = ROUTE_SPEED_MODE,
+        time_budget: float = 0.05,
+    ):
+        self.route_tool = route_tool or HaversineRouteOptimizer()
+        self.time_windows = time_windows
+        self.speed_mode = speed_mode
+        self.time_budget = time_budget
+
+    def _stop(self, spot: dict, spot_time: str, weekday: int) -> Stop:
+        category = int(spot.get("spot_category", 1))
+        return Stop(
+            window=SLOT_WINDOWS.get(spot_time, (8 * 60, 23 * 60)),
+            dwell=DWELL_MINUTES.get(category, 60),
+            hours=spot_hours(spot, weekday),
+        )
+
+    def _open_candidates(self, day_pool: List[int], candidates: List[dict], spot_time: str, weekday: int) -> List[int]:
+        """시간대 창 안에서 체류 시간만큼 영업하는 후보 (없으면 전체 후보)"""
+        open_pool = []
+        for index in day_pool:
+            stop = self._stop(candidates[index], spot_time, weekday)
+            if stop.hours is None or any(
+                max(open_at, stop.window[0]) <= min(stop.window[1], close_at - stop.dwell)
+                for open_at, close_at in stop.hours
+            ):
+                open_pool.append(index)
+        return open_pool or day_pool
+
+    def _route_day(self, picks: List[Tuple[int, str]], candidates: List[dict], matrix: np.ndarray, weekday: int) -> List[Tuple[int, str]]:
+        """하루 방문지를 시간대 창/영업시간을 지키는 순서로 정렬하고 방문 시각 계산"""
+        stops = [self._stop(candidates[index], spot_time, weekday) for index, spot_time in picks]
+        indexes = [index for index, _ in picks]
+        route = solve_time_windows(
+            stops,
+            matrix[np.ix_(indexes, indexes)],
+            mode=self.speed_mode,
+            time_budget=self.time_budget,
+        )
+        if not route.feasible:
+            print(f"[RuleBasedScheduler] 영업시간을 모두 지키는 순서가 없어 위반이 가장 적은 순서 사용 ({route.lateness:.0f}분)")
+        return [(indexes[position], format_minutes(arrival)) for position, arrival in zip(route.order, route.arrivals)]
+
+    def _distance_matrix(self, candidates: List[dict]) -> np.ndarray:
+        """좌표가 있는 장소끼리의 거리 행렬 (좌표가 없으면 무한대)"""
+        size = len(candidates)
+        matrix = np.full((size, size), np.inf)
+        located = [index for index, spot in enumerate(candidates) if has_coordinates(spot)]
+        if len(located) >= 2:
+            locations = [
+                (float(candidates[index]["latitude"]), float(candidates[index]["longitude"]))
+                for index in located
+            ]
+            matrix[np.ix_(located, located)] = self.route_tool._compute_distance_matrix(locations)
+        np.fill_diagonal(matrix, 0.0)
+        return matrix
+
+    def schedule(self, external_data: Dict[str, Any], start_date: str, end_date: str) -> spots_pydantic:
+        candidates: List[dict] = []
+        pools: Dict[str, List[int]] = {}
+        for category, result in external_data.items():
+            spots = extract_category_spots(category, result)
+            pools[category] = list(range(len(candidates), len(candidates) + len(spots)))
+            candidates.extend(spots)
+
+        matrix = self._distance_matrix(candidates)
+        trip_days = calculate_trip_days(start_date, end_date)
+        day_partitions = partition_days(candidates, trip_days)
+        assigned = {index for day in day_partitions for index in day}
+        scheduled: List[spot_pydantic] = []
+
+        first_day = datetime.strptime(start_date, "%Y-%m-%d")
+        for day_x, day_members in enumerate(day_partitions, start=1):
+            members = set(day_members)
+            weekday = (first_day + timedelta(days=day_x - 1)).weekday()
+            picks: List[Tuple[int, str]] = []
+            current: Optional[int] = None
+            for spot_time, categories in DAY_SLOTS:
+                for category in categories:
+                    pool = pools.get(category)
+                    if not pool:
+                        continue
+                    day_pool = (
+                        [index for index in pool if index in members]
+                        or [index for index in pool if index not in assigned]
+                        or pool
+                    )
+                    if self.time_windows:
+                        day_pool = self._open_candidates(day_pool, candidates, spot_time, weekday)
+                    if current is None or not np.isfinite(matrix[current, day_pool]).any():
+                        picked = day_pool[0]
+                    else:
+                        picked = day_pool[int(np.argmin(matrix[current, day_pool]))]
+                    pool.remove(picked)
+
+                    picks.append((picked, spot_time))
+                    if has_coordinates(candidates[picked]):
+                        current = picked
+
+            if self.time_windows and picks:
+                picks = self._route_day(picks, candidates, matrix, weekday)
+            for order, (picked, spot_time) in enumerate(picks, start=1):
+                scheduled.append(to_spot_pydantic(candidates[picked], day_x, order, spot_time))
+
+        return spots_pydantic(spots=scheduled)
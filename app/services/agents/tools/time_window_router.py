@@ -0,0 +1,151 @@
+import os
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from app.services.agents.tools.opening_hours import Interval, MINUTES_PER_DAY
+
+load_dotenv()
+# 이동 수단별 평균 속도(km/h)
+SPEED_MODELS = {
+    "walking": 4.5,
+    "transit": 18.0,
+    "driving": 30.0,
+}
+ROUTE_SPEED_MODE = os.getenv("ROUTE_SPEED_MODE", "transit")
+# 직선 거리 대비 실제 이동 거리 보정 계수
+DETOUR_FACTOR = float(os.getenv("ROUTE_DETOUR_FACTOR", "1.3"))
+
+# 시간대 창 (분): 아침 / 점심 / 저녁 일정 (DAY_SLOTS의 08:00, 12:00, 18:00과 동일)
+SLOT_WINDOWS = {
+    "08:00:00": (8 * 60, 12 * 60),
+    "12:00:00": (12 * 60, 18 * 60),
+    "18:00:00": (18 * 60, 23 * 60),
+}
+
+# 카테고리별 기본 체류 시간(분) (숙소 0, 관광지 1, 맛집 2, 카페 3)
+DWELL_MINUTES = {
+    0: 0,
+    1: 90,
+    2: 70,
+    3: 50,
+}
+
+
+def travel_minutes(distance_km: float, mode: str = ROUTE_SPEED_MODE) -> float:
+    """거리(km)를 이동 수단 속도 모델로 이동 시간(분)으로 변환"""
+    if not np.isfinite(distance_km):
+        return 0.0  # 좌표가 없는 장소는 이동 시간을 알 수 없으므로 0으로 간주
+    speed = SPEED_MODELS.get(mode, SPEED_MODELS["transit"])
+    return distance_km * DETOUR_FACTOR / speed * 60
+
+
+@dataclass
+class Stop:
+    """
+    하루 일정의 방문지
+    window: 도착 가능 시간대(분), hours: 영업 구간 (None이면 영업시간 모름)
+    """
+    window: Tuple[int, int]
+    dwell: int = 60
+    hours: Optional[List[Interval]] = None
+
+
+@dataclass
+class TimedRoute:
+    order: List[int]
+    arrivals: List[int]
+    travel_minutes: float
+    lateness: float
+    feasible: bool = field(default=False)
+
+
+def _earliest_service(stop: Stop, arrival: float) -> Tuple[float, float]:
+    """
+    arrival에 도착했을 때 시간대 창과 영업 구간을 모두 만족하는 가장 이른 시작 시각과 위반(분) 계산
+    만족할 수 없으면 창 안에서 가장 덜 어긋나는 시각을 고르고 위반 시간을 반환
+    """
+    window_start, window_end = stop.window
+    hours = stop.hours if stop.hours is not None else [(0, MINUTES_PER_DAY * 2)]
+    best_start, best_violation = None, float("inf")
+    for open_at, close_at in hours:
+        start = max(arrival, window_start, open_at)
+        # 체류 시간 동안 영업해야 함 (숙소는 체류 0)
+        latest = min(window_end, close_at - stop.dwell)
+        violation = max(0.0, start - latest)
+        if violation < best_violation or (violation == best_violation and start < best_start):
+            best_start, best_violation = start, violation
+    if best_start is None:  # 해당 요일 휴무
+        return max(arrival, window_start), float(stop.dwell or 60) + max(0.0, arrival - window_end)
+    return best_start, best_violation
+
+
+def simulate(order: List[int], stops: List[Stop], minutes: np.ndarray, day_start: int) -> TimedRoute:
+    """방문 순서대로 이동/대기/체류를 계산 (minutes: 방문지 간 이동 시간 행렬)"""
+    clock, travel, lateness = float(day_start), 0.0, 0.0
+    arrivals, previous = [], None
+    for position in order:
+        if previous is not None:
+            leg = minutes[previous, position]
+            clock += leg
+            travel += leg
+        start, violation = _earliest_service(stops[position], clock)
+        arrivals.append(int(round(start)))
+        lateness += violation
+        clock = start + stops[position].dwell
+        previous = position
+    return TimedRoute(order=list(order), arrivals=arrivals, travel_minutes=travel, lateness=lateness, feasible=lateness == 0)
+
+
+def solve_time_windows(
+    stops: List[Stop],
+    distance_matrix: np.ndarray,
+    day_start: int = 8 * 60,
+    mode: str = ROUTE_SPEED_MODE,
+    time_budget: float = 0.05,
+) -> TimedRoute:
+    """
+    시간대 창과 영업시간을 지키는 방문 순서 탐색
+    - 위반 시간(lateness)이 가장 적고, 같으면 이동 시간이 가장 짧은 순서를 선택
+    - 창 시작 시각 순 정렬로 초기해를 만든 뒤 분기 한정(branch and bound)으로 개선하고 time_budget(초)에서 중단
+    distance_matrix는 stops 순서와 같은 km 단위 행렬
+    """
+    size = len(stops)
+    if size == 0:
+        return TimedRoute(order=[], arrivals=[], travel_minutes=0.0, lateness=0.0, feasible=True)
+    minutes = np.vectorize(lambda distance: travel_minutes(distance, mode))(np.asarray(distance_matrix, dtype=np.float64))
+
+    initial = sorted(range(size), key=lambda position: (stops[position].window[0], stops[position].window[1]))
+    best = simulate(initial, stops, minutes, day_start)
+    if best.feasible and size <= 2:
+        return best
+
+    deadline = time.monotonic() + time_budget
+
+    def search(prefix: List[int], remaining: set, clock: float, travel: float, lateness: float):
+        nonlocal best
+        if (lateness, travel) >= (best.lateness, best.travel_minutes) or time.monotonic() > deadline:
+            return
+        if not remaining:
+            best = simulate(prefix, stops, minutes, day_start)
+            return
+        previous = prefix[-1] if prefix else None
+        # 창이 빨리 닫히는 방문지부터 시도
+        for position in sorted(remaining, key=lambda position: stops[position].window[1]):
+            leg = minutes[previous, position] if previous is not None else 0.0
+            start, violation = _earliest_service(stops[position], clock + leg)
+            remaining.remove(position)
+            prefix.append(position)
+            search(prefix, remaining, start + stops[position].dwell, travel + leg, lateness + violation)
+            prefix.pop()
+            remaining.add(position)
+
+    search([], set(range(size)), float(day_start), 0.0, 0.0)
+    return best
+
+
+def format_minutes(minutes: int) -> str:
+    """분을 HH:MM:SS 문자열로 변환 (자정 이후는 24시 이후로 넘기지 않고 23:59:00으로 제한)"""
+    minutes = min(int(minutes), MINUTES_PER_DAY - 1)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
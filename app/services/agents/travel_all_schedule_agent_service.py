@@ -1,17 +1,69 @@
 import os
+import copy
+import json
+import time
+import asyncio
+import hashlib
 import traceback
 from datetime import datetime
-from crewai import Agent, Task, Crew, LLM
+from crewai import Agent, Task, Crew
+from app.services.agents.llm_gateway import get_llm
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import Any, AsyncIterator, Coroutine, List, Dict, Optional, Tuple
 from fastapi import HTTPException
-from app.dtos.spot_models import spots_pydantic
+from app.dtos.spot_models import spots_pydantic, planned_spots_pydantic, calculate_trip_days
 from app.utils.time_check import time_check
+from app.utils.result_cache import cached_result, get_cache, is_cacheable
+from app.utils.single_flight import normalize_plan_request, make_plan_request_key
 from app.services.agents.tools.all_schedule_agent_tool import HaversineRouteOptimizer
+from app.services.agents.tools.rule_based_scheduler import RuleBasedScheduler
+from app.services.agents.tools.planner_encoding import PlannerEncoder
+from app.services.agents.site_agent_service import TravelPlanAgentService
+from app.services.agents.cafe_agent_service import CafeAgentService
+from app.services.agents.restaurant_agent_service import RestaurantAgentService
+from app.services.agents.accommodation_agent_service2 import AccommodationAgentService
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-llm = LLM(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
+llm = get_llm(model="gpt-4o-mini", temperature=0, api_key=OPENAI_API_KEY)
+
+# 카테고리별 에이전트 진입점 (agent_type 값 -> 코루틴 생성 함수)
+CATEGORY_AGENTS = {
+    "restaurant": lambda input_dict: RestaurantAgentService().create_recommendation(input_dict),
+    "site": lambda input_dict: TravelPlanAgentService().create_tourist_plan(input_dict),
+    "cafe": lambda input_dict: CafeAgentService().create_recommendation(input_dict),
+    "accommodation": lambda input_dict: AccommodationAgentService().create_recommendation(input_dict),
+}
+
+# 카테고리별 마감 시간(초) - AGENT_DEADLINE_<카테고리> 환경 변수로 변경 가능
+CATEGORY_DEADLINES = {
+    category: float(os.getenv(f"AGENT_DEADLINE_{category.upper()}", default))
+    for category, default in {
+        "restaurant": 100,
+        "site": 80,
+        "cafe": 100,
+        "accommodation": 100,
+    }.items()
+}
+# 요청 전체 예산(초)과 그중 최종 일정 생성 단계에 남겨둘 시간(초)
+PLAN_BUDGET_SECONDS = float(os.getenv("PLAN_BUDGET_SECONDS", "150"))
+PLANNER_RESERVE_SECONDS = float(os.getenv("PLANNER_RESERVE_SECONDS", "40"))
+
+
+def make_plan_cache_key(input_dict: dict) -> str:
+    """정규화된 요청 + 카테고리 결과(external_data)로 최종 일정 캐시 키 생성"""
+    serialized = json.dumps(
+        {
+            "request": normalize_plan_request(input_dict),
+            "planner": input_dict.get("planner", "llm"),
+            "external_data": input_dict.get("external_data", {}),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
 
 class TravelScheduleAgentService:
     _instance = None
@@ -26,6 +78,8 @@ class TravelScheduleAgentService:
         print("TravelScheduleAgentService 초기화 중...")
         self.llm = llm
         self.route_tool = HaversineRouteOptimizer()
+        self.rule_based_scheduler = RuleBasedScheduler(self.route_tool)
+        self.planner_encoder = PlannerEncoder()
         self.agents = self._create_agents()
 
     def _create_agents(self) -> Dict[str, Agent]:
@@ -47,11 +101,15 @@ class TravelScheduleAgentService:
         task_description = """
         [최종 여행 일정 생성]
         - 여행 기간: {start_date} ~ {end_date}
-        - external_data에는 다음 세 가지 카테고리의 장소들이 포함되어 있습니다:
+        - external_data에는 다음 카테고리의 장소들이 [카테고리] 아래에 한 줄씩 포함되어 있습니다:
         1. restaurant: 맛집 목록
         2. cafe: 카페 목록
         3. site: 관광지 목록
-        
+        4. accommodation: 숙소 목록
+        - 각 줄의 형식: id|이름|위도,경도|영업시간|추천일
+        - 추천일(d1, d2 ...)은 서로 가까운 장소끼리 묶은 날짜 제안입니다
+
+        - id: 장소 id (external_data에 있는 id를 그대로 사용)
         - day_x: 방문 날짜
         - order: 해당 날짜의 방문 순서
         -spot_time: 해당 스팟의 방문 추천 시간.
@@ -73,20 +131,28 @@ class TravelScheduleAgentService:
         - 새로운 장소를 임의로 생성하지 말 것
         - 필요한 카테고리의 데이터가 부족하면 해당 시간대는 비워둘 것
         - 이동 거리와 시간을 고려하여 효율적인 동선으로 구성할 것
+        - 가능하면 각 장소를 추천일에 배치하여 하루 동선이 한 지역 안에 머물도록 할 것
         - 각 장소는 중복 사용하지 않을 것
+        - 장소 정보는 반환하지 말고 id, day_x, order, spot_time만 반환할 것
 
-        External Data: {external_data}
+        External Data:
+        {external_data}
         """
         return [Task(
             description=task_description,
             agent=self.agents["planner"],
-            expected_output="pydantic 형식의 여행 일정 데이터",
-            output_pydantic=spots_pydantic,
+            expected_output="id, day_x, order, spot_time으로 구성된 pydantic 형식의 여행 일정 데이터",
+            output_pydantic=planned_spots_pydantic,
             async_execution=True,
         )]
 
-    def _process_result(self, result, input_dict: dict) -> dict:
-        """결과를 처리하는 메서드"""
+    def _process_result(self, result, input_dict: dict, id_map: Dict[str, dict]) -> dict:
+        """결과를 처리하는 메서드 (LLM이 반환한 id를 원본 장소 정보로 복원)"""
+        spots = self.planner_encoder.decode(result.pydantic, id_map)
+        return self._build_plan_response(spots, input_dict)
+
+    def _build_plan_response(self, spots: spots_pydantic, input_dict: dict) -> dict:
+        """일정 응답을 구성하는 메서드"""
         return {
             "message": "요청이 성공적으로 처리되었습니다.",
             "plan": {
@@ -96,21 +162,130 @@ class TravelScheduleAgentService:
                 "main_location": input_dict.get("main_location", "Unknown Location"),
                 "created_at": datetime.now().strftime("%Y-%m-%d"),
             },
-            "spots": result.pydantic.model_dump()
+            "spots": spots.model_dump(),
+            "planner": input_dict.get("planner", "llm"),
+        }
+
+    def resolve_categories(self, agent_type: List[str]) -> List[str]:
+        """요청된 agent_type 중 실행 가능한 카테고리 목록을 반환하는 메서드"""
+        return [category for category in CATEGORY_AGENTS if category in agent_type]
+
+    def create_category_tasks(self, input_dict: dict, agent_type: List[str]) -> Dict[str, Coroutine]:
+        """요청된 agent_type에 해당하는 카테고리 에이전트 코루틴을 생성하는 메서드"""
+        # 각 서비스가 입력(concepts, prompt 등)을 수정하므로 카테고리마다 복사본을 전달합니다.
+        return {
+            category: CATEGORY_AGENTS[category](copy.deepcopy(input_dict))
+            for category in self.resolve_categories(agent_type)
         }
+
+    async def iter_external_data(
+        self, input_dict: dict, agent_type: List[str], deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Any, Optional[str]]]:
+        """
+        카테고리 에이전트를 병렬 실행하고, 끝나는 순서대로 (카테고리, 결과, 저하 사유)를 반환하는 메서드
+        - 카테고리별 마감 시간(CATEGORY_DEADLINES)과 전체 마감 시각(deadline, time.monotonic 기준) 중 빠른 쪽 적용
+        - 시간 초과/실패 시 만료된 캐시가 있으면 대신 사용하고, 없으면 결과를 None으로 반환
+        - 저하 사유: None(정상), "timeout", "error", "timeout:stale_cache", "error:stale_cache"
+        """
+        if deadline is None:
+            deadline = time.monotonic() + PLAN_BUDGET_SECONDS - PLANNER_RESERVE_SECONDS
+        request_key = make_plan_request_key(input_dict)
+
+        async def run_category(category: str, coroutine: Coroutine) -> Tuple[str, Any, Optional[str]]:
+            timeout = max(0.0, min(CATEGORY_DEADLINES[category], deadline - time.monotonic()))
+            try:
+                result = await asyncio.wait_for(coroutine, timeout)
+                if is_cacheable(result):
+                    return category, result, None
+                reason = "error"
+            except asyncio.TimeoutError:
+                print(f"[{category}] 에이전트 시간 초과 ({timeout:.1f}초)")
+                reason = "timeout"
+            except Exception as e:
+                print(f"[{category}] 에이전트 실패: {e}")
+                reason = "error"
+
+            stale = get_cache(category).get(request_key, allow_stale=True)
+            if stale is not None:
+                return category, stale, f"{reason}:stale_cache"
+            return category, None, reason
+
+        # gather와 동일하게 agent_type 순서대로 작업을 시작합니다.
+        pending = [
+            asyncio.create_task(run_category(category, coroutine))
+            for category, coroutine in self.create_category_tasks(input_dict, agent_type).items()
+        ]
+        try:
+            for finished in asyncio.as_completed(pending):
+                yield await finished
+        finally:
+            # 클라이언트 연결 종료 등으로 중단되면 남은 작업을 취소합니다.
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+
+    async def create_plan_within_budget(self, input_dict: dict, started: float, degraded: dict) -> dict:
+        """
+        전체 예산 중 남은 시간(최소 PLANNER_RESERVE_SECONDS) 안에 최종 일정을 생성하는 메서드
+        LLM 플래너가 시간을 초과하면 규칙 기반 스케줄러로 대신 생성하고 degraded에 기록
+        """
+        remaining = max(PLANNER_RESERVE_SECONDS, started + PLAN_BUDGET_SECONDS - time.monotonic())
+        try:
+            return await asyncio.wait_for(self.create_plan(input_dict), remaining)
+        except asyncio.TimeoutError:
+            print(f"[planner] LLM 플래너 시간 초과 ({remaining:.1f}초) → 규칙 기반 스케줄러 사용")
+            degraded["planner"] = "timeout:rule"
+            return self.create_rule_based_plan(input_dict)
+
+    async def generate_plan(self, input_dict: dict, agent_type: List[str]) -> dict:
+        """카테고리 에이전트 결과를 모아 최종 여행 일정을 생성하는 메서드 (저하된 카테고리는 degraded에 기록)"""
+        started = time.monotonic()
+        external_data, degraded = {}, {}
+        async for category, result, reason in self.iter_external_data(input_dict, agent_type):
+            if result is not None:
+                external_data[category] = result
+            if reason:
+                degraded[category] = reason
+
+        if not external_data and degraded:
+            raise HTTPException(status_code=503, detail=f"모든 카테고리 에이전트가 실패했습니다: {degraded}")
+
+        # 도착한 카테고리만으로 최종 여행 일정 생성
+        input_dict["external_data"] = external_data
+        result = await self.create_plan_within_budget(input_dict, started, degraded)
+        result["degraded"] = degraded
+        return result
+
+    def create_rule_based_plan(self, input_dict: dict) -> dict:
+        """규칙 기반 스케줄러로 여행 일정을 생성하는 메서드 (LLM 호출 없음)"""
+        spots = self.rule_based_scheduler.schedule(
+            input_dict.get("external_data", {}), input_dict["start_date"], input_dict["end_date"]
+        )
+        return self._build_plan_response(spots, {**input_dict, "planner": "rule"})
+
+    @cached_result("plan", key_func=make_plan_cache_key)
     @time_check
     async def create_plan(self, input_dict: dict) -> dict:
-        """여행 일정 생성 워크플로우 실행"""
+        """여행 일정 생성 워크플로우 실행 (input_dict["planner"]로 생성 방식 선택)"""
         try:
+            if input_dict.get("planner", "llm") == "rule":
+                return self.create_rule_based_plan(input_dict)
+
             # Task 생성
             tasks = self._create_tasks()
             
+            # external_data를 id 기반의 짧은 텍스트로 변환 (토큰 예산 적용)
+            compact_data, id_map = self.planner_encoder.encode(
+                input_dict.get("external_data", {}),
+                calculate_trip_days(input_dict["start_date"], input_dict["end_date"]),
+            )
+
             # Crew 실행
             crew = Crew(tasks=tasks, agents=list(self.agents.values()), verbose=True)
-            result = await crew.kickoff_async(inputs=input_dict)
-            
+            result = await crew.kickoff_async(inputs={**input_dict, "external_data": compact_data})
+
             # 결과 처리
-            return self._process_result(result, input_dict)
+            return self._process_result(result, input_dict, id_map)
 
         except Exception as e:
             traceback.print_exc()
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 import os
 from app.utils.oauths.jwt_utils import create_jwt_google, create_jwt_kakao, create_refresh_token, decode_jwt
+from app.utils.http_clients import get_http_client
 
 
 # Load .env variables
@@ -33,10 +34,10 @@ async def handle_google_callback(code: str, state: str):
 
     try:
         # Google 토큰 엔드포인트로 요청
-        async with httpx.AsyncClient() as client:
-            response = await client.post(GOOGLE_TOKEN_URL, data=data)
-            response.raise_for_status()
-            token_data = response.json()
+        client = get_http_client("oauth")
+        response = await client.post(GOOGLE_TOKEN_URL, data=data)
+        response.raise_for_status()
+        token_data = response.json()
 
         # 응답 데이터 확인
         access_token = token_data.get("access_token")
@@ -2,6 +2,7 @@ import os
 import httpx
 from dotenv import load_dotenv
 from app.utils.oauths.jwt_utils import create_jwt_kakao, create_refresh_token, decode_jwt
+from app.utils.http_clients import get_http_client
 
 
 # .env 파일 로드
@@ -33,11 +34,11 @@ async def get_access_token(code: str, state: str) -> str:
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
     try:
-        async with httpx.AsyncClient() as client:   #
-            response = await client.post(token_url, data=data, headers=headers)
-            response.raise_for_status()
-            token_data = response.json()
-            return token_data.get("access_token")
+        client = get_http_client("oauth")
+        response = await client.post(token_url, data=data, headers=headers)
+        response.raise_for_status()
+        token_data = response.json()
+        return token_data.get("access_token")
     except httpx.HTTPStatusError as e:
         raise Exception(f"Failed to fetch access token: {e.response.text}") from e
     except Exception as e:
@@ -58,11 +59,11 @@ async def fetch_user_info(access_token: str) -> dict:
 
     try:
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(user_info_url, headers=headers)
-            response.raise_for_status()
-            user_info = response.json()
-            return user_info
+        client = get_http_client("oauth")
+        response = await client.get(user_info_url, headers=headers)
+        response.raise_for_status()
+        user_info = response.json()
+        return user_info
     except httpx.HTTPStatusError as e:
         raise Exception(f"Failed to fetch user info: {e.response.text}") from e
     except Exception as e:
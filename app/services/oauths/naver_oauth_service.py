@@ -1,7 +1,7 @@
 import secrets
-import httpx
 import os
 import dotenv
+from app.utils.http_clients import get_http_client
 
 dotenv.load_dotenv()
 
@@ -25,10 +25,10 @@ async def get_naver_access_token(code: str, state: str) -> dict:
         "state": state,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(NAVER_TOKEN_URL, params=params)
-        response.raise_for_status()
-        return response.json()
+    client = get_http_client("oauth")
+    response = await client.post(NAVER_TOKEN_URL, params=params)
+    response.raise_for_status()
+    return response.json()
 
 
 async def refresh_naver_access_token(refresh_token: str) -> dict:
@@ -42,10 +42,10 @@ async def refresh_naver_access_token(refresh_token: str) -> dict:
         "refresh_token": refresh_token,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(NAVER_TOKEN_URL, params=params)
-        response.raise_for_status()
-        return response.json()  # 갱신된 액세스 토큰과 새로운 리프레시 토큰을 반환
+    client = get_http_client("oauth")
+    response = await client.post(NAVER_TOKEN_URL, params=params)
+    response.raise_for_status()
+    return response.json()  # 갱신된 액세스 토큰과 새로운 리프레시 토큰을 반환
 
 
 async def get_naver_user_profile(access_token: str) -> dict:
@@ -54,10 +54,10 @@ async def get_naver_user_profile(access_token: str) -> dict:
     """
     headers = {"Authorization": f"Bearer {access_token}"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(NAVER_PROFILE_URL, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    client = get_http_client("oauth")
+    response = await client.get(NAVER_PROFILE_URL, headers=headers)
+    response.raise_for_status()
+    return response.json()
 
 
 def get_login_url() -> str:
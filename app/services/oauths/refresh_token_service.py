@@ -1,6 +1,6 @@
-import httpx
 import os
 import dotenv
+from app.utils.http_clients import get_http_client
 
 dotenv.load_dotenv()
 
@@ -19,7 +19,7 @@ async def refresh_naver_access_token(refresh_token: str) -> dict:
         "refresh_token": refresh_token,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(NAVER_TOKEN_URL, params=params)
-        response.raise_for_status()
-        return response.json()  # 갱신된 액세스 토큰과 새로운 리프레시 토큰을 반환
+    client = get_http_client("oauth")
+    response = await client.post(NAVER_TOKEN_URL, params=params)
+    response.raise_for_status()
+    return response.json()  # 갱신된 액세스 토큰과 새로운 리프레시 토큰을 반환
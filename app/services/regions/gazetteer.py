@@ -0,0 +1,237 @@
+import os
+import csv
+import difflib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+# 기본값: 저장소 루트의 administrative_division.csv
+GAZETTEER_CSV_PATH = os.getenv(
+    "GAZETTEER_CSV_PATH", str(Path(__file__).resolve().parents[3] / "administrative_division.csv")
+)
+# 오타/유사 표기 허용 정도 (difflib 유사도 0~1)
+GAZETTEER_FUZZY_CUTOFF = float(os.getenv("GAZETTEER_FUZZY_CUTOFF", "0.75"))
+# 유사 이름 검색 결과를 기억할 최대 개수 (유사 검색은 수 ms가 걸리므로)
+GAZETTEER_MEMO_SIZE = 4096
+
+# 행정구역 접미사 (긴 것부터 제거)
+REGION_SUFFIXES = ["특별자치도", "특별자치시", "특별시", "광역시", "도", "시", "군", "구"]
+
+# 약칭, 옛 명칭, 영문 표기 -> 시/도 이름
+PROVINCE_ALIASES = {
+    "서울특별시": ["서울", "서울시", "seoul"],
+    "부산광역시": ["부산", "부산시", "busan", "pusan"],
+    "대구광역시": ["대구", "대구시", "daegu"],
+    "인천광역시": ["인천", "인천시", "incheon"],
+    "광주광역시": ["광주", "gwangju"],
+    "대전광역시": ["대전", "대전시", "daejeon"],
+    "울산광역시": ["울산", "울산시", "ulsan"],
+    "세종특별자치시": ["세종", "세종시", "sejong"],
+    "경기도": ["경기", "gyeonggi"],
+    "강원특별자치도": ["강원", "강원도", "gangwon"],
+    "충청북도": ["충북", "chungbuk"],
+    "충청남도": ["충남", "chungnam"],
+    "전북특별자치도": ["전북", "전라북도", "jeonbuk"],
+    "전라남도": ["전남", "jeonnam"],
+    "경상북도": ["경북", "gyeongbuk"],
+    "경상남도": ["경남", "gyeongnam"],
+    "제주특별자치도": ["제주", "제주도", "jeju"],
+}
+
+
+@dataclass(frozen=True)
+class Region:
+    city_province: str
+    city_county: str
+    latitude: float
+    longitude: float
+    min_latitude: float
+    min_longitude: float
+    max_latitude: float
+    max_longitude: float
+
+    @property
+    def is_province(self) -> bool:
+        return self.city_province == self.city_county
+
+    @property
+    def name(self) -> str:
+        return self.city_county if self.is_province else f"{self.city_province} {self.city_county}"
+
+    @property
+    def coordinates(self) -> Tuple[float, float]:
+        return self.latitude, self.longitude
+
+    @property
+    def bbox(self) -> Tuple[float, float, float, float]:
+        """(최소 위도, 최소 경도, 최대 위도, 최대 경도)"""
+        return self.min_latitude, self.min_longitude, self.max_latitude, self.max_longitude
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        return self.min_latitude <= latitude <= self.max_latitude and self.min_longitude <= longitude <= self.max_longitude
+
+
+def normalize_region_name(name: str) -> str:
+    return "".join(str(name).split()).lower()
+
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 자모로 분해 ('강릉' -> 'ㄱㅏㅇㄹㅡㅇ'), 두 글자 지명의 오타도 유사도로 비교할 수 있게 함"""
+    letters = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            letters.append(_CHOSEONG[code // 588])
+            letters.append(_JUNGSEONG[(code % 588) // 28])
+            if code % 28:
+                letters.append(_JONGSEONG[code % 28])
+        else:
+            letters.append(char)
+    return "".join(letters)
+
+
+def strip_region_suffix(name: str) -> str:
+    """'강릉시' -> '강릉', '해운대구' -> '해운대' (두 글자 이상 남을 때만 제거)"""
+    for suffix in REGION_SUFFIXES:
+        if name.endswith(suffix) and len(name) - len(suffix) >= 2:
+            return name[: -len(suffix)]
+    return name
+
+
+class Gazetteer:
+    """
+    administrative_division.csv의 행정구역 중심 좌표/경계 범위를 메모리에 올려두고
+    지역 이름(약칭, 옛 명칭, 오타 포함)을 네트워크 호출 없이 좌표로 변환하는 클래스
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Gazetteer, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self, csv_path: str = GAZETTEER_CSV_PATH):
+        self.regions: List[Region] = []
+        self.provinces: Dict[str, Region] = {}
+        # 별칭 -> 후보 지역 (시/도가 먼저 오도록 정렬)
+        self.aliases: Dict[str, List[Region]] = {}
+        # 시/도 -> (시군구 별칭 -> 지역)
+        self.counties: Dict[str, Dict[str, Region]] = {}
+        # 자모 분해한 별칭 -> 별칭 (유사 이름 검색용)
+        self.decomposed: Dict[str, str] = {}
+        self._fuzzy_memo: Dict[str, Optional[Region]] = {}
+        seen = set()
+        try:
+            with open(csv_path, encoding="utf-8") as file:
+                for row in csv.DictReader(file):
+                    if (row["city_province"], row["city_county"]) in seen or not row.get("latitude"):
+                        continue
+                    seen.add((row["city_province"], row["city_county"]))
+                    self._add(Region(
+                        city_province=row["city_province"],
+                        city_county=row["city_county"],
+                        **{
+                            key: float(row[key])
+                            for key in ("latitude", "longitude", "min_latitude", "min_longitude", "max_latitude", "max_longitude")
+                        },
+                    ))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[Gazetteer] 행정구역 데이터 로드 실패: {e}")
+        for alias, candidates in self.aliases.items():
+            candidates.sort(key=lambda region: not region.is_province)
+            self.decomposed.setdefault(decompose_hangul(alias), alias)
+        print(f"[Gazetteer] 행정구역 {len(self.regions)}곳 로드")
+
+    def _alias(self, alias: str, region: Region):
+        candidates = self.aliases.setdefault(normalize_region_name(alias), [])
+        if region not in candidates:
+            candidates.append(region)
+
+    def _add(self, region: Region):
+        self.regions.append(region)
+        if region.is_province:
+            self.provinces[region.city_province] = region
+            for alias in [region.city_province, strip_region_suffix(region.city_province), *PROVINCE_ALIASES.get(region.city_province, [])]:
+                self._alias(alias, region)
+            return
+
+        county_aliases = {region.city_county, strip_region_suffix(region.city_county)}
+        county_map = self.counties.setdefault(region.city_province, {})
+        for alias in county_aliases:
+            county_map.setdefault(normalize_region_name(alias), region)
+            # '구'는 여러 광역시에 같은 이름이 있어 시/도 없이 단독으로는 의미가 약하지만 후보로는 등록
+            self._alias(alias, region)
+        for province_alias in [region.city_province, *PROVINCE_ALIASES.get(region.city_province, [])]:
+            for alias in county_aliases:
+                self._alias(province_alias + alias, region)
+
+    def _match_province(self, token: str) -> Optional[Region]:
+        for region in self.aliases.get(token, []):
+            if region.is_province:
+                return region
+        return None
+
+    def lookup(self, name: str, fuzzy: bool = True, exact: bool = False) -> Optional[Region]:
+        """
+        지역 이름을 행정구역으로 변환
+        - '부산', '부산광역시', '부산 해운대구', '해운대', '강릉시', '전라북도' 등 정확/별칭 일치
+        - 여러 단어면 '시/도 + 시군구' 조합, 그다음 단어별 일치 순서로 찾음 ('속초 바다' -> 속초시)
+        - fuzzy=True이면 오타 등 유사한 이름도 허용 (자모 단위 difflib 비교)
+        - exact=True이면 문자열 전체가 지역 이름일 때만 일치 (상세 주소는 None)
+        같은 이름이 여러 곳이면 시/도 단위를 우선하며, 찾지 못하면 None
+        """
+        if not name or not str(name).strip():
+            return None
+        key = normalize_region_name(name)
+        if key in self.aliases:
+            return self.aliases[key][0]
+        if exact:
+            return None
+
+        tokens = [normalize_region_name(token) for token in str(name).replace(",", " ").split()]
+        if len(tokens) >= 2:
+            province = self._match_province(tokens[0])
+            if province is not None:
+                county_map = self.counties.get(province.city_province, {})
+                for token in tokens[1:]:
+                    region = county_map.get(token) or county_map.get(strip_region_suffix(token))
+                    if region is not None:
+                        return region
+                return province
+            for token in tokens:
+                if token in self.aliases:
+                    return self.aliases[token][0]
+
+        if fuzzy:
+            return self._fuzzy_lookup(key, tokens)
+        return None
+
+    def _fuzzy_lookup(self, key: str, tokens: List[str]) -> Optional[Region]:
+        if key in self._fuzzy_memo:
+            return self._fuzzy_memo[key]
+        region = None
+        for candidate in [key, *tokens]:
+            matches = difflib.get_close_matches(
+                decompose_hangul(candidate), self.decomposed.keys(), n=1, cutoff=GAZETTEER_FUZZY_CUTOFF
+            )
+            if matches:
+                region = self.aliases[self.decomposed[matches[0]]][0]
+                break
+        if len(self._fuzzy_memo) >= GAZETTEER_MEMO_SIZE:
+            self._fuzzy_memo.clear()
+        self._fuzzy_memo[key] = region
+        return region
+
+    def coordinates(self, name: str, fuzzy: bool = True, exact: bool = False) -> Optional[Tuple[float, float]]:
+        """지역 이름 -> (위도, 경도), 찾지 못하면 None"""
+        region = self.lookup(name, fuzzy=fuzzy, exact=exact)
+        return region.coordinates if region else None
@@ -0,0 +1,199 @@
+import os
+import re
+import asyncio
+import threading
+import unicodedata
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+from app.utils.http_clients import get_http_client, get_sync_http_client
+from app.utils.result_cache import get_cache
+from app.utils.single_flight import SingleFlight
+
+load_dotenv()
+GOOGLE_MAP_API_KEY = os.getenv("GOOGLE_MAP_API_KEY")
+KAKAO_API_KEY = os.getenv("KAKAO_API_KEY") or os.getenv("KAKAO_MAP_API_KEY")
+# 결과가 없는 주소도 이 시간 동안은 다시 조회하지 않음 (초)
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL", str(24 * 60 * 60)))
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+# Nominatim 이용 정책: 식별 가능한 User-Agent 필수 (초당 1회 제한은 rate_limiter의 HOST_RATE_LIMITS로 적용)
+NOMINATIM_HEADERS = {"User-Agent": "South Korea"}
+
+
+def normalize_address(query: str) -> str:
+    """캐시 키용 주소 정규화 (유니코드 정규화, 소문자, 괄호/구두점 제거, 공백 정리)"""
+    text = unicodedata.normalize("NFC", str(query or "")).lower()
+    text = re.sub(r"[()\[\],.·]", " ", text)
+    return " ".join(text.split())
+
+
+class GeocodingService:
+    """
+    모든 에이전트 도구가 함께 쓰는 지오코딩 서비스 (싱글톤)
+    - 제공자 + 정규화된 주소로 캐시 (결과 있음: 기본 TTL, 결과 없음: GEOCODE_NEGATIVE_TTL)
+    - 캐시는 TieredCache("geocode")라 메모리 LRU + SQLite에 저장되어 재시작 후에도 유지
+    - 같은 주소의 동시 조회는 SingleFlight로 한 번만 호출
+    - 네트워크 오류는 캐시하지 않고, 만료된 캐시가 있으면 대신 반환
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(GeocodingService, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self.cache = get_cache("geocode")
+        # FastAPI 메인 루프와 도구용 AsyncBridge 루프가 따로 있으므로 루프별로 SingleFlight 관리
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SingleFlight]" = weakref.WeakKeyDictionary()
+        self._sync_locks: Dict[str, threading.Lock] = {}
+        self._sync_locks_guard = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, query: str) -> str:
+        return f"{provider}:{normalize_address(query)}"
+
+    def _flight(self) -> SingleFlight:
+        loop = asyncio.get_running_loop()
+        if loop not in self._flights:
+            self._flights[loop] = SingleFlight()
+        return self._flights[loop]
+
+    def _store(self, key: str, result: Optional[dict]):
+        if result:
+            self.cache.set(key, {"found": True, "result": result})
+        else:
+            self.cache.set(key, {"found": False}, ttl=GEOCODE_NEGATIVE_TTL)
+
+    def _cached(self, key: str) -> Tuple[bool, Optional[dict]]:
+        """(캐시 적중 여부, 결과) - 결과 없음으로 캐시된 주소는 (True, None)"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return False, None
+        return True, entry["result"] if entry.get("found") else None
+
+    def _fallback(self, key: str, provider: str, query: str, error: Exception) -> Optional[dict]:
+        """조회 실패(서킷 브레이커 열림 포함) 시 만료된 캐시가 있으면 대신 사용"""
+        print(f"[GeocodingService] {provider} 조회 실패 ({query}): {error}")
+        entry = self.cache.get(key, allow_stale=True)
+        return entry["result"] if entry and entry.get("found") else None
+
+    async def resolve(self, provider: str, query: str, fetch: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """
+        캐시를 거쳐 fetch() 결과(dict 또는 None)를 반환
+        provider는 같은 주소라도 결과 형식이 다른 조회를 구분하는 이름 (예: "kakao_keyword")
+        """
+        key = self.make_key(provider, query)
+        hit, result = self._cached(key)
+        if hit:
+            return result
+
+        async def load() -> Optional[dict]:
+            try:
+                fetched = await fetch()
+            except Exception as e:
+                return self._fallback(key, provider, query, e)
+            self._store(key, fetched)
+            return fetched
+
+        return await self._flight().do(key, load)
+
+    def resolve_sync(self, provider: str, query: str, fetch: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """동기 도구용 resolve (같은 주소의 동시 조회는 키별 잠금으로 한 번만 호출)"""
+        key = self.make_key(provider, query)
+        hit, result = self._cached(key)
+        if hit:
+            return result
+        with self._sync_locks_guard:
+            lock = self._sync_locks.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                hit, result = self._cached(key)
+                if hit:
+                    return result
+                try:
+                    result = fetch()
+                except Exception as e:
+                    return self._fallback(key, provider, query, e)
+                self._store(key, result)
+                return result
+        finally:
+            with self._sync_locks_guard:
+                self._sync_locks.pop(key, None)
+
+    async def geocode(self, query: str, provider: str = "kakao") -> Optional[Tuple[float, float]]:
+        """주소/지명 -> (위도, 경도) (provider: kakao 주소 검색, google, nominatim)"""
+        if not query or not str(query).strip():
+            return None
+        fetchers = {
+            "kakao": self._fetch_kakao_address,
+            "google": self._fetch_google,
+            "nominatim": self._fetch_nominatim,
+        }
+        result = await self.resolve(provider, query, lambda: fetchers[provider](query))
+        return (result["latitude"], result["longitude"]) if result else None
+
+    def geocode_sync(self, query: str, provider: str = "nominatim") -> Optional[Tuple[float, float]]:
+        """동기 도구(crewAI _run)용 geocode - 현재 Nominatim만 지원"""
+        if not query or not str(query).strip():
+            return None
+        result = self.resolve_sync(provider, query, lambda: self._fetch_nominatim_sync(query))
+        return (result["latitude"], result["longitude"]) if result else None
+
+    async def _fetch_kakao_address(self, query: str) -> Optional[dict]:
+        client = get_http_client("kakao")
+        response = await client.get(
+            "https://dapi.kakao.com/v2/local/search/address.json",
+            headers={"Authorization": f"KakaoAK {KAKAO_API_KEY}"},
+            params={"query": query},
+        )
+        response.raise_for_status()
+        documents = response.json().get("documents", [])
+        if not documents:
+            return None
+        # 첫 번째 결과의 좌표 정보를 사용 (경도: x, 위도: y)
+        address = documents[0].get("address") or documents[0]
+        return {"latitude": float(address.get("y", 0.0)), "longitude": float(address.get("x", 0.0))}
+
+    async def _fetch_google(self, query: str) -> Optional[dict]:
+        client = get_http_client("google")
+        response = await client.get(
+            "https://maps.googleapis.com/maps/api/geocode/json",
+            params={"address": query, "key": GOOGLE_MAP_API_KEY},
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") not in ("OK", "ZERO_RESULTS"):
+            # 요청 한도 초과 등은 일시적 오류이므로 결과 없음으로 캐시하지 않음
+            raise RuntimeError(data.get("status"))
+        if not data.get("results"):
+            return None
+        location = data["results"][0]["geometry"]["location"]
+        return {"latitude": location["lat"], "longitude": location["lng"]}
+
+    @staticmethod
+    def _parse_nominatim(response) -> Optional[dict]:
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return {"latitude": float(results[0]["lat"]), "longitude": float(results[0]["lon"])}
+
+    async def _fetch_nominatim(self, query: str) -> Optional[dict]:
+        client = get_http_client("nominatim")
+        response = await client.get(
+            NOMINATIM_URL, headers=NOMINATIM_HEADERS, params={"q": query, "format": "json", "limit": 1}
+        )
+        return self._parse_nominatim(response)
+
+    def _fetch_nominatim_sync(self, query: str) -> Optional[dict]:
+        client = get_sync_http_client("nominatim")
+        response = client.get(
+            NOMINATIM_URL, headers=NOMINATIM_HEADERS, params={"q": query, "format": "json", "limit": 1}
+        )
+        return self._parse_nominatim(response)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
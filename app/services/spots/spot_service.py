@@ -1,8 +1,8 @@
 
-from typing import List
+from typing import List, Optional
 from sqlmodel import Session
 from app.data_models.data_model import Spot
-from app.repository.spots.spot_repository import delete_spot, save_spot, get_spot
+from app.repository.spots.spot_repository import delete_spot, save_spot, get_spot, find_spots_nearby
 from datetime import datetime
 from app.utils.serialize_time import serialize_time
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -16,6 +16,23 @@ async def find_spot(spot_id: int, session: AsyncSession):
     serialized_spot = serialize_time(spot,  ["created_at", "updated_at"])
     return serialized_spot
 
+async def find_nearby_spots(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    session: AsyncSession,
+    spot_category: Optional[int] = None,
+    limit: int = 20,
+) -> List[dict]:
+    """저장된 장소 중 반경 내 장소를 중복 없이 가까운 순으로 반환 (외부 검색 API 호출 없음)"""
+    spots = await find_spots_nearby(latitude, longitude, radius_km, session, spot_category, limit)
+    nearby = []
+    for spot, distance in spots:
+        serialized_spot = serialize_time(spot, ["created_at", "updated_at"])
+        serialized_spot["distance_km"] = round(distance, 3)
+        nearby.append(serialized_spot)
+    return nearby
+
 # # 이미 존재하는 장소인지 확인
 # # 이미 존재하면서 요청 데이터에도 존재하면 내버려둠.
 # # 이미 존재하면서 요청 데이터에는 없으면 삭제
@@ -68,6 +68,8 @@ CREATE TABLE `spot` (
     `url` VARCHAR(2083) NULL,
     `image_url` VARCHAR(2083) NOT NULL,
     `map_url` VARCHAR(2083) NOT NULL,
+    `latitude` DOUBLE NOT NULL,
+    `longitude` DOUBLE NOT NULL,
     `likes` INT NULL,
     `satisfaction` FLOAT NULL,
     `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
@@ -75,7 +77,9 @@ CREATE TABLE `spot` (
     `spot_category` INT NOT NULL,
     `phone_number` VARCHAR(300) NULL,
     `business_status` BOOL NULL,
-    `business_hours` VARCHAR(255) NULL
+    `business_hours` VARCHAR(255) NULL,
+    `geohash` VARCHAR(12) NULL,
+    INDEX `IX_spot_geohash` (`geohash`)
 );
 
 
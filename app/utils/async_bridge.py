@@ -0,0 +1,95 @@
+import os
+import asyncio
+import threading
+import concurrent.futures
+from typing import Awaitable, Optional, TypeVar
+from dotenv import load_dotenv
+
+load_dotenv()
+# 동기 도구가 비동기 작업 결과를 기다리는 최대 시간 (초)
+ASYNC_BRIDGE_TIMEOUT = float(os.getenv("ASYNC_BRIDGE_TIMEOUT", "300"))
+
+T = TypeVar("T")
+
+
+class AsyncBridge:
+    """
+    동기 코드(crewAI 도구의 _run)에서 비동기 코드를 실행하기 위한 백그라운드 이벤트 루프 (싱글톤)
+    - 전용 스레드에서 계속 돌아가는 루프 하나에 모든 도구의 작업을 보냄
+    - 호출마다 루프와 연결을 새로 만들지 않으므로 HTTP 연결 풀(HTTPClientRegistry)이 호출 간에 재사용됨
+    - 이미 이벤트 루프가 실행 중인 스레드에서 호출해도 동작 (asyncio.run과 달리)
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncBridge, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """백그라운드 루프 (처음 사용할 때 스레드 시작)"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=serve, name="async-bridge", daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+                print("[AsyncBridge] 백그라운드 이벤트 루프 시작")
+            return self._loop
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = ASYNC_BRIDGE_TIMEOUT) -> T:
+        """코루틴을 백그라운드 루프에서 실행하고 결과를 기다림 (시간 초과 시 작업 취소 후 TimeoutError)"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("백그라운드 루프 안에서는 run()을 호출할 수 없습니다. await를 사용하세요.")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"비동기 작업이 {timeout}초 안에 끝나지 않았습니다.")
+
+    def shutdown(self, timeout: float = 10):
+        """남은 작업을 취소하고 루프 스레드 종료 (lifespan 종료 시 호출)"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None or loop.is_closed():
+            return
+
+        async def cancel_pending():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+        except Exception as e:
+            print(f"[AsyncBridge] 작업 취소 실패: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        print("[AsyncBridge] 백그라운드 이벤트 루프 종료")
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = ASYNC_BRIDGE_TIMEOUT) -> T:
+    """동기 도구(_run)에서 asyncio.run 대신 사용"""
+    return AsyncBridge().run(coro, timeout)
@@ -0,0 +1,97 @@
+import math
+from typing import List, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE_MAP = {char: index for index, char in enumerate(_BASE32)}
+
+# 자리수별 셀 크기(대략, 위도 방향 km): 5 ≈ 4.9km, 6 ≈ 1.2km, 7 ≈ 150m, 8 ≈ 38m, 9 ≈ 5m
+DEFAULT_PRECISION = 9
+# 위도 1도의 길이(km)
+KM_PER_DEGREE = 111.32
+
+
+def encode(latitude: float, longitude: float, precision: int = DEFAULT_PRECISION) -> str:
+    """위도/경도를 geohash 문자열로 변환"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, value = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def decode_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """geohash 셀의 경계 (최소 위도, 최소 경도, 최대 위도, 최대 경도)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash.lower():
+        value = _DECODE_MAP[char]
+        for shift in range(4, -1, -1):
+            target = lng_range if even else lat_range
+            middle = (target[0] + target[1]) / 2
+            if (value >> shift) & 1:
+                target[0] = middle
+            else:
+                target[1] = middle
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """geohash 셀의 중심 위도/경도"""
+    min_lat, min_lng, max_lat, max_lng = decode_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+def neighbors(geohash: str) -> List[str]:
+    """주변 8개 셀 (셀 크기만큼 떨어진 중심점을 다시 인코딩)"""
+    min_lat, min_lng, max_lat, max_lng = decode_bounds(geohash)
+    lat_step, lng_step = max_lat - min_lat, max_lng - min_lng
+    center_lat, center_lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    cells = []
+    for lat_offset in (-1, 0, 1):
+        for lng_offset in (-1, 0, 1):
+            if lat_offset == 0 and lng_offset == 0:
+                continue
+            latitude = center_lat + lat_offset * lat_step
+            if not -90 <= latitude <= 90:
+                continue
+            longitude = (center_lng + lng_offset * lng_step + 180) % 360 - 180
+            cells.append(encode(latitude, longitude, len(geohash)))
+    return cells
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 지점 사이의 대원 거리(km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6371.0088 * math.asin(math.sqrt(min(1.0, a)))
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float, max_precision: int = DEFAULT_PRECISION) -> List[str]:
+    """
+    (latitude, longitude) 중심 반경 radius_km 원을 덮는 geohash 셀 목록 (중심 셀 + 주변 8개 셀)
+    셀의 짧은 변이 반경 이상인 가장 긴 자리수를 골라, 접두사(LIKE 'abc%') 검색 범위를 최소화
+    """
+    for precision in range(max_precision, 0, -1):
+        cell = encode(latitude, longitude, precision)
+        min_lat, min_lng, max_lat, max_lng = decode_bounds(cell)
+        height = (max_lat - min_lat) * KM_PER_DEGREE
+        width = (max_lng - min_lng) * KM_PER_DEGREE * math.cos(math.radians(latitude))
+        if min(height, width) >= radius_km:
+            return list(dict.fromkeys([cell, *neighbors(cell)]))
+    return [""]
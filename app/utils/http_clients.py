@@ -0,0 +1,191 @@
+import os
+import asyncio
+import threading
+import importlib.util
+import weakref
+from typing import Any, Dict
+import httpx
+from dotenv import load_dotenv
+from app.utils.rate_limiter import RateLimitedSyncTransport, RateLimitedTransport
+from app.utils.resilience import IDEMPOTENT_METHODS, ResilientSyncTransport, ResilientTransport
+from app.utils.upstream_replay import UPSTREAM_MODE, RecordReplaySyncTransport, RecordReplayTransport
+
+load_dotenv()
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2는 h2 패키지가 설치되어 있을 때만 사용
+HTTP2_ENABLED = (
+    os.getenv("HTTP2_ENABLED", "true").lower() == "true" and importlib.util.find_spec("h2") is not None
+)
+
+# 제공자(업스트림 호스트 묶음)별 연결 풀 설정 - 제공자마다 별도 풀을 두어 호스트별 연결 수를 제한
+# HTTP_MAX_CONNECTIONS_<제공자> 환경 변수로 최대 연결 수 변경 가능
+# resilient: 재시도/서킷 브레이커 적용 여부, retry_methods: 재시도할 메서드 (기본 GET/HEAD)
+# record: UPSTREAM_MODE=record/replay 적용 여부 (기본 True)
+# follow_redirects: 리다이렉트 자동 추적 여부 (기본 True, 이전 aiohttp/requests 동작과 동일)
+PROVIDER_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "default": {"http2": False},
+    "kakao": {"http2": True, "resilient": True},  # dapi.kakao.com
+    "google": {"http2": True, "resilient": True},  # maps.googleapis.com
+    "naver": {"http2": True, "resilient": True},  # openapi.naver.com, m.place.naver.com, m.blog.naver.com
+    # 소셜 로그인 (kauth/kapi.kakao.com, oauth2.googleapis.com, nid.naver.com, openapi.naver.com/v1/nid)
+    # 토큰과 개인정보가 오가므로 녹화하지 않고, 녹화된 사용자로 로그인되지 않도록 재생하지도 않음
+    "oauth": {"http2": True, "resilient": True, "record": False},
+    # 검색 POST는 부수 효과가 없으므로 재시도
+    "serper": {"http2": True, "resilient": True, "retry_methods": IDEMPOTENT_METHODS | {"POST"}},  # google.serper.dev
+    "serpapi": {"http2": True, "resilient": True},  # serpapi.com
+    "nominatim": {"http2": False, "resilient": True},  # nominatim.openstreetmap.org
+    # 이미지 URL 확인 등 임의 호스트 (호스트가 제각각이라 HTTP/1.1, 짧은 타임아웃)
+    "probe": {"http2": False, "timeout": 5, "max_connections": 50},
+}
+
+
+def _pool_options(config: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    max_connections = int(os.getenv(
+        f"HTTP_MAX_CONNECTIONS_{provider.upper()}", config.get("max_connections", HTTP_MAX_CONNECTIONS)
+    ))
+    return {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(HTTP_MAX_KEEPALIVE, max_connections),
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "http2": HTTP2_ENABLED and config.get("http2", False),
+    }
+
+
+def _records(config: Dict[str, Any]) -> bool:
+    return UPSTREAM_MODE != "live" and config.get("record", True)
+
+
+def _replays(config: Dict[str, Any]) -> bool:
+    # replay는 네트워크를 쓰지 않으므로 요청 한도/쿼터 카운터를 소모하지 않음
+    return UPSTREAM_MODE == "replay" and config.get("record", True)
+
+
+def _create_async_client(provider: str) -> httpx.AsyncClient:
+    config = PROVIDER_CONFIGS.get(provider, PROVIDER_CONFIGS["default"])
+    transport = httpx.AsyncHTTPTransport(**_pool_options(config, provider))
+    if _records(config):
+        # 실제 네트워크 호출 자리만 대체 (재시도/서킷 브레이커는 그대로 동작)
+        transport = RecordReplayTransport(transport)
+    if config.get("resilient"):
+        if not _replays(config):
+            # 재시도 요청도 한도를 거치도록 RateLimited를 안쪽에 둠
+            transport = RateLimitedTransport(transport)
+        transport = ResilientTransport(provider, transport, config.get("retry_methods", IDEMPOTENT_METHODS))
+    return httpx.AsyncClient(
+        timeout=config.get("timeout", HTTP_TIMEOUT),
+        follow_redirects=config.get("follow_redirects", True),
+        transport=transport,
+    )
+
+
+def _create_sync_client(provider: str) -> httpx.Client:
+    config = PROVIDER_CONFIGS.get(provider, PROVIDER_CONFIGS["default"])
+    transport = httpx.HTTPTransport(**_pool_options(config, provider))
+    if _records(config):
+        transport = RecordReplaySyncTransport(transport)
+    if config.get("resilient"):
+        if not _replays(config):
+            transport = RateLimitedSyncTransport(transport)
+        transport = ResilientSyncTransport(provider, transport, config.get("retry_methods", IDEMPOTENT_METHODS))
+    return httpx.Client(
+        timeout=config.get("timeout", HTTP_TIMEOUT),
+        follow_redirects=config.get("follow_redirects", True),
+        transport=transport,
+    )
+
+
+class HTTPClientRegistry:
+    """
+    업스트림 제공자별로 keep-alive 연결 풀을 유지하는 httpx 클라이언트 모음 (싱글톤)
+    - 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 따로 만들고 재사용
+      (FastAPI 메인 루프와 동기 도구용 AsyncBridge 루프, 종료는 lifespan에서)
+    - 동기 클라이언트(requests 대체)는 스레드 간에 공유
+    - 외부 API 제공자는 재시도/서킷 브레이커(app.utils.resilience)와 API 키별 요청 한도(app.utils.rate_limiter)를 거침
+    - UPSTREAM_MODE=record/replay 이면 모든 요청을 fixture로 녹화/재생 (app.utils.upstream_replay)
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(HTTPClientRegistry, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self._lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+        self._sync_clients: Dict[str, httpx.Client] = {}
+        self.created = 0
+
+    def get(self, provider: str = "default") -> httpx.AsyncClient:
+        """현재 이벤트 루프에서 쓸 provider용 비동기 클라이언트 (없으면 생성)"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(provider)
+            if client is None or client.is_closed:
+                client = clients[provider] = _create_async_client(provider)
+                self.created += 1
+            return client
+
+    def get_sync(self, provider: str = "default") -> httpx.Client:
+        """provider용 동기 클라이언트 (스레드 간 공유)"""
+        with self._lock:
+            client = self._sync_clients.get(provider)
+            if client is None or client.is_closed:
+                client = self._sync_clients[provider] = _create_sync_client(provider)
+                self.created += 1
+            return client
+
+    async def close_loop_clients(self):
+        """현재 이벤트 루프에 묶인 비동기 클라이언트를 모두 닫음"""
+        with self._lock:
+            clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.aclose()
+
+    async def aclose(self):
+        """애플리케이션 종료 시 모든 클라이언트 정리 (lifespan에서 호출)"""
+        await self.close_loop_clients()
+        with self._lock:
+            others = list(self._async_clients.items())
+            self._async_clients.clear()
+            sync_clients = list(self._sync_clients.values())
+            self._sync_clients.clear()
+        for loop, clients in others:
+            # 다른 스레드에서 아직 돌고 있는 루프의 클라이언트는 그 루프에서 닫아야 함
+            if loop.is_closed() or not loop.is_running():
+                continue
+            for client in clients.values():
+                try:
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+                except Exception as e:
+                    print(f"[HTTPClientRegistry] 클라이언트 종료 실패: {e}")
+        for client in sync_clients:
+            client.close()
+        print("[HTTPClientRegistry] HTTP 클라이언트를 모두 닫았습니다.")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "http2": HTTP2_ENABLED,
+                "event_loops": len(self._async_clients),
+                "async_clients": sum(len(clients) for clients in self._async_clients.values()),
+                "sync_clients": len(self._sync_clients),
+                "created": self.created,
+            }
+
+
+def get_http_client(provider: str = "default") -> httpx.AsyncClient:
+    return HTTPClientRegistry().get(provider)
+
+
+def get_sync_http_client(provider: str = "default") -> httpx.Client:
+    return HTTPClientRegistry().get_sync(provider)
+
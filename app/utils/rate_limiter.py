@@ -0,0 +1,301 @@
+import os
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+# memory: 프로세스 안에서만 공유, sqlite: 같은 파일을 쓰는 모든 워커가 하나의 한도를 공유
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower()
+# 결과 캐시 파일과 쓰기 잠금을 다투지 않도록 별도 파일 사용
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "rate_limits.sqlite3")
+# 순서를 기다리는 최대 시간 (초) - 넘으면 대기열에 넣지 않고 RateLimitExceeded
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+# 429 응답을 받았는데 Retry-After가 없을 때 모든 워커가 쉬는 시간 (초)
+RATE_LIMIT_429_PENALTY = float(os.getenv("RATE_LIMIT_429_PENALTY", "1.0"))
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str
+    rate: float  # 초당 허용 요청 수
+    burst: float  # 한 번에 몰아서 보낼 수 있는 요청 수
+    daily_quota: Optional[int] = None  # 일일 한도 (None이면 제한 없음)
+
+
+def _limit(name: str, rate: float, burst: float, daily_quota: Optional[int] = None) -> RateLimit:
+    """RATE_LIMIT_<이름>_QPS / _BURST / _DAILY 환경 변수로 변경 가능"""
+    prefix = f"RATE_LIMIT_{name.upper()}"
+    daily = os.getenv(f"{prefix}_DAILY", daily_quota)
+    return RateLimit(
+        name=name,
+        rate=float(os.getenv(f"{prefix}_QPS", rate)),
+        burst=float(os.getenv(f"{prefix}_BURST", burst)),
+        daily_quota=int(daily) if daily not in (None, "") else None,
+    )
+
+
+# 호스트별 API 한도 (API 키마다 따로 적용)
+HOST_RATE_LIMITS: Dict[str, RateLimit] = {
+    "openapi.naver.com": _limit("naver_search", rate=10, burst=10, daily_quota=25000),
+    "dapi.kakao.com": _limit("kakao_local", rate=10, burst=10, daily_quota=100000),
+    "maps.googleapis.com": _limit("google_maps", rate=50, burst=50),
+    "google.serper.dev": _limit("serper", rate=5, burst=5),
+    "serpapi.com": _limit("serpapi", rate=1, burst=2),
+    # 공개 서버 사용 정책: 초당 1회 이하
+    "nominatim.openstreetmap.org": _limit("nominatim", rate=1, burst=1),
+}
+
+
+class RateLimitExceeded(httpx.TransportError):
+    """일일 한도 초과 또는 대기 시간이 RATE_LIMIT_MAX_WAIT를 넘어 요청을 보내지 않음"""
+
+
+class MemoryRateStore:
+    """프로세스 내 토큰 버킷 + 일일 사용량"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (토큰, 갱신 시각)
+        self._usage: Dict[str, Tuple[str, int]] = {}  # key -> (날짜, 사용량)
+
+    def reserve(self, key: str, limit: RateLimit, day: str, max_wait: float) -> float:
+        with self._lock:
+            now = time.time()
+            used_day, used = self._usage.get(key, (day, 0))
+            used = used if used_day == day else 0
+            tokens, updated = self._buckets.get(key, (limit.burst, now))
+            wait, tokens = _take(tokens, updated, now, limit, used, max_wait)
+            self._buckets[key] = (tokens, now)
+            self._usage[key] = (day, used + 1)
+            return wait
+
+    def throttle(self, key: str, limit: RateLimit, seconds: float):
+        with self._lock:
+            tokens, _ = self._buckets.get(key, (limit.burst, time.time()))
+            self._buckets[key] = (min(tokens, -limit.rate * seconds), time.time())
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                key: {"day": day, "used": used, "tokens": round(self._buckets.get(key, (0.0, 0))[0], 2)}
+                for key, (day, used) in self._usage.items()
+            }
+
+
+class SQLiteRateStore:
+    """
+    SQLite 파일에 토큰 버킷과 일일 사용량을 저장 (여러 uvicorn 워커가 하나의 한도를 공유)
+    예약은 BEGIN IMMEDIATE 트랜잭션 안에서 읽고 쓰므로 워커 간에도 원자적
+    """
+
+    def __init__(self, db_path: str = RATE_LIMIT_DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_bucket (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    day TEXT NOT NULL,
+                    used INTEGER NOT NULL
+                )
+                """
+            )
+
+    def _transaction(self, key: str, limit: RateLimit, day: Optional[str], update):
+        """day가 None이면 저장된 날짜와 사용량을 그대로 유지"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at, day, used FROM rate_limit_bucket WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated, used_day, used = row if row else (limit.burst, now, day or "", 0)
+                day = used_day if day is None else day
+                result, tokens, used = update(tokens, updated, now, used if used_day == day else 0)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_bucket (key, tokens, updated_at, day, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, tokens, now, day, used),
+                )
+                self._conn.execute("COMMIT")
+                return result
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def reserve(self, key: str, limit: RateLimit, day: str, max_wait: float) -> float:
+        def update(tokens, updated, now, used):
+            wait, tokens = _take(tokens, updated, now, limit, used, max_wait)
+            return wait, tokens, used + 1
+
+        return self._transaction(key, limit, day, update)
+
+    def throttle(self, key: str, limit: RateLimit, seconds: float):
+        def update(tokens, updated, now, used):
+            return None, min(tokens, -limit.rate * seconds), used
+
+        self._transaction(key, limit, None, update)
+
+    def usage(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, day, used, tokens FROM rate_limit_bucket").fetchall()
+        return {key: {"day": day, "used": used, "tokens": round(tokens, 2)} for key, day, used, tokens in rows}
+
+
+def _take(tokens: float, updated: float, now: float, limit: RateLimit, used: int, max_wait: float) -> Tuple[float, float]:
+    """
+    토큰 하나를 예약하고 (대기 시간, 남은 토큰) 반환
+    토큰이 음수가 되는 것을 허용해 먼저 예약한 순서대로 대기 시간이 늘어남 (대기열)
+    """
+    if limit.daily_quota is not None and used >= limit.daily_quota:
+        raise RateLimitExceeded(f"[{limit.name}] 일일 한도 {limit.daily_quota}회를 모두 사용했습니다.")
+    tokens = min(limit.burst, tokens + (now - updated) * limit.rate) - 1
+    wait = -tokens / limit.rate if tokens < 0 else 0.0
+    if wait > max_wait:
+        raise RateLimitExceeded(f"[{limit.name}] 요청이 밀려 있어 {wait:.1f}초 이상 기다려야 합니다.")
+    return wait, tokens
+
+
+class RateLimiter:
+    """제공자 API 키별 토큰 버킷 + 일일 한도 (싱글톤, RATE_LIMIT_BACKEND에 따라 메모리/SQLite 저장)"""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RateLimiter, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self.store = MemoryRateStore()
+        if RATE_LIMIT_BACKEND == "sqlite":
+            try:
+                self.store = SQLiteRateStore()
+            except sqlite3.Error as e:
+                print(f"[RateLimiter] SQLite 저장소를 열 수 없어 프로세스 내 한도만 적용합니다: {e}")
+        self._counters_lock = threading.Lock()
+        self.counters = {"requests": 0, "delayed": 0, "rejected": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _count(self, name: str, amount: float = 1):
+        with self._counters_lock:
+            self.counters[name] += amount
+
+    def reserve(self, key: str, limit: RateLimit) -> float:
+        """
+        요청 하나를 예약하고 보내기 전에 기다릴 시간(초) 반환
+        SQLite 저장소는 다른 워커와 잠금을 다툴 수 있으므로 이벤트 루프에서는 areserve 사용
+        """
+        self._count("requests")
+        try:
+            wait = self.store.reserve(key, limit, time.strftime("%Y-%m-%d"), RATE_LIMIT_MAX_WAIT)
+        except RateLimitExceeded:
+            self._count("rejected")
+            raise
+        if wait > 0:
+            self._count("delayed")
+            self._count("wait_seconds", wait)
+        return wait
+
+    async def areserve(self, key: str, limit: RateLimit) -> float:
+        """reserve를 작업 스레드에서 실행 (잠금 대기 중에도 이벤트 루프가 멈추지 않음)"""
+        if isinstance(self.store, MemoryRateStore):
+            return self.reserve(key, limit)
+        return await asyncio.to_thread(self.reserve, key, limit)
+
+    def throttle(self, key: str, limit: RateLimit, seconds: float):
+        """429 응답을 받으면 같은 키를 쓰는 모든 도구/워커가 seconds 동안 쉬도록 버킷을 비움"""
+        self._count("throttled")
+        self.store.throttle(key, limit, seconds)
+
+    async def athrottle(self, key: str, limit: RateLimit, seconds: float):
+        if isinstance(self.store, MemoryRateStore):
+            return self.throttle(key, limit, seconds)
+        await asyncio.to_thread(self.throttle, key, limit, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counters_lock:
+            counters = dict(self.counters)
+        return {
+            "backend": type(self.store).__name__,
+            **counters,
+            "wait_seconds": round(counters["wait_seconds"], 2),
+            "keys": self.store.usage(),
+        }
+
+
+def request_limit(request: httpx.Request) -> Optional[Tuple[str, RateLimit]]:
+    """요청 호스트에 한도가 있으면 (제한 키, 한도) 반환 - 키는 API 키를 해시해 로그/통계에 노출하지 않음"""
+    limit = HOST_RATE_LIMITS.get(request.url.host)
+    if limit is None:
+        return None
+    credential = (
+        request.headers.get("X-Naver-Client-Id")
+        or request.headers.get("X-API-KEY")
+        or request.headers.get("Authorization")
+        or request.url.params.get("key")
+        or request.url.params.get("api_key")
+        or ""
+    )
+    digest = hashlib.sha1(credential.encode()).hexdigest()[:10] if credential else "anonymous"
+    return f"{limit.name}:{digest}", limit
+
+
+def _penalty(response: httpx.Response) -> float:
+    value = response.headers.get("Retry-After", "")
+    try:
+        return max(float(value), RATE_LIMIT_429_PENALTY)
+    except ValueError:
+        return RATE_LIMIT_429_PENALTY
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """한도가 있는 호스트로 가는 요청을 토큰이 생길 때까지 기다렸다가 보내는 비동기 트랜스포트 래퍼"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        target = request_limit(request)
+        if target is not None:
+            wait = await RateLimiter().areserve(*target)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        response = await self._transport.handle_async_request(request)
+        if target is not None and response.status_code == 429:
+            await RateLimiter().athrottle(*target, _penalty(response))
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class RateLimitedSyncTransport(httpx.BaseTransport):
+    """RateLimitedTransport의 동기 클라이언트 버전"""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        target = request_limit(request)
+        if target is not None:
+            wait = RateLimiter().reserve(*target)
+            if wait > 0:
+                time.sleep(wait)
+        response = self._transport.handle_request(request)
+        if target is not None and response.status_code == 429:
+            RateLimiter().throttle(*target, _penalty(response))
+        return response
+
+    def close(self):
+        self._transport.close()
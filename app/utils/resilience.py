@@ -0,0 +1,289 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, FrozenSet, Optional
+import httpx
+from dotenv import load_dotenv
+from app.utils.rate_limiter import RateLimitExceeded
+from app.utils.upstream_replay import FixtureNotFound
+
+load_dotenv()
+# 재시도 (지수 백오프 + full jitter)
+RESILIENCE_MAX_RETRIES = int(os.getenv("RESILIENCE_MAX_RETRIES", "2"))
+RESILIENCE_BASE_DELAY = float(os.getenv("RESILIENCE_BASE_DELAY", "0.2"))
+RESILIENCE_MAX_DELAY = float(os.getenv("RESILIENCE_MAX_DELAY", "2.0"))
+# 서킷 브레이커: 연속 실패 횟수, 열린 상태 유지 시간(초), 반열림 상태에서 허용할 시험 요청 수
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RECOVERY_SECONDS = float(os.getenv("BREAKER_RECOVERY_SECONDS", "30"))
+BREAKER_HALF_OPEN_CALLS = int(os.getenv("BREAKER_HALF_OPEN_CALLS", "1"))
+
+# 재시도하는 응답 코드 (429를 뺀 나머지는 일시적 장애로 보고 서킷 브레이커 실패로도 집계)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+TOO_MANY_REQUESTS = 429
+# 기본적으로 재시도하는 메서드 (OAuth 토큰 교환 같은 POST는 인가 코드가 일회용이라 재시도하지 않음)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않고 바로 실패"""
+
+    def __init__(self, name: str, retry_after: float):
+        # 도구 에러 메시지로 에이전트(LLM)에 그대로 전달되므로 같은 호출을 반복하지 않도록 안내
+        super().__init__(
+            f"[{name}] 외부 서비스 일시 장애로 요청을 보내지 않았습니다 ({retry_after:.0f}초 후 재시도 가능). "
+            "같은 도구를 다시 호출하지 말고 이미 수집한 정보로 진행하세요."
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    업스트림별 서킷 브레이커 (스레드 안전 - 메인 루프, 도구용 루프, 동기 클라이언트가 함께 사용)
+    - closed: 정상, 연속 실패가 failure_threshold에 도달하면 open
+    - open: recovery_seconds 동안 요청을 보내지 않고 즉시 실패
+    - half_open: 시험 요청을 half_open_calls개까지 허용, 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        recovery_seconds: float = BREAKER_RECOVERY_SECONDS,
+        half_open_calls: int = BREAKER_HALF_OPEN_CALLS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.half_open_calls = half_open_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self.counters = {"successes": 0, "failures": 0, "rejected": 0, "trips": 0, "retries": 0}
+
+    def _refresh(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            self._state = HALF_OPEN
+            self._half_open_in_flight = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def retry_after(self) -> float:
+        with self._lock:
+            return max(0.0, self._opened_at + self.recovery_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인 (반열림 상태에서는 시험 요청 자리를 차지)"""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._half_open_in_flight < self.half_open_calls:
+                self._half_open_in_flight += 1
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def release(self):
+        """결과를 집계하지 못하고 끝난 요청(취소 등)의 반열림 시험 요청 자리 반환"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    def record_success(self):
+        with self._lock:
+            self.counters["successes"] += 1
+            self._consecutive_failures = 0
+            if self._state != CLOSED:
+                print(f"[CircuitBreaker:{self.name}] 복구됨 → closed")
+            self._state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["failures"] += 1
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self.counters["trips"] += 1
+                print(f"[CircuitBreaker:{self.name}] 연속 실패 {self._consecutive_failures}회 → open")
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_after": round(self.retry_after(), 1) if state == OPEN else 0.0,
+            **self.counters,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """이름별 서킷 브레이커 (최초 호출 시 생성)"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt(0부터)번째 재시도 전 대기 시간 - 지수 백오프 상한 안에서 균등 분포 (full jitter)"""
+    return random.uniform(0, min(RESILIENCE_MAX_DELAY, RESILIENCE_BASE_DELAY * 2 ** attempt))
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간으로 변환 (RESILIENCE_MAX_DELAY를 넘지 않게)"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), RESILIENCE_MAX_DELAY)
+
+
+class _ResilienceMixin:
+    """재시도/서킷 브레이커 판단 공통 부분 (비동기/동기 트랜스포트가 공유)"""
+
+    def _setup(self, provider: str, retry_methods: FrozenSet[str]):
+        self.provider = provider
+        self.retry_methods = retry_methods
+
+    def _breaker(self, request: httpx.Request) -> CircuitBreaker:
+        # 같은 제공자라도 호스트별로 분리 (예: 카카오 로컬 API 장애가 카카오 로그인까지 막지 않도록)
+        return get_breaker(f"{self.provider}:{request.url.host}")
+
+    def _attempts(self, request: httpx.Request) -> int:
+        return RESILIENCE_MAX_RETRIES + 1 if request.method in self.retry_methods else 1
+
+    @staticmethod
+    def _check(breaker: CircuitBreaker):
+        if not breaker.allow():
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+
+class ResilientTransport(_ResilienceMixin, httpx.AsyncBaseTransport):
+    """
+    httpx 비동기 트랜스포트 래퍼
+    - 연결 오류/시간 초과, 5xx 응답을 실패로 집계하고 지터 백오프로 재시도 (retry_methods만, 429는 재시도만)
+    - 서킷 브레이커가 열려 있으면 네트워크 호출 없이 CircuitOpenError로 즉시 실패
+    """
+
+    def __init__(self, provider: str, transport: httpx.AsyncBaseTransport, retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS):
+        self._setup(provider, retry_methods)
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self._breaker(request)
+        attempts = self._attempts(request)
+        for attempt in range(attempts):
+            self._check(breaker)
+            last = attempt == attempts - 1
+            try:
+                response = await self._transport.handle_async_request(request)
+            except (RateLimitExceeded, FixtureNotFound):
+                # 보내지 않은 요청이므로 업스트림 장애로 집계하지 않음
+                breaker.release()
+                raise
+            except httpx.TransportError:
+                breaker.record_failure()
+                if last:
+                    raise
+                breaker.counters["retries"] += 1
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            if response.status_code == TOO_MANY_REQUESTS:
+                # 요청 한도 초과는 업스트림 장애가 아니므로 재시도만 하고 실패로 집계하지 않음 (한도는 rate_limiter가 조절)
+                breaker.release()
+            else:
+                breaker.record_failure()
+            if last:
+                return response
+            breaker.counters["retries"] += 1
+            delay = retry_after_seconds(response)
+            await response.aclose()
+            await asyncio.sleep(backoff_delay(attempt) if delay is None else delay)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ResilientSyncTransport(_ResilienceMixin, httpx.BaseTransport):
+    """ResilientTransport의 동기 클라이언트 버전"""
+
+    def __init__(self, provider: str, transport: httpx.BaseTransport, retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS):
+        self._setup(provider, retry_methods)
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = self._breaker(request)
+        attempts = self._attempts(request)
+        for attempt in range(attempts):
+            self._check(breaker)
+            last = attempt == attempts - 1
+            try:
+                response = self._transport.handle_request(request)
+            except (RateLimitExceeded, FixtureNotFound):
+                # 보내지 않은 요청이므로 업스트림 장애로 집계하지 않음
+                breaker.release()
+                raise
+            except httpx.TransportError:
+                breaker.record_failure()
+                if last:
+                    raise
+                breaker.counters["retries"] += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            if response.status_code == TOO_MANY_REQUESTS:
+                # 요청 한도 초과는 업스트림 장애가 아니므로 재시도만 하고 실패로 집계하지 않음 (한도는 rate_limiter가 조절)
+                breaker.release()
+            else:
+                breaker.record_failure()
+            if last:
+                return response
+            breaker.counters["retries"] += 1
+            delay = retry_after_seconds(response)
+            response.close()
+            time.sleep(backoff_delay(attempt) if delay is None else delay)
+
+    def close(self):
+        self._transport.close()
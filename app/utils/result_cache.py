@@ -0,0 +1,335 @@
+import os
+import copy
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+from app.utils.single_flight import make_plan_request_key
+
+load_dotenv()
+AGENT_CACHE_DB_PATH = os.getenv("AGENT_CACHE_DB_PATH", "agent_cache.sqlite3")
+RESULT_CACHE_PERSIST = os.getenv("RESULT_CACHE_PERSIST", "true").lower() == "true"
+RESULT_CACHE_MAXSIZE = int(os.getenv("RESULT_CACHE_MAXSIZE", "256"))
+
+# 카테고리별 기본 TTL (초) - RESULT_CACHE_TTL_<카테고리> 환경 변수로 변경 가능
+DEFAULT_TTLS = {
+    "accommodation": 30 * 60,  # 예약 가능 여부가 자주 바뀌므로 짧게
+    "restaurant": 6 * 60 * 60,
+    "cafe": 6 * 60 * 60,
+    "site": 24 * 60 * 60,  # 관광지는 거의 바뀌지 않음
+    "plan": 60 * 60,
+    "distance": 30 * 24 * 60 * 60,  # 장소 간 거리는 사실상 바뀌지 않음
+    "geocode": 30 * 24 * 60 * 60,  # 주소 -> 좌표 (결과 없음은 GEOCODE_NEGATIVE_TTL)
+    "place_details": 3 * 24 * 60 * 60,  # place_id -> 이름/평점/리뷰 수 (평점은 천천히 바뀜)
+}
+
+# 메모리 LRU 최대 항목 수를 기본값(RESULT_CACHE_MAXSIZE)과 다르게 쓸 namespace
+# RESULT_CACHE_MAXSIZE_<카테고리> 환경 변수로 변경 가능
+DEFAULT_MAXSIZES = {
+    "distance": 50000,  # 장소 쌍 단위로 저장하므로 항목 수가 많음
+    "geocode": 5000,
+    "place_details": 5000,
+}
+
+# 만료 후에도 이 시간 동안은 stale 조회(장애 시 대체 응답)를 위해 보관
+STALE_GRACE = 24 * 60 * 60
+
+
+class MemoryLRUCache:
+    """만료 시간을 가진 LRU 메모리 캐시"""
+
+    def __init__(self, maxsize: int = RESULT_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, expires_at: float):
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCache:
+    """여러 namespace가 함께 쓰는 SQLite 디스크 캐시 (프로세스/워커 간 공유)"""
+
+    _instances: Dict[str, "SQLiteCache"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, db_path: str = AGENT_CACHE_DB_PATH) -> "SQLiteCache":
+        with cls._instances_lock:
+            if db_path not in cls._instances:
+                cls._instances[db_path] = cls(db_path)
+            return cls._instances[db_path]
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entry (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._conn.execute(
+                "DELETE FROM cache_entry WHERE expires_at < ?", (time.time() - STALE_GRACE,)
+            )
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM cache_entry WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Tuple[float, Any]]:
+        keys = list(keys)
+        found = {}
+        # SQLite 바인딩 변수 개수 제한을 피하기 위해 나누어 조회
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, expires_at, value FROM cache_entry WHERE namespace = ? AND key IN ({placeholders})",
+                    (namespace, *chunk),
+                ).fetchall()
+            for key, expires_at, value in rows:
+                found[key] = (expires_at, json.loads(value))
+        return found
+
+    def set_many(self, namespace: str, entries: Iterable[Tuple[str, Any, float]]):
+        rows = [
+            (namespace, key, json.dumps(value, ensure_ascii=False), expires_at)
+            for key, value, expires_at in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_entry (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        self.set_many(namespace, [(key, value, expires_at)])
+
+    def delete(self, namespace: str, key: Optional[str] = None):
+        with self._lock, self._conn:
+            if key is None:
+                self._conn.execute("DELETE FROM cache_entry WHERE namespace = ?", (namespace,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM cache_entry WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+
+
+class TieredCache:
+    """
+    메모리 LRU + (선택) SQLite 2단계 캐시
+    - get: 메모리 -> 디스크 순서로 조회, 디스크 적중 시 메모리에 적재
+    - allow_stale=True 이면 만료된 값도 반환 (장애 시 대체 응답 용도)
+    """
+
+    def __init__(self, namespace: str, ttl: float, maxsize: int = RESULT_CACHE_MAXSIZE, persist: bool = RESULT_CACHE_PERSIST):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.memory = MemoryLRUCache(maxsize)
+        self.disk = SQLiteCache.open() if persist else None
+        self.counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stale_hits": 0, "sets": 0}
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.counters["memory_hits"] += 1
+            return entry
+        if self.disk is not None:
+            try:
+                entry = self.disk.get(self.namespace, key)
+            except Exception as e:
+                print(f"[TieredCache:{self.namespace}] 디스크 조회 실패: {e}")
+                entry = None
+            if entry is not None:
+                self.counters["disk_hits"] += 1
+                self.memory.set(key, entry[1], entry[0])
+        return entry
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        entry = self._lookup(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at >= time.time():
+                self.counters["hits"] += 1
+                return copy.deepcopy(value)
+            if allow_stale:
+                self.counters["stale_hits"] += 1
+                return copy.deepcopy(value)
+        self.counters["misses"] += 1
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """여러 키를 한 번에 조회 (만료되지 않은 값만 반환)"""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found, missing = {}, []
+        for key in keys:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] >= now:
+                self.counters["memory_hits"] += 1
+                found[key] = copy.deepcopy(entry[1])
+            else:
+                missing.append(key)
+        if missing and self.disk is not None:
+            try:
+                for key, (expires_at, value) in self.disk.get_many(self.namespace, missing).items():
+                    if expires_at >= now:
+                        self.counters["disk_hits"] += 1
+                        self.memory.set(key, value, expires_at)
+                        found[key] = copy.deepcopy(value)
+            except Exception as e:
+                print(f"[TieredCache:{self.namespace}] 디스크 일괄 조회 실패: {e}")
+        self.counters["hits"] += len(found)
+        self.counters["misses"] += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, values: Dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        for key, value in values.items():
+            self.memory.set(key, copy.deepcopy(value), expires_at)
+        self.counters["sets"] += len(values)
+        if self.disk is not None:
+            try:
+                self.disk.set_many(
+                    self.namespace, [(key, value, expires_at) for key, value in values.items()]
+                )
+            except Exception as e:
+                print(f"[TieredCache:{self.namespace}] 디스크 저장 실패: {e}")
+
+    def invalidate(self, key: Optional[str] = None):
+        """key가 없으면 namespace 전체 삭제"""
+        if key is None:
+            self.memory.clear()
+        else:
+            self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(self.namespace, key)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+            "memory_size": len(self.memory),
+            "ttl": self.ttl,
+            "persist": self.disk is not None,
+        }
+
+
+_caches: Dict[str, TieredCache] = {}
+
+
+def get_cache(namespace: str) -> TieredCache:
+    """namespace별 캐시 인스턴스 반환 (최초 호출 시 생성)"""
+    if namespace not in _caches:
+        ttl = float(os.getenv(f"RESULT_CACHE_TTL_{namespace.upper()}", DEFAULT_TTLS.get(namespace, 60 * 60)))
+        maxsize = int(os.getenv(
+            f"RESULT_CACHE_MAXSIZE_{namespace.upper()}", DEFAULT_MAXSIZES.get(namespace, RESULT_CACHE_MAXSIZE)
+        ))
+        _caches[namespace] = TieredCache(namespace, ttl, maxsize=maxsize)
+    return _caches[namespace]
+
+
+def cache_stats() -> dict:
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
+
+
+def invalidate_cache(namespace: Optional[str] = None, key: Optional[str] = None):
+    """
+    namespace가 없으면 모든 캐시 삭제
+    이 프로세스에서 아직 쓰지 않은 namespace도 디스크(SQLite)에는 남아 있을 수 있으므로 namespace별로 직접 삭제
+    """
+    if namespace:
+        get_cache(namespace).invalidate(key)
+        return
+    for cache in list(_caches.values()):
+        cache.invalidate(key)
+    if RESULT_CACHE_PERSIST:
+        disk = SQLiteCache.open()
+        for name in set(DEFAULT_TTLS) - set(_caches):
+            disk.delete(name, key)
+
+
+def is_cacheable(result: Any) -> bool:
+    """빈 결과나 에러 응답은 캐시하지 않음"""
+    if not result:
+        return False
+    if isinstance(result, dict) and "error" in result:
+        return False
+    return True
+
+
+def cached_result(namespace: str, key_func: Optional[Callable[..., str]] = None):
+    """
+    에이전트 서비스 진입점(self, input_data, prompt=None)에 적용하는 결과 캐시 데코레이터
+    key_func가 없으면 정규화된 TravelPlanRequest로 키 생성
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, input_data: dict, *args, **kwargs):
+            cache = get_cache(namespace)
+            if key_func is not None:
+                key = key_func(input_data)
+            else:
+                prompt = args[0] if args else kwargs.get("prompt", kwargs.get("prompt_text"))
+                key = make_plan_request_key(input_data, prompt)
+
+            cached = cache.get(key)
+            if cached is not None:
+                print(f"[ResultCache:{namespace}] 캐시 적중")
+                return cached
+
+            result = await func(self, input_data, *args, **kwargs)
+            if is_cacheable(result):
+                cache.set(key, result)
+            return result
+
+        wrapper.cache_namespace = namespace
+        return wrapper
+
+    return decorator
@@ -0,0 +1,101 @@
+import asyncio
+import copy
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def normalize_plan_request(input_data: dict, prompt: Optional[str] = None) -> dict:
+    """
+    TravelPlanRequest 형태의 입력을 비교 가능한 형태로 정규화
+    - 지역/날짜/연령대는 앞뒤 공백 제거
+    - 동반자는 (label, count) 정렬, 컨셉은 정렬
+    - prompt 인자가 없으면 input_data의 prompt 사용
+    """
+    companions = []
+    for companion in input_data.get("companion_count") or []:
+        if isinstance(companion, dict):
+            companions.append([str(companion.get("label", "")).strip(), int(companion.get("count", 0))])
+        else:
+            companions.append(["", int(companion)])
+
+    concepts = input_data.get("concepts") or []
+    if isinstance(concepts, str):
+        concepts = concepts.split(",")
+
+    return {
+        "main_location": str(input_data.get("main_location", "")).strip(),
+        "start_date": str(input_data.get("start_date", "")).strip(),
+        "end_date": str(input_data.get("end_date", "")).strip(),
+        "ages": str(input_data.get("ages", "")).strip(),
+        "companion_count": sorted(companions),
+        "concepts": sorted(concept.strip() for concept in concepts if concept.strip()),
+        "prompt": (prompt or input_data.get("prompt") or "").strip(),
+    }
+
+
+def make_plan_request_key(input_data: dict, prompt: Optional[str] = None) -> str:
+    """정규화된 요청으로부터 해시 키 생성"""
+    normalized = normalize_plan_request(input_data, prompt)
+    serialized = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 요청을 하나의 실행으로 합치는 클래스
+    - 첫 요청만 실제로 실행하고, 나머지는 같은 결과를 기다림
+    - 대기 중인 요청이 취소되어도 공유 실행은 취소되지 않음
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+        else:
+            self.coalesced += 1
+            print(f"[SingleFlight] 진행 중인 동일 요청에 합류: {key}")
+
+        result = await asyncio.shield(task)
+        # 호출자마다 결과를 수정할 수 있으므로 복사본 반환
+        return copy.deepcopy(result)
+
+    def _forget(self, key: str, finished: asyncio.Task):
+        if self._calls.get(key) is finished:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+def single_flight(namespace: str):
+    """
+    에이전트 서비스 진입점(self, input_data, prompt=None)에 적용하는 데코레이터
+    동일한 요청이 진행 중이면 새 crew를 실행하지 않고 그 결과를 공유
+    """
+    group = SingleFlight()
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, input_data: dict, *args, **kwargs):
+            prompt = args[0] if args else kwargs.get("prompt", kwargs.get("prompt_text"))
+            key = f"{namespace}:{make_plan_request_key(input_data, prompt)}"
+            return await group.do(key, lambda: func(self, input_data, *args, **kwargs))
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator
@@ -0,0 +1,338 @@
+import os
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import functools
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+# live: 실제 호출 (기본), record: 실제 호출 결과를 fixture 파일로 저장, replay: 저장된 fixture로만 응답 (네트워크 사용 안 함)
+UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "live").lower()
+UPSTREAM_FIXTURE_DIR = os.getenv("UPSTREAM_FIXTURE_DIR", "fixtures/upstream")
+# replay 응답 지연 분포
+# - recorded: 녹화 당시 응답 시간 (기본), none: 지연 없음, fixed:<초>
+# - uniform:<최소>,<최대>, normal:<평균>,<표준편차>, lognormal:<mu>,<sigma> (ln 초 단위)
+UPSTREAM_REPLAY_LATENCY = os.getenv("UPSTREAM_REPLAY_LATENCY", "recorded").lower()
+# 지연 배율 (예: 0.1이면 10배 빠르게)
+UPSTREAM_REPLAY_LATENCY_SCALE = float(os.getenv("UPSTREAM_REPLAY_LATENCY_SCALE", "1.0"))
+# 같은 시드면 같은 지연 순서로 재현
+UPSTREAM_REPLAY_SEED = int(os.getenv("UPSTREAM_REPLAY_SEED", "0"))
+
+# fixture 키와 저장 내용에서 제외하는 인증 정보 (쿼리 파라미터, 폼 필드, 헤더)
+SECRET_FIELDS = frozenset({
+    "key", "api_key", "client_id", "client_secret", "code", "access_token", "refresh_token", "servicekey",
+})
+SECRET_HEADERS = frozenset({
+    "authorization", "x-api-key", "x-naver-client-id", "x-naver-client-secret", "cookie", "set-cookie",
+})
+# 응답 본문(JSON)에서 가리는 필드 - 소셜 로그인은 녹화하지 않지만 다른 경로로 섞여 들어와도 남지 않도록
+SECRET_RESPONSE_FIELDS = frozenset({
+    "access_token", "refresh_token", "id_token", "token", "email", "phone_number", "mobile", "birthday", "birthyear",
+})
+# 본문을 디코딩해서 저장하므로 원래 전송 관련 헤더는 버림
+DROP_RESPONSE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+REDACTED = "REDACTED"
+
+
+class FixtureNotFound(httpx.TransportError):
+    """replay 모드에서 요청에 해당하는 fixture가 없음"""
+
+
+def is_recording() -> bool:
+    return UPSTREAM_MODE == "record"
+
+
+def is_replaying() -> bool:
+    return UPSTREAM_MODE == "replay"
+
+
+def _redact_pairs(pairs) -> list:
+    return [(name, REDACTED if name.lower() in SECRET_FIELDS else value) for name, value in pairs]
+
+
+def _redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(_redact_pairs(parse_qsl(parts.query, keep_blank_values=True))))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def _redact_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            name: REDACTED if name.lower() in SECRET_RESPONSE_FIELDS else _redact_json(item)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    return value
+
+
+def _normalize_body(body: bytes, content_type: str) -> Any:
+    """키 계산/저장용 요청 본문 (JSON은 키 정렬, 폼은 인증 필드 제거)"""
+    if not body:
+        return None
+    text = body.decode("utf-8", errors="replace")
+    if "json" in content_type:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    if "x-www-form-urlencoded" in content_type:
+        return dict(sorted(_redact_pairs(parse_qsl(text, keep_blank_values=True))))
+    return text
+
+
+def fixture_key(*parts: Any) -> str:
+    """fixture 파일 이름으로 쓰는 해시 (인증 정보를 뺀 요청 내용 기준)"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    <UPSTREAM_FIXTURE_DIR>/<그룹>/<키>.json 형태로 요청/응답 한 쌍씩 저장 (싱글톤)
+    - 같은 요청을 다시 녹화하면 덮어씀 (마지막 응답 기준)
+    - 읽은 fixture는 메모리에 보관해 replay 중 디스크를 다시 읽지 않음
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(FixtureStore, cls).__new__(cls)
+            cls._instance.initialize()
+        return cls._instance
+
+    def initialize(self):
+        self.root = UPSTREAM_FIXTURE_DIR
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, Optional[dict]] = {}
+        self._random = random.Random(UPSTREAM_REPLAY_SEED)
+        self.counters = {"recorded": 0, "replayed": 0, "missing": 0}
+
+    def _path(self, group: str, key: str) -> str:
+        return os.path.join(self.root, group, f"{key}.json")
+
+    def load(self, group: str, key: str) -> Optional[dict]:
+        path = self._path(group, key)
+        with self._lock:
+            if path not in self._loaded:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        self._loaded[path] = json.load(f)
+                except FileNotFoundError:
+                    self._loaded[path] = None
+            fixture = self._loaded[path]
+            self.counters["replayed" if fixture is not None else "missing"] += 1
+            return fixture
+
+    def save(self, group: str, key: str, fixture: dict):
+        path = self._path(group, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 동시에 녹화해도 읽는 쪽이 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._loaded[path] = fixture
+            self.counters["recorded"] += 1
+
+    def delay(self, recorded: float) -> float:
+        """UPSTREAM_REPLAY_LATENCY 분포에서 응답 지연(초) 추출"""
+        kind, _, args = UPSTREAM_REPLAY_LATENCY.partition(":")
+        values = [float(value) for value in args.split(",") if value]
+        with self._lock:
+            if kind == "none":
+                seconds = 0.0
+            elif kind == "fixed":
+                seconds = values[0]
+            elif kind == "uniform":
+                seconds = self._random.uniform(values[0], values[1])
+            elif kind == "normal":
+                seconds = self._random.gauss(values[0], values[1])
+            elif kind == "lognormal":
+                seconds = self._random.lognormvariate(values[0], values[1])
+            else:
+                seconds = recorded
+        return max(0.0, seconds * UPSTREAM_REPLAY_LATENCY_SCALE)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": UPSTREAM_MODE,
+                "fixture_dir": self.root,
+                "latency": UPSTREAM_REPLAY_LATENCY,
+                **self.counters,
+            }
+
+
+def _request_fixture(request: httpx.Request, content: bytes) -> Tuple[str, str, dict]:
+    """(그룹, 키, 저장용 요청 정보) - 그룹은 호스트 이름"""
+    body = _normalize_body(content, request.headers.get("Content-Type", ""))
+    url = _redact_url(str(request.url))
+    key = fixture_key(request.method, url, body)
+    return request.url.host or "unknown", key, {"method": request.method, "url": url, "body": body}
+
+
+def _encode_response(response: httpx.Response, content: bytes, elapsed: float) -> dict:
+    headers = [
+        (name, value) for name, value in response.headers.multi_items()
+        if name.lower() not in DROP_RESPONSE_HEADERS and name.lower() not in SECRET_HEADERS
+    ]
+    encoded: Dict[str, Any] = {"status_code": response.status_code, "headers": headers, "elapsed": round(elapsed, 4)}
+    if "json" in response.headers.get("Content-Type", ""):
+        try:
+            encoded["json"] = _redact_json(json.loads(content))
+            return encoded
+        except ValueError:
+            pass
+    try:
+        encoded["text"] = content.decode("utf-8")
+    except UnicodeDecodeError:
+        encoded["base64"] = base64.b64encode(content).decode("ascii")
+    return encoded
+
+
+def _decode_response(fixture: dict, request: httpx.Request) -> httpx.Response:
+    recorded = fixture["response"]
+    if "json" in recorded:
+        content = json.dumps(recorded["json"], ensure_ascii=False).encode("utf-8")
+    elif "text" in recorded:
+        content = recorded["text"].encode("utf-8")
+    else:
+        content = base64.b64decode(recorded.get("base64", ""))
+    return httpx.Response(
+        recorded["status_code"], headers=recorded["headers"], content=content, request=request
+    )
+
+
+def _live_response(response: httpx.Response, content: bytes, request: httpx.Request) -> httpx.Response:
+    """녹화 중 호출한 쪽에는 가리지 않은 원래 응답을 돌려줌 (본문은 이미 디코딩됨)"""
+    headers = [(name, value) for name, value in response.headers.multi_items() if name.lower() not in DROP_RESPONSE_HEADERS]
+    return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+
+def _missing(group: str, key: str, info: dict) -> FixtureNotFound:
+    return FixtureNotFound(f"[replay] fixture 없음 ({group}/{key}): {info['method']} {info['url']}")
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    record: 안쪽 트랜스포트로 실제 호출하고 요청/응답을 fixture로 저장
+    replay: 안쪽 트랜스포트를 쓰지 않고 fixture 응답을 지연 분포에 맞춰 반환
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        group, key, info = _request_fixture(request, await request.aread())
+        store = FixtureStore()
+        if is_replaying():
+            fixture = store.load(group, key)
+            if fixture is None:
+                raise _missing(group, key, info)
+            await asyncio.sleep(store.delay(fixture["response"]["elapsed"]))
+            return _decode_response(fixture, request)
+
+        started = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        fixture = {"request": info, "response": _encode_response(response, content, time.monotonic() - started)}
+        store.save(group, key, fixture)
+        return _live_response(response, content, request)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class RecordReplaySyncTransport(httpx.BaseTransport):
+    """RecordReplayTransport의 동기 클라이언트 버전"""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        group, key, info = _request_fixture(request, request.read())
+        store = FixtureStore()
+        if is_replaying():
+            fixture = store.load(group, key)
+            if fixture is None:
+                raise _missing(group, key, info)
+            time.sleep(store.delay(fixture["response"]["elapsed"]))
+            return _decode_response(fixture, request)
+
+        started = time.monotonic()
+        response = self._transport.handle_request(request)
+        try:
+            content = response.read()
+        finally:
+            response.close()
+        fixture = {"request": info, "response": _encode_response(response, content, time.monotonic() - started)}
+        store.save(group, key, fixture)
+        return _live_response(response, content, request)
+
+    def close(self):
+        self._transport.close()
+
+
+def llm_fixture_key(model: str, messages: Any, **options: Any) -> str:
+    return fixture_key(model, messages, options)
+
+
+def record_llm(key: str, model: str, messages: Any, result: Any, elapsed: float):
+    FixtureStore().save("llm", key, {
+        "request": {"model": model, "messages": messages},
+        "response": {"result": result, "elapsed": round(elapsed, 4)},
+    })
+
+
+def replay_llm(key: str, model: str) -> Any:
+    """녹화된 LLM 응답을 지연 분포에 맞춰 반환 (없으면 FixtureNotFound)"""
+    store = FixtureStore()
+    fixture = store.load("llm", key)
+    if fixture is None:
+        raise FixtureNotFound(f"[replay] LLM fixture 없음 (llm/{key}): {model}")
+    time.sleep(store.delay(fixture["response"]["elapsed"]))
+    return fixture["response"]["result"]
+
+
+def replayable(group: str) -> Callable:
+    """
+    httpx를 거치지 않는 동기 업스트림 호출(셀레니움 크롤링 등)을 함수 단위로 녹화/재생하는 데코레이터
+    인자로 fixture 키를 만들고, 반환 값은 JSON으로 저장 가능해야 함
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if UPSTREAM_MODE == "live":
+                return func(*args, **kwargs)
+            key = fixture_key(func.__name__, args, kwargs)
+            store = FixtureStore()
+            if is_replaying():
+                fixture = store.load(group, key)
+                if fixture is None:
+                    raise FixtureNotFound(f"[replay] fixture 없음 ({group}/{key}): {func.__name__}{args}")
+                time.sleep(store.delay(fixture["response"]["elapsed"]))
+                return fixture["response"]["result"]
+
+            started = time.monotonic()
+            result = func(*args, **kwargs)
+            store.save(group, key, {
+                "request": {"function": func.__name__, "args": list(args), "kwargs": kwargs},
+                "response": {"result": result, "elapsed": round(time.monotonic() - started, 4)},
+            })
+            return result
+        return wrapper
+    return decorator